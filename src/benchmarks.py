@@ -0,0 +1,496 @@
+"""
+Benchmarks Module
+
+This module times the stages of the DQI and QAOA solvers over a sweep of problem
+sizes and writes the results to a JSON file that can be compared against a stored
+baseline. Everything runs offline on the CPU simulators.
+
+- DQI: syndrome table construction, circuit build, transpile, simulation and
+  post-processing of the counts, swept over the number of variables and
+  constraints, the constraint weights and the decoded error weight
+- QAOA: Hamiltonian construction, one optimization step and probability
+  extraction, swept over the number of qubits, the QUBO density and the depth
+
+Each stage is repeated and reported by its median and 95th percentile latency.
+Every case also reports the peak memory traced by ``tracemalloc`` during one
+untimed pass, the peak resident set size of the process so far on platforms with
+the ``resource`` module, and the solution quality: the expected fraction of
+satisfied constraints relative to the optimum for DQI, and the probability of the
+optimal QUBO solution and the best sampled energy gap for QAOA.
+
+Example:
+    To record a baseline and check a change against it:
+
+    ```
+    $ python src/benchmarks.py --suite quick --save-baseline outputs/benchmarks/baseline.json
+    $ python src/benchmarks.py --suite quick --baseline outputs/benchmarks/baseline.json
+    ```
+
+    The second command exits with status 1 if a stage got slower than the threshold.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+
+# Problem sizes per suite: DQI cases are (variables, constraints, constraint weights,
+# error weight) and QAOA cases are (qubits, density, depth)
+SUITES = {
+    'quick': {
+        'dqi': [(4, 6, (1, 2), 1), (5, 8, (1, 2), 1), (6, 10, (1, 2), 2), (6, 10, (2, 3), 2)],
+        'qaoa': [(8, 0.5, 1), (8, 0.5, 3), (12, 0.2, 2), (12, 0.8, 2)],
+        'repeats': 5
+    },
+    'full': {
+        'dqi': [(4, 6, (1, 2), 1), (5, 8, (1, 2), 1), (6, 10, (1, 2), 2), (6, 10, (2, 3), 2),
+                (7, 12, (1, 2), 2), (8, 14, (1, 2), 2)],
+        'qaoa': [(8, 0.5, 1), (8, 0.5, 3), (12, 0.2, 2), (12, 0.8, 2), (16, 0.5, 2),
+                 (16, 0.5, 4), (20, 0.5, 2)],
+        'repeats': 10
+    }
+}
+
+# Default slowdown of a stage's median latency reported as a regression
+REGRESSION_THRESHOLD = 1.25
+
+# Stages faster than this in the baseline are too noisy to compare, in seconds
+NOISE_FLOOR = 1e-3
+
+SHOTS = 1024
+QAOA_STEPS = 50
+
+
+def latency_summary(times):
+    """
+    Summarize repeated timings.
+
+    Args:
+        times (list): Durations in seconds
+
+    Returns:
+        dict: 'median', 'p95' and 'min' in seconds and the number of 'repeats'
+    """
+    times = np.asarray(times, dtype=np.float64)
+    return {
+        'median': float(np.median(times)),
+        'p95': float(np.percentile(times, 95)),
+        'min': float(times.min()),
+        'repeats': int(times.size)
+    }
+
+
+def peak_rss_mb():
+    """
+    Peak resident set size of the process.
+
+    Returns:
+        float: Peak RSS in MiB, or None without the POSIX ``resource`` module (Windows)
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1 << 20) if sys.platform == 'darwin' else peak / 1024
+
+
+class Benchmark:
+    """
+    Timings of the stages of one benchmark case.
+
+    A case runs its stages in order, once with ``tracemalloc`` to record the peak
+    memory and then ``repeats`` times for the timings. Each stage takes the output of
+    the previous one.
+
+    Attributes:
+        name (str): Name of the case
+        algorithm (str): 'dqi' or 'qaoa'
+        params (dict): Parameters of the case
+        repeats (int): Number of timed passes
+    """
+
+    def __init__(self, name, algorithm, params, repeats):
+        self.name = name
+        self.algorithm = algorithm
+        self.params = params
+        self.repeats = repeats
+
+    def stages(self):
+        """
+        The stages of the case.
+
+        Returns:
+            list: (stage name, function of the previous stage's output) pairs
+        """
+        raise NotImplementedError
+
+    def quality(self, output):
+        """
+        Solution quality of the last stage's output.
+
+        Args:
+            output: Output of the last stage
+
+        Returns:
+            dict: Quality metrics, larger is better
+        """
+        raise NotImplementedError
+
+    def _pass(self, timings=None):
+        output = None
+        for name, stage in self.stages():
+            start = time.perf_counter()
+            output = stage(output)
+            if timings is not None:
+                timings[name].append(time.perf_counter() - start)
+        return output
+
+    def run(self):
+        """
+        Run the case.
+
+        Returns:
+            dict: The 'name', 'algorithm' and 'params' of the case, the latency summary of
+                  every stage under 'stages', 'peak_traced_mb', 'peak_rss_mb' and 'quality'
+        """
+        # Imports and setup happen outside the traced pass
+        self.stages()
+        tracemalloc.start()
+        output = self._pass()
+        _, peak_traced = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        timings = {name: [] for name, _ in self.stages()}
+        for _ in range(self.repeats):
+            output = self._pass(timings)
+
+        return {
+            'name': self.name,
+            'algorithm': self.algorithm,
+            'params': self.params,
+            'stages': {name: latency_summary(times) for name, times in timings.items()},
+            'peak_traced_mb': peak_traced / (1 << 20),
+            'peak_rss_mb': peak_rss_mb(),
+            'quality': self.quality(output)
+        }
+
+
+class DQIBenchmark(Benchmark):
+    """
+    DQI stages on a random sparse Max-XORSAT instance.
+    """
+
+    def __init__(self, n_variables, n_constraints, row_weights, max_error_weight, repeats, seed=0):
+        from instance_generator import InstanceGenerator
+
+        super().__init__(
+            f"dqi/n={n_variables},m={n_constraints},w={'-'.join(map(str, row_weights))},t={max_error_weight}",
+            'dqi',
+            {'n_variables': n_variables, 'n_constraints': n_constraints,
+             'row_weights': list(row_weights), 'max_error_weight': max_error_weight, 'shots': SHOTS},
+            repeats
+        )
+        generator = InstanceGenerator(n_variables, n_constraints, row_weights=row_weights)
+        self.parity_check_matrix = generator.sample_batch(np.random.default_rng(seed), 1)[0]
+        self.max_error_weight = max_error_weight
+        self.seed = seed
+
+    def stages(self):
+        from qiskit import transpile
+        from qiskit_aer import Aer
+
+        from classical_max_xorsat import ClassicalMaxXORSAT
+        from distribution import Distribution
+        from dqi_max_xorsat_implementation import DQIMaxXORSAT
+
+        simulator = Aer.get_backend('qasm_simulator')
+        solver = DQIMaxXORSAT(self.parity_check_matrix, max_error_weight=self.max_error_weight)
+        baselines = ClassicalMaxXORSAT.from_solver(solver)
+
+        def syndrome_table(_):
+            solver.syndrome_table = solver._create_syndrome_table()
+
+        def post_process(result):
+            counts = Distribution.from_int_dict(result.get_counts().int_outcomes(), solver.n_checks)
+            satisfied = baselines.satisfied_counts(counts.states.astype(np.int64))
+            return float(counts.probabilities() @ satisfied)
+
+        return [
+            ('syndrome_table', syndrome_table),
+            # Built and transpiled directly, bypassing the circuit cache
+            ('circuit_build', lambda _: solver.build_circuit(measure_y=False)),
+            ('transpile', lambda circuit: transpile(circuit, simulator)),
+            ('simulation', lambda circuit: simulator.run(circuit, shots=SHOTS, seed_simulator=self.seed).result()),
+            ('post_processing', post_process)
+        ]
+
+    def quality(self, expected_satisfied):
+        from classical_max_xorsat import ClassicalMaxXORSAT
+
+        optimum = ClassicalMaxXORSAT(self.parity_check_matrix).exhaustive_search(max_solutions=0)['satisfied']
+        return {
+            'expected_satisfied': expected_satisfied,
+            'optimum': int(optimum),
+            'approximation_ratio': expected_satisfied / optimum if optimum else 1.0
+        }
+
+
+def random_qubo(n, density, rng):
+    """
+    Draw a symmetric QUBO matrix with a given fraction of nonzero couplings.
+
+    Args:
+        n (int): Number of variables
+        density (float): Fraction of nonzero off-diagonal entries
+        rng (numpy.random.Generator): Random generator
+
+    Returns:
+        numpy.ndarray: Integer-valued matrix of shape (n, n)
+    """
+    upper = np.triu(rng.integers(-5, 6, size=(n, n)) * (rng.random((n, n)) < density), 1)
+    return upper + upper.T + np.diag(rng.integers(-10, 11, size=n))
+
+
+class QAOABenchmark(Benchmark):
+    """
+    QAOA stages on a random QUBO, using the NumPy simulator.
+    """
+
+    def __init__(self, n_qubits, density, depth, repeats, seed=0):
+        super().__init__(
+            f"qaoa/n={n_qubits},density={density},p={depth}",
+            'qaoa',
+            {'n_qubits': n_qubits, 'density': density, 'depth': depth, 'steps': QAOA_STEPS},
+            repeats
+        )
+        self.Q = random_qubo(n_qubits, density, np.random.default_rng(seed))
+        self.depth = depth
+        self.seed = seed
+
+    def stages(self):
+        import pennylane as qml
+
+        from implementingQAOA_N_by_N import QAOASolver, initial_params
+
+        state = {}
+
+        def hamiltonian(_):
+            # The Ising form and the energy diagonal of the simulator
+            state['solver'] = QAOASolver(self.Q, depth=self.depth, steps=QAOA_STEPS,
+                                         optimizer=qml.AdamOptimizer(0.05))
+            state['solver'].simulator
+            return initial_params(self.depth, strategy="ramp", rng=np.random.default_rng(self.seed))
+
+        def optimization_step(params):
+            # On a separate optimizer, so the timed step does not change the optimization
+            _, grad = state['solver'].simulator.expectation_and_gradient(params)
+            qml.AdamOptimizer(0.05).apply_grad((grad,), (params,))
+            return params
+
+        def optimization(params):
+            return state['solver'].optimize(params)[0]
+
+        def probability_extraction(params):
+            return state['solver'], state['solver'].probabilities(params)
+
+        return [
+            ('hamiltonian', hamiltonian),
+            ('optimization_step', optimization_step),
+            ('optimization', optimization),
+            ('probabilities', probability_extraction)
+        ]
+
+    def quality(self, output):
+        solver, probs = output
+        energies = solver.simulator.energies
+        optimal = energies <= energies.min() + 1e-9
+        expected = float(probs @ energies)
+        spread = float(energies.max() - energies.min())
+        return {
+            'optimal_probability': float(probs[optimal].sum()),
+            'normalized_expected_energy': float((energies.max() - expected) / spread) if spread else 1.0
+        }
+
+
+def build_cases(suite):
+    """
+    Create the benchmark cases of a suite.
+
+    Args:
+        suite (str): Name of a suite in SUITES
+
+    Returns:
+        list: The Benchmark instances
+    """
+    config = SUITES[suite]
+    cases = [DQIBenchmark(*case, repeats=config['repeats']) for case in config['dqi']]
+    cases += [QAOABenchmark(*case, repeats=config['repeats']) for case in config['qaoa']]
+    return cases
+
+
+def environment():
+    """
+    Describe the machine and library versions, to tell whether results are comparable.
+
+    Returns:
+        dict: Versions, platform and CPU count
+    """
+    versions = {'python': platform.python_version(), 'numpy': np.__version__}
+    for module in ('qiskit', 'qiskit_aer', 'pennylane'):
+        try:
+            versions[module] = __import__(module).__version__
+        except ImportError:
+            versions[module] = None
+    return {'versions': versions, 'platform': platform.platform(),
+            'processor': platform.processor(), 'cpu_count': os.cpu_count()}
+
+
+def run_suite(suite='quick', only=None, log=print):
+    """
+    Run the cases of a suite.
+
+    Args:
+        suite (str, optional): Name of a suite in SUITES. Defaults to 'quick'.
+        only (str, optional): Run only the cases whose name starts with this prefix,
+                              e.g. 'dqi'. Defaults to None.
+        log (callable, optional): Progress output. Defaults to print.
+
+    Returns:
+        dict: The 'suite', 'timestamp', 'environment' and per-case 'results'
+    """
+    results = []
+    for case in build_cases(suite):
+        if only and not case.name.startswith(only):
+            continue
+        log(f"Running {case.name}")
+        results.append(case.run())
+    return {
+        'suite': suite,
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'environment': environment(),
+        'results': results
+    }
+
+
+def compare(current, baseline, threshold=REGRESSION_THRESHOLD, noise_floor=NOISE_FLOOR,
+            quality_tolerance=0.05):
+    """
+    Compare a benchmark run against a baseline run.
+
+    Args:
+        current (dict): Output of ``run_suite``
+        baseline (dict): Baseline output of ``run_suite``
+        threshold (float, optional): Slowdown of a median latency that counts as a
+                                     regression. Defaults to REGRESSION_THRESHOLD.
+        noise_floor (float, optional): Baseline medians below this many seconds are not
+                                       compared. Defaults to NOISE_FLOOR.
+        quality_tolerance (float, optional): Relative drop of a quality metric that counts
+                                             as a regression. Defaults to 0.05.
+
+    Returns:
+        dict: 'rows' with the ratio current / baseline of every compared stage median, and
+              the 'regressions' among them and among the quality metrics
+    """
+    baseline_cases = {case['name']: case for case in baseline['results']}
+    rows, regressions = [], []
+
+    for case in current['results']:
+        reference = baseline_cases.get(case['name'])
+        if reference is None:
+            continue
+
+        for stage, summary in case['stages'].items():
+            before = reference['stages'].get(stage, {}).get('median')
+            if before is None or before < noise_floor:
+                continue
+            row = {'case': case['name'], 'metric': stage, 'baseline': before,
+                   'current': summary['median'], 'ratio': summary['median'] / before}
+            rows.append(row)
+            if row['ratio'] > threshold:
+                regressions.append(row)
+
+        for metric, value in case['quality'].items():
+            before = reference['quality'].get(metric)
+            if not before or not isinstance(value, float):
+                continue
+            row = {'case': case['name'], 'metric': metric, 'baseline': before,
+                   'current': value, 'ratio': value / before}
+            if row['ratio'] < 1 - quality_tolerance:
+                regressions.append(row)
+
+    return {'rows': rows, 'regressions': regressions}
+
+
+def print_report(report, comparison=None):
+    """
+    Print the stage latencies of a run, with the ratios to the baseline if given.
+
+    Args:
+        report (dict): Output of ``run_suite``
+        comparison (dict, optional): Output of ``compare``
+    """
+    ratios = {}
+    if comparison is not None:
+        ratios = {(row['case'], row['metric']): row['ratio'] for row in comparison['rows']}
+
+    for case in report['results']:
+        rss = 'n/a' if case['peak_rss_mb'] is None else f"{case['peak_rss_mb']:.0f} MiB"
+        print(f"\n{case['name']}  (peak traced {case['peak_traced_mb']:.1f} MiB, RSS {rss})")
+        for stage, summary in case['stages'].items():
+            ratio = ratios.get((case['name'], stage))
+            suffix = f"  x{ratio:.2f}" if ratio is not None else ""
+            print(f"  {stage:<20} median {summary['median'] * 1e3:10.3f} ms  "
+                  f"p95 {summary['p95'] * 1e3:10.3f} ms{suffix}")
+        print("  quality: " + ", ".join(f"{k}={v:.4g}" for k, v in case['quality'].items()))
+
+    if comparison is not None:
+        print(f"\n{len(comparison['regressions'])} regression(s)")
+        for row in comparison['regressions']:
+            print(f"- {row['case']} {row['metric']}: {row['baseline']:.4g} -> "
+                  f"{row['current']:.4g} (x{row['ratio']:.2f})")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the DQI and QAOA solvers.")
+    parser.add_argument('--suite', choices=sorted(SUITES), default='quick')
+    parser.add_argument('--only', help="Run only cases whose name starts with this, e.g. 'qaoa'")
+    parser.add_argument('--output', default=None,
+                        help="JSON file for the results (default outputs/benchmarks/<suite>_<time>.json)")
+    parser.add_argument('--baseline', help="Baseline JSON file to compare against")
+    parser.add_argument('--save-baseline', help="Also write the results to this baseline file")
+    parser.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD,
+                        help="Slowdown ratio reported as a regression")
+    args = parser.parse_args(argv)
+
+    report = run_suite(args.suite, only=args.only)
+
+    output = args.output or os.path.join(
+        'outputs', 'benchmarks', f"{args.suite}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    for path in filter(None, (output, args.save_baseline)):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    comparison = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            comparison = compare(report, json.load(f), threshold=args.threshold)
+        report['comparison'] = comparison
+        with open(output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    print_report(report, comparison)
+    print(f"\nResults written to {output}")
+    return 1 if comparison and comparison['regressions'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,206 @@
+"""
+Circuit Cache Module
+
+This module provides a content-addressed cache for compiled DQI circuits. Entries are
+keyed by a hash of everything that determines the circuit: the parity check matrix,
+the phase vector, the error weight bound and amplitudes, the backend together with
+its transpile options, and the versions of the circuit compiler, the cache format
+and Qiskit, so circuits saved to disk by older code are never reused. Each entry
+holds both the built circuit and its transpiled form, so repeated runs on the same
+instance construct and transpile only once.
+
+Entries live in memory with least-recently-used eviction and can optionally be
+persisted to disk as QPY files, which lets separate processes share compiled circuits.
+
+Example:
+    To share a disk-backed cache between solvers:
+
+    ```python
+    cache = CircuitCache(maxsize=128, cache_dir='outputs/circuit_cache')
+    solver = DQIMaxXORSAT(parity_check_matrix, circuit_cache=cache)
+    ```
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import qiskit
+from qiskit import qpy
+
+from dqi_circuit import COMPILER_VERSION
+
+# Version of the cache key and file layout, bumped when either changes
+CACHE_FORMAT_VERSION = 1
+
+
+def circuit_key(parity_check_matrix, phase_vector, max_error_weight, error_weights=None,
+                backend_name=None, transpile_options=None, measure=True, measure_y=True):
+    """
+    Compute the content hash identifying a compiled DQI circuit.
+
+    Args:
+        parity_check_matrix (numpy.ndarray): The parity check matrix of the instance
+        phase_vector (numpy.ndarray): The vector v of the phase (-1)^(v·y)
+        max_error_weight (int): Largest error weight of the decoder
+        error_weights (list, optional): Amplitudes of the error weights, or None for the default
+        backend_name (str, optional): Name of the backend the circuit is transpiled for
+        transpile_options (dict, optional): Keyword arguments passed to ``transpile``
+        measure (bool, optional): Whether the circuit ends in measurements. Defaults to True.
+        measure_y (bool, optional): Whether the y register is measured too. Defaults to True.
+
+    Returns:
+        str: Hex digest of the SHA-256 hash of the inputs
+    """
+    matrix = np.ascontiguousarray(np.asarray(parity_check_matrix) % 2, dtype=np.uint8)
+
+    digest = hashlib.sha256()
+    digest.update(repr(matrix.shape).encode())
+    digest.update(matrix.tobytes())
+    digest.update(np.ascontiguousarray(phase_vector, dtype=np.float64).tobytes())
+    digest.update(repr(int(max_error_weight)).encode())
+    if error_weights is not None:
+        digest.update(np.ascontiguousarray(error_weights, dtype=np.float64).tobytes())
+    digest.update(json.dumps({
+        'format': CACHE_FORMAT_VERSION,
+        'compiler': COMPILER_VERSION,
+        'qiskit': qiskit.__version__,
+        'backend': backend_name,
+        'measure': bool(measure),
+        'measure_y': bool(measure and measure_y),
+        'transpile_options': transpile_options or {}
+    }, sort_keys=True, default=repr).encode())
+
+    return digest.hexdigest()
+
+
+class CircuitCache:
+    """
+    LRU cache of built and transpiled circuits with optional QPY persistence.
+
+    Attributes:
+        maxsize (int): Maximum number of entries kept in memory
+        cache_dir (str): Directory for QPY files, or None for a memory-only cache
+        hits (int): Number of lookups answered from memory or disk
+        misses (int): Number of lookups that required compilation
+    """
+
+    def __init__(self, maxsize=64, cache_dir=None):
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize (int, optional): Maximum number of entries kept in memory. Defaults to 64.
+            cache_dir (str, optional): Directory for QPY files. Defaults to None (memory only).
+        """
+        self.maxsize = maxsize
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.qpy")
+
+    def _store(self, key, entry):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def get(self, key):
+        """
+        Look up a compiled circuit.
+
+        Args:
+            key (str): The circuit key from ``circuit_key``
+
+        Returns:
+            tuple or None: (circuit, transpiled_circuit), or None if not cached
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+
+            if self.cache_dir and os.path.exists(self._path(key)):
+                with open(self._path(key), 'rb') as f:
+                    entry = tuple(qpy.load(f))
+                self._store(key, entry)
+                self.hits += 1
+                return entry
+
+            return None
+
+    def put(self, key, circuit, transpiled_circuit):
+        """
+        Add a compiled circuit to the cache.
+
+        Args:
+            key (str): The circuit key from ``circuit_key``
+            circuit (QuantumCircuit): The built circuit
+            transpiled_circuit (QuantumCircuit): The circuit transpiled for the backend
+        """
+        entry = (circuit, transpiled_circuit)
+
+        with self._lock:
+            self._store(key, entry)
+
+            if self.cache_dir:
+                # Write to a temporary file first so readers never see a partial file
+                tmp_path = f"{self._path(key)}.{os.getpid()}.tmp"
+                with open(tmp_path, 'wb') as f:
+                    qpy.dump(list(entry), f)
+                os.replace(tmp_path, self._path(key))
+
+    def get_or_compile(self, key, build, transpile):
+        """
+        Return the cached circuits for a key, compiling them on a miss.
+
+        Args:
+            key (str): The circuit key from ``circuit_key``
+            build (callable): Function returning the built circuit
+            transpile (callable): Function mapping the built circuit to the transpiled one
+
+        Returns:
+            tuple: (circuit, transpiled_circuit)
+        """
+        entry = self.get(key)
+        if entry is not None:
+            return entry
+
+        with self._lock:
+            self.misses += 1
+
+        circuit = build()
+        transpiled_circuit = transpile(circuit)
+        self.put(key, circuit, transpiled_circuit)
+
+        return circuit, transpiled_circuit
+
+    def clear(self):
+        """
+        Remove all in-memory entries. QPY files on disk are kept.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries or bool(self.cache_dir and os.path.exists(self._path(key)))
+
+    def __len__(self):
+        return len(self._entries)
+
+
+# Cache shared by all solvers that are not given one explicitly
+default_circuit_cache = CircuitCache()
@@ -0,0 +1,388 @@
+"""
+Classical Max-XORSAT Baselines Module
+
+This module solves Max-XORSAT instances classically, to judge the output of
+``DQIMaxXORSAT`` against known optima and standard heuristics. An instance uses the
+same conventions as the DQI solver: the parity check matrix H has one row per
+variable and one column per constraint, and constraint j asks for H[:, j]·x = v_j.
+
+Every method works on one bit-packed representation of the instance: for each
+variable, the set of constraints it appears in is packed into a mask, and the
+residual (H^T x) ⊕ v of an assignment is a mask whose set bits are the violated
+constraints. Flipping variable i XORs its mask into the residual, so every move
+costs one XOR and one popcount regardless of the number of constraints.
+
+- ``exhaustive_search`` walks all 2**n assignments in Gray-code order. The low
+  variables are tabulated once per block, and each step of the Gray code over the
+  high variables updates the whole block with a single vectorized XOR.
+- ``simulated_annealing`` and ``walksat`` are local searches for instances too
+  large to enumerate.
+
+Assignments are integers indexed like the bitstrings of ``DQIMaxXORSAT.run``:
+bit r of the integer is variable r.
+
+Example:
+    To compare DQI samples with the classical optimum:
+
+    ```python
+    baselines = ClassicalMaxXORSAT.from_solver(solver)
+    report = baselines.report(solver.run(shots=1024))
+    print(report['dqi_expected_satisfied'], report['optimum'])
+    ```
+"""
+
+import time
+
+import numpy as np
+
+from distribution import MAX_BITS, Distribution
+from gf2 import BitMatrix, pack_bits, popcount, words_to_int
+
+
+class ClassicalMaxXORSAT:
+    """
+    Bit-packed Max-XORSAT instance with exact and heuristic classical solvers.
+
+    Attributes:
+        parity_check_matrix (numpy.ndarray): The parity check matrix H
+        n_variables (int): Number of variables (rows of H)
+        n_constraints (int): Number of constraints (columns of H)
+        phase_vector (numpy.ndarray): Right-hand side v of the constraints as 0/1
+        variable_words (numpy.ndarray): Packed constraint masks of the variables,
+                                        uint64 array of shape (n_variables, n_words)
+        target_words (numpy.ndarray): Packed right-hand side, uint64 array of length n_words
+    """
+
+    def __init__(self, parity_check_matrix, phase_vector=None):
+        """
+        Initialize the instance.
+
+        Args:
+            parity_check_matrix (numpy.ndarray): Binary matrix of shape (n_variables, n_constraints)
+            phase_vector (list, optional): Right-hand side v, where positive entries mean 1.
+                                           Defaults to all ones, as in ``DQIMaxXORSAT``.
+        """
+        self.parity_check_matrix = np.asarray(parity_check_matrix) % 2
+        self.n_variables, self.n_constraints = self.parity_check_matrix.shape
+
+        if phase_vector is None:
+            phase_vector = np.ones(self.n_constraints)
+        self.phase_vector = (np.asarray(phase_vector) > 0).astype(np.int64)
+
+        self.variable_words = BitMatrix.from_dense(self.parity_check_matrix).words
+        self.target_words = pack_bits(self.phase_vector)
+        self._constraints = BitMatrix.from_dense(self.parity_check_matrix.T)
+
+        # The same masks as Python integers for the single-assignment local searches;
+        # constraint j is bit n_constraints - 1 - j
+        self._variable_masks = [words_to_int(words) for words in self.variable_words]
+        self._target_mask = words_to_int(self.target_words)
+        self._constraint_variables = [np.flatnonzero(column) for column in self.parity_check_matrix.T]
+        self._variable_constraints = [np.flatnonzero(row).tolist() for row in self.parity_check_matrix]
+        self._nonempty_mask = words_to_int(pack_bits(self.parity_check_matrix.any(axis=0)))
+
+    @classmethod
+    def from_solver(cls, solver):
+        """
+        Create the classical instance solved by a ``DQIMaxXORSAT`` solver.
+
+        Args:
+            solver (DQIMaxXORSAT): The DQI solver
+
+        Returns:
+            ClassicalMaxXORSAT: The instance
+        """
+        return cls(solver.parity_check_matrix, solver.phase_vector)
+
+    def _residual_mask(self, assignment):
+        """
+        Compute the mask of violated constraints of one assignment.
+
+        Args:
+            assignment (int): The assignment, bit r is variable r
+
+        Returns:
+            int: Mask with bit n_constraints - 1 - j set if constraint j is violated
+        """
+        residual = self._target_mask
+        for i, mask in enumerate(self._variable_masks):
+            if (assignment >> i) & 1:
+                residual ^= mask
+        return residual
+
+    def _random_assignment(self, rng):
+        """
+        Draw a uniformly random assignment.
+
+        Args:
+            rng (numpy.random.Generator): Random generator
+
+        Returns:
+            int: The assignment, bit r is variable r
+        """
+        value = int.from_bytes(rng.bytes(-(-self.n_variables // 8)), 'big')
+        return value & ((1 << self.n_variables) - 1)
+
+    def satisfied_counts(self, assignments):
+        """
+        Count the satisfied constraints of many assignments.
+
+        Args:
+            assignments (numpy.ndarray): Integer assignments, bit r is variable r, or a
+                                         0/1 array of shape (n_assignments, n_variables)
+                                         for instances too wide for integers
+
+        Returns:
+            numpy.ndarray: Number of satisfied constraints per assignment
+        """
+        assignments = np.asarray(assignments)
+        if assignments.ndim == 2:
+            x_bits = assignments
+        else:
+            assignments = assignments.astype(np.int64).reshape(-1)
+            x_bits = (assignments[:, None] >> np.arange(self.n_variables)) & 1
+        residual = self._constraints.batch_matvec(x_bits).words ^ self.target_words
+        return self.n_constraints - popcount(residual).sum(axis=1, dtype=np.int64)
+
+    def random_expected_satisfied(self):
+        """
+        Expected number of satisfied constraints of a uniformly random assignment.
+
+        Returns:
+            float: Half of the non-empty constraints plus the empty constraints with v_j = 0
+        """
+        empty = ~self.parity_check_matrix.any(axis=0)
+        return float(np.count_nonzero(~empty) / 2 + np.count_nonzero(empty & (self.phase_vector == 0)))
+
+    def exhaustive_search(self, block_bits=16, max_solutions=1024):
+        """
+        Find the optimum by enumerating all assignments in Gray-code order.
+
+        Args:
+            block_bits (int, optional): Number of low variables tabulated per block.
+                                        Defaults to 16.
+            max_solutions (int, optional): Largest number of optimal assignments returned.
+                                           Defaults to 1024.
+
+        Returns:
+            dict: The optimal number of 'satisfied' constraints, up to ``max_solutions``
+                  'optimal_assignments', the total number of optima 'n_optimal', and the
+                  'histogram' of the number of assignments per satisfied count
+        """
+        low_bits = min(block_bits, self.n_variables)
+        high_bits = self.n_variables - low_bits
+
+        # Residuals of all low assignments, index bit i = variable i
+        table = self.target_words[None, :].copy()
+        for i in range(low_bits):
+            table = np.concatenate([table, table ^ self.variable_words[i]])
+        low_indices = np.arange(table.shape[0], dtype=np.int64)
+
+        histogram = np.zeros(self.n_constraints + 1, dtype=np.int64)
+        best = -1
+        n_optimal = 0
+        optimal = []
+
+        high = 0
+        offset = np.zeros_like(self.target_words)
+        for step in range(1 << high_bits):
+            if step:
+                # Gray code: the variable flipped at this step is the lowest set bit of step
+                bit = (step & -step).bit_length() - 1
+                high ^= 1 << bit
+                offset ^= self.variable_words[low_bits + bit]
+
+            satisfied = self.n_constraints - popcount(table ^ offset).sum(axis=1, dtype=np.int64)
+            histogram += np.bincount(satisfied, minlength=self.n_constraints + 1)
+
+            block_best = int(satisfied.max())
+            if block_best < best:
+                continue
+            if block_best > best:
+                best, n_optimal, optimal = block_best, 0, []
+
+            hits = low_indices[satisfied == best]
+            n_optimal += hits.size
+            if len(optimal) < max_solutions:
+                optimal.extend(((high << low_bits) | hits[:max_solutions - len(optimal)]).tolist())
+
+        return {
+            'satisfied': best,
+            'optimal_assignments': sorted(optimal),
+            'n_optimal': n_optimal,
+            'histogram': histogram
+        }
+
+    def simulated_annealing(self, sweeps=1000, t_start=2.0, t_end=0.05, restarts=1, seed=None):
+        """
+        Search for a good assignment with single-flip simulated annealing.
+
+        The temperature decreases geometrically from ``t_start`` to ``t_end`` over the
+        sweeps, and each sweep proposes n_variables random flips.
+
+        Args:
+            sweeps (int, optional): Number of sweeps per restart. Defaults to 1000.
+            t_start (float, optional): Initial temperature. Defaults to 2.0.
+            t_end (float, optional): Final temperature. Defaults to 0.05.
+            restarts (int, optional): Number of independent runs. Defaults to 1.
+            seed (int, optional): Seed of the random generator. Defaults to None.
+
+        Returns:
+            dict: The best 'assignment' found and its number of 'satisfied' constraints
+        """
+        rng = np.random.default_rng(seed)
+        masks = self._variable_masks
+        n = self.n_variables
+        best_assignment, best_unsat = 0, self._residual_mask(0).bit_count()
+
+        for _ in range(restarts):
+            assignment = self._random_assignment(rng)
+            residual = self._residual_mask(assignment)
+            unsat = residual.bit_count()
+
+            for sweep in range(sweeps):
+                temperature = t_start * (t_end / t_start) ** (sweep / max(sweeps - 1, 1))
+                flips = rng.integers(0, n, n).tolist()
+                thresholds = (-temperature * np.log(rng.random(n))).tolist()
+
+                for i, threshold in zip(flips, thresholds):
+                    flipped = residual ^ masks[i]
+                    delta = flipped.bit_count() - unsat
+                    # Metropolis: accept with probability exp(-delta / T)
+                    if delta <= threshold:
+                        residual, unsat = flipped, unsat + delta
+                        assignment ^= 1 << i
+                        if unsat < best_unsat:
+                            best_assignment, best_unsat = assignment, unsat
+
+        return {'assignment': best_assignment, 'satisfied': self.n_constraints - best_unsat}
+
+    def walksat(self, max_flips=10000, noise=0.5, restarts=1, seed=None):
+        """
+        Search for a good assignment with WalkSAT-style local search.
+
+        Each step picks a random violated constraint and flips one of its variables:
+        a random one with probability ``noise``, otherwise the one leaving the fewest
+        violated constraints. The violated constraints are kept in a list with the
+        position of each, so a flip only updates the constraints of the flipped variable.
+
+        Args:
+            max_flips (int, optional): Number of flips per restart. Defaults to 10000.
+            noise (float, optional): Probability of a random walk step. Defaults to 0.5.
+            restarts (int, optional): Number of independent runs. Defaults to 1.
+            seed (int, optional): Seed of the random generator. Defaults to None.
+
+        Returns:
+            dict: The best 'assignment' found and its number of 'satisfied' constraints
+        """
+        rng = np.random.default_rng(seed)
+        touched = self._variable_constraints
+        m = self.n_constraints
+        best_assignment, best_unsat = 0, self._residual_mask(0).bit_count()
+
+        # Empty constraints with v_j = 1 can never be satisfied, so they are never picked
+        unfixable = (self._target_mask & ~self._nonempty_mask).bit_count()
+
+        for _ in range(restarts):
+            assignment = self._random_assignment(rng)
+            fixable = self._residual_mask(assignment) & self._nonempty_mask
+
+            # Violated constraints are the set bits, constraint j at bit m - 1 - j
+            violated = [j for j in range(m) if (fixable >> (m - 1 - j)) & 1]
+            position = [-1] * m
+            for p, j in enumerate(violated):
+                position[j] = p
+
+            for _ in range(max_flips):
+                if not violated:
+                    break
+                candidates = self._constraint_variables[violated[rng.integers(len(violated))]]
+
+                if rng.random() < noise:
+                    i = int(candidates[rng.integers(candidates.size)])
+                else:
+                    # A flip satisfies the violated constraints of the variable and violates the others
+                    i = int(min(candidates, key=lambda v: len(touched[v])
+                                - 2 * sum(position[j] >= 0 for j in touched[v])))
+
+                for j in touched[i]:
+                    p = position[j]
+                    if p < 0:
+                        position[j] = len(violated)
+                        violated.append(j)
+                    else:
+                        last = violated.pop()
+                        if last != j:
+                            violated[p], position[last] = last, p
+                        position[j] = -1
+                assignment ^= 1 << i
+                if len(violated) + unfixable < best_unsat:
+                    best_assignment, best_unsat = assignment, len(violated) + unfixable
+
+        return {'assignment': best_assignment, 'satisfied': m - best_unsat}
+
+    def report(self, counts, exhaustive_limit=24, seed=None):
+        """
+        Compare DQI output with the classical baselines.
+
+        The optimum is found by exhaustive search when there are at most
+        ``exhaustive_limit`` variables, and is otherwise the best result of simulated
+        annealing and WalkSAT.
+
+        Args:
+            counts (Distribution or dict): DQI counts or probabilities keyed by solution bitstrings
+            exhaustive_limit (int, optional): Largest number of variables searched
+                                              exhaustively. Defaults to 24.
+            seed (int, optional): Seed for the local searches. Defaults to None.
+
+        Returns:
+            dict: The 'optimum' and whether it is 'optimum_exact', the DQI
+                  'dqi_expected_satisfied', 'dqi_best_satisfied', 'dqi_optimal_probability'
+                  and 'approximation_ratio', the 'random_expected_satisfied', and the
+                  result and 'time' of each baseline under 'baselines'
+        """
+        baselines = {}
+
+        start = time.perf_counter()
+        annealing = self.simulated_annealing(seed=seed)
+        baselines['simulated_annealing'] = {'satisfied': annealing['satisfied'],
+                                            'time': time.perf_counter() - start}
+
+        start = time.perf_counter()
+        walk = self.walksat(seed=seed)
+        baselines['walksat'] = {'satisfied': walk['satisfied'], 'time': time.perf_counter() - start}
+
+        optimum = max(annealing['satisfied'], walk['satisfied'])
+        optimum_exact = self.n_variables <= exhaustive_limit
+        if optimum_exact:
+            start = time.perf_counter()
+            exhaustive = self.exhaustive_search()
+            baselines['exhaustive'] = {'satisfied': exhaustive['satisfied'],
+                                       'n_optimal': exhaustive['n_optimal'],
+                                       'time': time.perf_counter() - start}
+            optimum = exhaustive['satisfied']
+
+        if self.n_variables <= MAX_BITS:
+            counts = Distribution.from_dict(counts, self.n_variables)
+            assignments = counts.states.astype(np.int64)
+            weights = counts.probabilities()
+        else:
+            # Wider than a Distribution state: variable r is character -1 - r of a bitstring
+            keys = [key.replace(' ', '') for key in counts]
+            bits = np.frombuffer(''.join(keys).encode(), dtype=np.uint8).reshape(len(keys), -1) - ord('0')
+            assignments = bits[:, ::-1]
+            weights = np.array(list(counts.values()), dtype=np.float64)
+            weights /= weights.sum()
+        satisfied = self.satisfied_counts(assignments)
+        expected = float(weights @ satisfied)
+
+        return {
+            'optimum': int(optimum),
+            'optimum_exact': optimum_exact,
+            'dqi_expected_satisfied': expected,
+            'dqi_best_satisfied': int(satisfied.max()),
+            'dqi_optimal_probability': float(weights[satisfied == optimum].sum()),
+            'approximation_ratio': expected / optimum if optimum else 1.0,
+            'random_expected_satisfied': self.random_expected_satisfied(),
+            'baselines': baselines
+        }
@@ -0,0 +1,193 @@
+"""
+Code Distance Module
+
+This module computes the minimum distance and the weight distribution of the
+binary code defined by a parity check matrix H, i.e. of its kernel
+{y : H·y = 0 mod 2}. The minimum distance is the smallest number of columns of H
+that sum to zero, and it bounds the error weights a syndrome decoder can correct:
+DQI with error weight t needs distance at least 2t + 1 for perfect decoding.
+
+- ``weight_distribution`` enumerates the smaller of the code and its dual (the row
+  space of H) in Gray-code order over bit-packed basis vectors, one vectorized XOR
+  per step, and maps the dual distribution back with the MacWilliams identity.
+- ``minimum_distance`` uses the Brouwer–Zimmermann algorithm: codewords are built
+  from few rows of several systematic generator matrices with different information
+  sets, and the search stops as soon as the lower bound implied by the enumerated
+  rows meets the lightest codeword found, or an optional target is reached.
+
+Example:
+    To check whether a matrix supports decoding two errors:
+
+    ```python
+    d = minimum_distance(parity_check_matrix, target=5)
+    if d is not None and d >= 5:
+        solver = DQIMaxXORSAT(parity_check_matrix, max_error_weight=2)
+    ```
+"""
+
+from itertools import combinations, islice
+from math import comb
+
+import numpy as np
+
+from gf2 import BitMatrix, popcount
+
+# Number of row combinations XORed per vectorized chunk
+COMBINATION_CHUNK = 1 << 16
+
+
+def _span_weight_histogram(basis, block_bits=16):
+    """
+    Count the vectors of each Hamming weight in the span of a basis.
+
+    The span of the first ``block_bits`` basis vectors is tabulated once, and the
+    remaining basis vectors are added in Gray-code order, each step updating the
+    whole table with one XOR.
+
+    Args:
+        basis (BitMatrix): Basis vectors of shape (k, n_bits)
+        block_bits (int, optional): Number of basis vectors tabulated. Defaults to 16.
+
+    Returns:
+        numpy.ndarray: Counts of length n_bits + 1, summing to 2**k
+    """
+    words = basis.words
+    n_bits = basis.n_cols
+    low_bits = min(block_bits, len(words))
+
+    table = np.zeros((1, words.shape[1]), dtype=np.uint64)
+    for i in range(low_bits):
+        table = np.concatenate([table, table ^ words[i]])
+
+    histogram = np.zeros(n_bits + 1, dtype=np.int64)
+    offset = np.zeros(words.shape[1], dtype=np.uint64)
+    for step in range(1 << (len(words) - low_bits)):
+        if step:
+            bit = (step & -step).bit_length() - 1
+            offset ^= words[low_bits + bit]
+        weights = popcount(table ^ offset).sum(axis=1, dtype=np.int64)
+        histogram += np.bincount(weights, minlength=n_bits + 1)
+
+    return histogram
+
+
+def weight_distribution(parity_check_matrix, block_bits=16):
+    """
+    Compute the number of codewords of each weight in the kernel of H.
+
+    Args:
+        parity_check_matrix (numpy.ndarray): Binary matrix of shape (n_checks, n_bits)
+        block_bits (int, optional): Number of basis vectors tabulated per Gray-code block.
+                                    Defaults to 16.
+
+    Returns:
+        numpy.ndarray: Array A of length n_bits + 1 with A[w] codewords of weight w
+    """
+    H = BitMatrix.from_dense(parity_check_matrix)
+    n_bits = H.n_cols
+    dual = H.row_space_basis()
+    dimension = n_bits - dual.n_rows
+
+    if dimension <= dual.n_rows:
+        return _span_weight_histogram(H.kernel_basis(), block_bits)
+
+    # MacWilliams identity: A_w = 2^-rank sum_i B_i K_w(i) with exact integer Krawtchouk values
+    dual_histogram = _span_weight_histogram(dual, block_bits).tolist()
+    distribution = []
+    for w in range(n_bits + 1):
+        total = sum(
+            count * sum((-1) ** j * comb(i, j) * comb(n_bits - i, w - j) for j in range(w + 1))
+            for i, count in enumerate(dual_histogram) if count
+        )
+        distribution.append(total >> dual.n_rows)
+    return np.array(distribution, dtype=np.int64)
+
+
+def _information_sets(generator):
+    """
+    Build systematic generator matrices on information sets that overlap as little as possible.
+
+    Args:
+        generator (BitMatrix): Generator matrix of shape (k, n_bits) with full row rank
+
+    Returns:
+        list: (packed systematic generator rows, number of pivots shared with earlier sets)
+    """
+    k, n_bits = generator.shape
+    used = np.zeros(n_bits, dtype=bool)
+    matrices = []
+
+    while not used.all():
+        order = np.concatenate([np.flatnonzero(~used), np.flatnonzero(used)])
+        systematic, pivots = generator.row_reduce(order)
+        new = np.count_nonzero(~used[pivots])
+        if new == 0:
+            break
+        matrices.append((systematic.words, k - new))
+        used[pivots] = True
+
+    return matrices
+
+
+def minimum_distance(parity_check_matrix, target=None):
+    """
+    Compute the minimum distance of the kernel of H with the Brouwer–Zimmermann algorithm.
+
+    For each information set, all codewords generated by w rows of its systematic
+    generator matrix are enumerated for w = 1, 2, ... Any codeword not seen yet then has
+    more than w nonzero coordinates in the new positions of every information set,
+    which gives a lower bound, and the search ends once it reaches the lightest
+    codeword found.
+
+    Args:
+        parity_check_matrix (numpy.ndarray): Binary matrix of shape (n_checks, n_bits)
+        target (int, optional): Stop as soon as the distance is known to be at least
+                                ``target``, returning ``target`` unless the exact distance is
+                                already known. Distances below the target are always exact.
+                                Defaults to None.
+
+    Returns:
+        int: The minimum distance, or None if the kernel is trivial
+    """
+    generator = BitMatrix.from_dense(parity_check_matrix).kernel_basis()
+    k = generator.n_rows
+    if k == 0:
+        return None
+
+    matrices = _information_sets(generator)
+    upper = int(generator.row_weights().min())
+
+    for w in range(1, k + 1):
+        lower = sum(max(0, w - overlap) for _, overlap in matrices)
+        if lower >= upper:
+            return upper
+        if target is not None and lower >= target:
+            return target
+
+        for words, _ in matrices:
+            rows = combinations(range(k), w)
+            while True:
+                chunk = np.fromiter((i for combo in islice(rows, COMBINATION_CHUNK) for i in combo),
+                                    dtype=np.int64).reshape(-1, w)
+                if chunk.size == 0:
+                    break
+                codewords = np.bitwise_xor.reduce(words[chunk], axis=1)
+                upper = min(upper, int(popcount(codewords).sum(axis=1).min()))
+
+    return upper
+
+
+def correctable_weight(parity_check_matrix):
+    """
+    Largest error weight t that a lookup decoder for H corrects without ambiguity.
+
+    Args:
+        parity_check_matrix (numpy.ndarray): Binary matrix of shape (n_checks, n_bits)
+
+    Returns:
+        int: (d - 1) // 2 for minimum distance d, or n_bits if the kernel is trivial
+    """
+    distance = minimum_distance(parity_check_matrix)
+    if distance is None:
+        return np.asarray(parity_check_matrix).shape[1]
+    return (distance - 1) // 2
@@ -0,0 +1,494 @@
+"""
+Syndrome Decoders Module
+
+This module provides interchangeable syndrome decoders for a parity check matrix H.
+Given syndromes s = H·e, a decoder returns error patterns e' with H·e' = s, ideally
+of minimum weight. All decoders take batches of syndromes as a ``BitMatrix`` or a
+0/1 array of shape (n_syndromes, n_checks) and decode them in vectorized form.
+
+- ``LookupDecoder`` reads the syndrome table of all errors of weight <= t. It is
+  exact within its radius, but the table grows as C(n_bits, t).
+- ``InformationSetDecoder`` draws random information sets, solves H·e = s with the
+  error supported on the pivot columns, and keeps the lightest solution. Its memory
+  does not depend on the radius.
+- ``BeliefPropagationDecoder`` runs scaled min-sum message passing on the sparse
+  Tanner graph of H, which scales to large LDPC-like matrices. Its result is
+  refined by ordered statistics decoding (OSD-0): the error supported on the
+  least reliable independent columns, which corrects the heavy but consistent
+  hard decisions min-sum makes on small dense codes.
+
+``benchmark_decoders`` measures the throughput of decoders and their success rate
+per error weight, and ``select_decoder`` picks the fastest decoder that reaches a
+required decoding radius.
+
+Example:
+    To pick a decoder for errors of weight up to 3:
+
+    ```python
+    decoders = [LookupDecoder(H, max_weight=3), BeliefPropagationDecoder(H)]
+    decoder, report = select_decoder(decoders, radius=3)
+    errors, found = decoder.decode(syndromes)
+    ```
+"""
+
+import time
+
+import numpy as np
+
+from gf2 import BitMatrix, words_to_int
+from syndrome_table import SyndromeTable
+
+
+class SyndromeDecoder:
+    """
+    Base class of the batched syndrome decoders.
+
+    Subclasses implement ``_decode``, which maps dense 0/1 syndromes to dense 0/1
+    error patterns.
+
+    Attributes:
+        name (str): Short name of the decoder type
+        label (str): Name and settings of the decoder, used in reports
+        parity_check_matrix (numpy.ndarray): The parity check matrix H
+        n_checks (int): Number of rows of H, i.e. syndrome bits
+        n_bits (int): Number of columns of H, i.e. error bits
+        matrix (BitMatrix): H in packed form
+    """
+
+    name = "decoder"
+
+    # Attributes that tell decoders of the same type apart in reports
+    settings = ()
+
+    def __init__(self, parity_check_matrix):
+        """
+        Initialize the decoder.
+
+        Args:
+            parity_check_matrix (numpy.ndarray): Binary matrix of shape (n_checks, n_bits)
+        """
+        self.parity_check_matrix = np.asarray(parity_check_matrix) % 2
+        self.n_checks, self.n_bits = self.parity_check_matrix.shape
+        self.matrix = BitMatrix.from_dense(self.parity_check_matrix)
+
+    @property
+    def label(self):
+        settings = ', '.join(f"{setting}={getattr(self, setting)}" for setting in self.settings)
+        return f"{self.name}({settings})"
+
+    def syndromes(self, errors):
+        """
+        Compute the syndromes H·e of a batch of error patterns.
+
+        Args:
+            errors: BitMatrix or 0/1 array of shape (n_errors, n_bits)
+
+        Returns:
+            BitMatrix: Syndromes of shape (n_errors, n_checks)
+        """
+        return self.matrix.batch_matvec(errors)
+
+    def decode(self, syndromes):
+        """
+        Decode a batch of syndromes.
+
+        Args:
+            syndromes: BitMatrix or 0/1 array of shape (n_syndromes, n_checks)
+
+        Returns:
+            tuple: (errors, found) with the decoded errors as a BitMatrix of shape
+                   (n_syndromes, n_bits) and a boolean mask of the syndromes for which
+                   an error with exactly that syndrome was found
+        """
+        if isinstance(syndromes, BitMatrix):
+            syndrome_bits = syndromes.to_dense()
+        else:
+            syndrome_bits = np.atleast_2d(np.asarray(syndromes, dtype=np.uint8)) & 1
+        if syndrome_bits.shape[1] != self.n_checks:
+            raise ValueError(f"Syndromes must have {self.n_checks} bits")
+
+        errors = BitMatrix.from_dense(self._decode(syndrome_bits))
+        found = np.all(self.syndromes(errors).words == BitMatrix.from_dense(syndrome_bits).words, axis=1)
+        return errors, found
+
+    def _decode(self, syndrome_bits):
+        raise NotImplementedError
+
+
+class LookupDecoder(SyndromeDecoder):
+    """
+    Decoder reading a syndrome table of all error patterns of weight <= max_weight.
+
+    Attributes:
+        max_weight (int): Largest tabulated error weight
+        table (SyndromeTable): The syndrome table
+    """
+
+    name = "lookup"
+    settings = ('max_weight',)
+
+    def __init__(self, parity_check_matrix, max_weight=2, table=None):
+        """
+        Initialize the decoder.
+
+        Args:
+            parity_check_matrix (numpy.ndarray): Binary matrix of shape (n_checks, n_bits)
+            max_weight (int, optional): Largest tabulated error weight. Defaults to 2.
+            table (SyndromeTable, optional): An existing table for the same matrix
+        """
+        super().__init__(parity_check_matrix)
+        self.max_weight = max_weight
+        self.table = table if table is not None else SyndromeTable(self.parity_check_matrix, max_weight)
+
+    def _decode(self, syndrome_bits):
+        syndromes = BitMatrix.from_dense(syndrome_bits).words
+        if self.n_checks <= 64:
+            errors, _ = self.table.decode(syndromes[:, 0])
+        else:
+            errors = np.zeros((len(syndromes), self.table.errors.shape[1]), dtype=np.uint64)
+            for i, row in enumerate(syndromes):
+                position = self.table._position(words_to_int(row))
+                if position is not None:
+                    errors[i] = self.table.errors[position]
+        return BitMatrix(errors, self.n_bits).to_dense()
+
+
+class InformationSetDecoder(SyndromeDecoder):
+    """
+    Prange information set decoder.
+
+    Each iteration row reduces H with the columns in a random order. The reduction
+    is applied to the syndromes too, which gives, for every syndrome, the unique
+    error supported on the pivot columns. The lightest error over all iterations is
+    kept, and iterating stops once every syndrome has an error within ``max_weight``.
+
+    Attributes:
+        max_weight (int): Weight at which a syndrome counts as decoded, or None
+        iterations (int): Largest number of information sets tried
+        seed (int): Seed of the column permutations
+    """
+
+    name = "information_set"
+    settings = ('max_weight', 'iterations', 'seed')
+
+    def __init__(self, parity_check_matrix, max_weight=None, iterations=100, seed=None):
+        """
+        Initialize the decoder.
+
+        Args:
+            parity_check_matrix (numpy.ndarray): Binary matrix of shape (n_checks, n_bits)
+            max_weight (int, optional): Stop once all errors have at most this weight.
+                                        Defaults to None (run all iterations).
+            iterations (int, optional): Number of information sets. Defaults to 100.
+            seed (int, optional): Seed of the column permutations. Defaults to None.
+        """
+        super().__init__(parity_check_matrix)
+        self.max_weight = max_weight
+        self.iterations = iterations
+        self.seed = seed
+
+    def _decode(self, syndrome_bits):
+        rng = np.random.default_rng(self.seed)
+        n_syndromes = syndrome_bits.shape[0]
+
+        # Row reducing [H | I] records the row operations T in the right block
+        augmented = BitMatrix.from_dense(np.hstack([self.parity_check_matrix,
+                                                    np.eye(self.n_checks, dtype=np.uint8)]))
+        syndromes = BitMatrix.from_dense(syndrome_bits)
+
+        best = np.zeros((n_syndromes, self.n_bits), dtype=np.uint8)
+        best_weights = np.full(n_syndromes, self.n_bits + 1)
+        for _ in range(self.iterations):
+            order = rng.permutation(self.n_bits)
+            reduced, pivots = augmented.row_reduce(order)
+            transform = BitMatrix.from_dense(reduced.to_dense()[:, self.n_bits:])
+
+            # T·s gives the values of the pivot variables with all other variables zero
+            pivot_values = transform.batch_matvec(syndromes).to_dense()
+            weights = pivot_values.sum(axis=1)
+            better = weights < best_weights
+            best[np.ix_(better, pivots)] = pivot_values[better]
+            best[np.ix_(better, np.setdiff1d(np.arange(self.n_bits), pivots))] = 0
+            best_weights[better] = weights[better]
+
+            if self.max_weight is not None and best_weights.max() <= self.max_weight:
+                break
+
+        return best
+
+
+class BeliefPropagationDecoder(SyndromeDecoder):
+    """
+    Scaled min-sum belief propagation on the Tanner graph of H.
+
+    Messages live on the edges of the graph, i.e. the nonzero entries of H, and
+    are updated for all syndromes of a batch at once. A syndrome stops being updated
+    as soon as its hard decision reproduces it.
+
+    With ``osd`` set, every syndrome is also decoded by OSD-0: H is row reduced with
+    the columns ordered from the most to the least likely error, and the unique error
+    supported on the pivot columns is kept when it is lighter than the hard decision
+    or the hard decision is inconsistent. The order comes from the posteriors summed
+    over all rounds rather than the last ones, which min-sum leaves oscillating on
+    small dense codes. This costs one row reduction per distinct syndrome.
+
+    Attributes:
+        max_iterations (int): Largest number of message passing rounds
+        scaling (float): Scaling factor of the check-to-variable messages
+        error_rate (float): Prior probability of each error bit
+        osd (bool): Whether the result is refined by OSD-0
+    """
+
+    name = "belief_propagation"
+    settings = ('max_iterations', 'scaling', 'error_rate', 'osd')
+
+    # Largest magnitude of a log-likelihood ratio, which keeps degree-one checks finite
+    MAX_LLR = 100.0
+
+    def __init__(self, parity_check_matrix, max_iterations=50, scaling=0.75, error_rate=0.05,
+                 osd=True):
+        """
+        Initialize the decoder.
+
+        Args:
+            parity_check_matrix (numpy.ndarray): Binary matrix of shape (n_checks, n_bits)
+            max_iterations (int, optional): Number of message passing rounds. Defaults to 50.
+            scaling (float, optional): Min-sum scaling factor. Defaults to 0.75.
+            error_rate (float, optional): Prior error probability per bit. Defaults to 0.05.
+            osd (bool, optional): Refine the result by OSD-0. Defaults to True.
+        """
+        super().__init__(parity_check_matrix)
+        self.max_iterations = max_iterations
+        self.scaling = scaling
+        self.error_rate = error_rate
+        self.osd = osd
+
+        # Edges sorted by check, and the permutation sorting them by variable
+        self._checks, self._variables = np.nonzero(self.parity_check_matrix)
+        self._check_starts = np.flatnonzero(np.r_[True, np.diff(self._checks) != 0]) if self._checks.size else np.array([], dtype=np.int64)
+        self._by_variable = np.argsort(self._variables, kind='stable')
+        sorted_variables = self._variables[self._by_variable]
+        self._variable_starts = np.flatnonzero(np.r_[True, np.diff(sorted_variables) != 0]) if sorted_variables.size else np.array([], dtype=np.int64)
+        self._edge_checks = np.unique(self._checks)
+        self._edge_variables = np.unique(self._variables)
+
+    def _variable_totals(self, messages):
+        """
+        Sum the messages arriving at every variable.
+
+        Args:
+            messages (numpy.ndarray): Edge messages of shape (n_syndromes, n_edges)
+
+        Returns:
+            numpy.ndarray: Sums of shape (n_syndromes, n_bits)
+        """
+        totals = np.zeros((messages.shape[0], self.n_bits))
+        if self._variable_starts.size:
+            totals[:, self._edge_variables] = np.add.reduceat(messages[:, self._by_variable],
+                                                              self._variable_starts, axis=1)
+        return totals
+
+    def _check_messages(self, incoming, syndrome_signs):
+        """
+        Min-sum check update: each edge gets the sign product and minimum magnitude of
+        the other edges of its check.
+
+        Args:
+            incoming (numpy.ndarray): Variable-to-check messages of shape (n_syndromes, n_edges)
+            syndrome_signs (numpy.ndarray): Parity of each check's syndrome bit, shape
+                                            (n_syndromes, n_edge_checks)
+
+        Returns:
+            numpy.ndarray: Check-to-variable messages of shape (n_syndromes, n_edges)
+        """
+        starts = self._check_starts
+        edge_group = np.repeat(np.arange(starts.size), np.diff(np.r_[starts, incoming.shape[1]]))
+
+        magnitudes = np.abs(incoming)
+        negative = incoming < 0
+        parity = (np.add.reduceat(negative, starts, axis=1) + syndrome_signs) % 2
+        signs = 1 - 2 * (parity[:, edge_group] ^ negative)
+
+        first = np.minimum.reduceat(magnitudes, starts, axis=1)
+        is_min = magnitudes == first[:, edge_group]
+        n_min = np.add.reduceat(is_min, starts, axis=1)
+        second = np.minimum.reduceat(np.where(is_min, np.inf, magnitudes), starts, axis=1)
+        # With a tied minimum, every edge sees the minimum among the others
+        second = np.where(n_min > 1, first, second)
+        others = np.where(is_min, second[:, edge_group], first[:, edge_group])
+
+        return self.scaling * signs * np.minimum(others, self.MAX_LLR)
+
+    def _ordered_statistics(self, syndrome_bits, posteriors):
+        """
+        OSD-0: solve H·e = s on the least reliable independent columns.
+
+        Args:
+            syndrome_bits (numpy.ndarray): Syndromes of shape (n_syndromes, n_checks)
+            posteriors (numpy.ndarray): Log-likelihood ratios of shape (n_syndromes, n_bits),
+                                        negative for likely errors
+
+        Returns:
+            numpy.ndarray: Errors of shape (n_syndromes, n_bits), which reproduce their
+                           syndrome whenever it lies in the column space of H
+        """
+        # Row reducing [H | I] records the row operations T in the right block
+        augmented = BitMatrix.from_dense(np.hstack([self.parity_check_matrix,
+                                                    np.eye(self.n_checks, dtype=np.uint8)]))
+        errors = np.zeros((syndrome_bits.shape[0], self.n_bits), dtype=np.uint8)
+        for i, (syndrome, posterior) in enumerate(zip(syndrome_bits, posteriors)):
+            reduced, pivots = augmented.row_reduce(np.argsort(posterior, kind='stable'))
+            transform = reduced.to_dense()[:, self.n_bits:].astype(np.int64)
+            errors[i, pivots] = (transform @ syndrome) % 2
+        return errors
+
+    def _decode(self, syndrome_bits):
+        n_syndromes = syndrome_bits.shape[0]
+        prior = np.log((1 - self.error_rate) / self.error_rate)
+        decisions = np.zeros((n_syndromes, self.n_bits), dtype=np.uint8)
+        if not self._checks.size:
+            return decisions
+
+        syndrome_signs = syndrome_bits[:, self._edge_checks].astype(np.int64)
+        to_variables = np.zeros((n_syndromes, self._checks.size))
+        summed = np.zeros((n_syndromes, self.n_bits))
+        active = np.ones(n_syndromes, dtype=bool)
+
+        for _ in range(self.max_iterations):
+            rows = np.flatnonzero(active)
+            if rows.size == 0:
+                break
+
+            totals = prior + self._variable_totals(to_variables[rows])
+            to_checks = totals[:, self._variables] - to_variables[rows]
+            to_variables[rows] = self._check_messages(to_checks, syndrome_signs[rows])
+
+            posterior = prior + self._variable_totals(to_variables[rows])
+            decisions[rows] = posterior < 0
+            summed[rows] += posterior
+
+            # Stop updating the syndromes whose hard decision is already consistent
+            consistent = np.all(self.syndromes(decisions[rows]).to_dense() == syndrome_bits[rows], axis=1)
+            active[rows[consistent]] = False
+
+        if self.osd:
+            # BP only depends on the syndrome, so each distinct one is reduced once
+            unique, first, inverse = np.unique(syndrome_bits, axis=0, return_index=True,
+                                               return_inverse=True)
+            refined = self._ordered_statistics(unique, summed[first])[inverse.reshape(-1)]
+            solved = np.all(self.syndromes(refined).to_dense() == syndrome_bits, axis=1)
+            lighter = refined.sum(axis=1) < decisions.sum(axis=1)
+            better = solved & (active | lighter)
+            decisions[better] = refined[better]
+
+        return decisions
+
+
+def random_errors(n_bits, weight, n_samples, rng):
+    """
+    Draw uniformly random error patterns of a fixed weight.
+
+    Args:
+        n_bits (int): Length of the error patterns
+        weight (int): Hamming weight
+        n_samples (int): Number of patterns
+        rng (numpy.random.Generator): Random generator
+
+    Returns:
+        numpy.ndarray: uint8 array of shape (n_samples, n_bits)
+    """
+    positions = np.argsort(rng.random((n_samples, n_bits)), axis=1)[:, :weight]
+    errors = np.zeros((n_samples, n_bits), dtype=np.uint8)
+    np.put_along_axis(errors, positions, 1, axis=1)
+    return errors
+
+
+def _report_keys(decoders):
+    """
+    Unique report keys of decoders, their labels numbered when repeated.
+
+    Args:
+        decoders (list): The decoders
+
+    Returns:
+        list: One key per decoder, in order
+    """
+    labels = [decoder.label for decoder in decoders]
+    keys = []
+    for i, label in enumerate(labels):
+        repeat = labels[:i].count(label)
+        keys.append(f"{label}#{repeat + 1}" if labels.count(label) > 1 else label)
+    return keys
+
+
+def benchmark_decoders(decoders, max_weight, n_samples=1000, threshold=1.0, seed=None):
+    """
+    Measure the speed and the success rate per error weight of several decoders.
+
+    Every decoder decodes the same random errors of each weight 1..max_weight, and a
+    syndrome counts as decoded when the decoder returns exactly the original error,
+    which is what DQI needs to uncompute its error register.
+
+    Args:
+        decoders (list): Decoders of the same parity check matrix
+        max_weight (int): Largest error weight tested
+        n_samples (int, optional): Number of errors per weight. Defaults to 1000.
+        threshold (float, optional): Success rate required for a weight to count towards
+                                     the decoding radius. Defaults to 1.0.
+        seed (int, optional): Seed of the random errors. Defaults to None.
+
+    Returns:
+        dict: Per decoder label, the total decoding 'time' in seconds, the
+              'syndromes_per_second', the 'success_rate' per weight and the 'radius',
+              the largest weight up to which every weight reaches the threshold.
+              Decoders with the same label are numbered, e.g. 'lookup(max_weight=2)#2'.
+    """
+    rng = np.random.default_rng(seed)
+    n_bits = decoders[0].n_bits
+    samples = {w: random_errors(n_bits, w, n_samples, rng) for w in range(1, min(max_weight, n_bits) + 1)}
+    syndromes = {w: decoders[0].syndromes(errors) for w, errors in samples.items()}
+
+    report = {}
+    for decoder, key in zip(decoders, _report_keys(decoders)):
+        elapsed = 0.0
+        success_rate = {}
+        for w, errors in samples.items():
+            start = time.perf_counter()
+            decoded, _ = decoder.decode(syndromes[w])
+            elapsed += time.perf_counter() - start
+            success_rate[w] = float(np.mean(np.all(decoded.to_dense() == errors, axis=1)))
+
+        radius = 0
+        while radius + 1 in success_rate and success_rate[radius + 1] >= threshold:
+            radius += 1
+
+        report[key] = {
+            'time': elapsed,
+            'syndromes_per_second': len(samples) * n_samples / elapsed if elapsed else float('inf'),
+            'success_rate': success_rate,
+            'radius': radius
+        }
+
+    return report
+
+
+def select_decoder(decoders, radius, n_samples=1000, threshold=1.0, seed=None):
+    """
+    Pick the fastest decoder that decodes all errors up to the required radius.
+
+    Args:
+        decoders (list): Candidate decoders of the same parity check matrix
+        radius (int): Required decoding radius
+        n_samples (int, optional): Number of errors per weight. Defaults to 1000.
+        threshold (float, optional): Required success rate per weight. Defaults to 1.0.
+        seed (int, optional): Seed of the random errors. Defaults to None.
+
+    Returns:
+        tuple: (the selected decoder or None if none qualifies, the benchmark report)
+    """
+    report = benchmark_decoders(decoders, radius, n_samples, threshold, seed)
+    stats = [report[key] for key in _report_keys(decoders)]
+    qualified = [i for i, entry in enumerate(stats) if entry['radius'] >= radius]
+    if not qualified:
+        return None, report
+    return decoders[max(qualified, key=lambda i: stats[i]['syndromes_per_second'])], report
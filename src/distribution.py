@@ -0,0 +1,346 @@
+"""
+Distribution Module
+
+This module provides ``Distribution``, the result type of the solvers: measured
+states as integers in one NumPy array and their counts or probabilities in a
+parallel array, instead of a ``{bitstring: count}`` dictionary. Bitstring ``b`` is
+state ``int(b, 2)``, so bit i of a state is qubit i in Qiskit's ordering and
+variable i of a DQI assignment.
+
+Post-processing works on the arrays: top-k selection with ``argpartition``,
+marginals with shifts and masks, and merging of shot batches with one
+``numpy.unique``. Bitstrings are only formatted at the edges, when a result is
+written to a file or read like a dictionary. ``Distribution`` is a read-only
+mapping from bitstrings to values, so code written for count dictionaries keeps
+working.
+
+Example:
+    To post-process a large sample:
+
+    ```python
+    counts = Distribution.from_samples(samples)     # (shots, n) array of 0/1
+    counts = counts + Distribution.from_samples(more_samples)
+
+    best = counts.top_k(10)
+    print(best.to_dict())
+    print(counts.marginal([0, 1]).probabilities())
+    ```
+"""
+
+from collections.abc import Mapping
+
+import numpy as np
+
+from gf2 import pack_bits
+
+MAX_BITS = 64
+
+
+def _aggregate(states, values):
+    """
+    Sum the values of repeated states.
+
+    Args:
+        states (numpy.ndarray): uint64 states
+        values (numpy.ndarray): Values of the states
+
+    Returns:
+        tuple: (sorted distinct states, summed values)
+    """
+    if states.size == 0:
+        return states, values
+    order = np.argsort(states, kind='stable')
+    states, values = states[order], values[order]
+    starts = np.flatnonzero(np.r_[True, states[1:] != states[:-1]])
+    return states[starts], np.add.reduceat(values, starts)
+
+
+class Distribution(Mapping):
+    """
+    Counts or probabilities of integer-encoded states.
+
+    Attributes:
+        states (numpy.ndarray): Distinct states, uint64
+        weights (numpy.ndarray): Counts (int64) or probabilities (float64) of the states
+        n_bits (int): Width of the states
+    """
+
+    def __init__(self, states, values, n_bits, aggregate=True):
+        """
+        Create a distribution.
+
+        Args:
+            states (list): Integer states
+            values (list): Count or probability of every state
+            n_bits (int): Width of the states, at most 64
+            aggregate (bool, optional): Sum the values of repeated states. Pass False when
+                                        the states are known to be distinct. Defaults to True.
+        """
+        if n_bits > MAX_BITS:
+            raise ValueError(f"Distributions hold states of at most {MAX_BITS} bits")
+
+        values = np.asarray(values)
+        dtype = np.int64 if np.issubdtype(values.dtype, np.integer) else np.float64
+        self.states = np.asarray(states, dtype=np.uint64).reshape(-1)
+        self.weights = values.astype(dtype).reshape(-1)
+        self.n_bits = n_bits
+        if self.states.size != self.weights.size:
+            raise ValueError("Every state needs one value")
+        if aggregate:
+            self.states, self.weights = _aggregate(self.states, self.weights)
+        self._sorter = None
+
+    @classmethod
+    def from_dict(cls, mapping, n_bits=None):
+        """
+        Convert a ``{bitstring: value}`` dictionary.
+
+        Args:
+            mapping (dict): Counts or probabilities keyed by bitstrings
+            n_bits (int, optional): Width of the states. Defaults to the bitstring length.
+
+        Returns:
+            Distribution: The distribution
+        """
+        if isinstance(mapping, Distribution):
+            return mapping
+        keys = [key.replace(' ', '') for key in mapping]
+        if n_bits is None:
+            n_bits = len(keys[0]) if keys else 0
+        return cls.from_samples(
+            np.frombuffer(''.join(keys).encode(), dtype=np.uint8).reshape(len(keys), n_bits) - ord('0'),
+            values=list(mapping.values()))
+
+    @classmethod
+    def from_int_dict(cls, mapping, n_bits):
+        """
+        Convert a ``{state: value}`` dictionary with integer keys, such as
+        ``qiskit.result.Counts.int_outcomes()``.
+
+        Args:
+            mapping (dict): Counts or probabilities keyed by integer states
+            n_bits (int): Width of the states
+
+        Returns:
+            Distribution: The distribution
+        """
+        return cls(np.fromiter(mapping.keys(), dtype=np.uint64, count=len(mapping)),
+                   list(mapping.values()), n_bits)
+
+    @classmethod
+    def from_samples(cls, samples, n_bits=None, values=None):
+        """
+        Count measured samples.
+
+        Args:
+            samples (numpy.ndarray): 0/1 array of shape (shots, n_bits) with the most
+                                     significant bit first, or one-dimensional integer states
+            n_bits (int, optional): Width of integer states. Defaults to the sample width.
+            values (list, optional): Weight of every sample instead of 1
+
+        Returns:
+            Distribution: Counts of the distinct samples
+        """
+        samples = np.asarray(samples)
+        if samples.ndim == 2:
+            n_bits = samples.shape[1]
+            if n_bits > MAX_BITS:
+                raise ValueError(f"Distributions hold states of at most {MAX_BITS} bits")
+            states = pack_bits(samples)[:, 0]
+        else:
+            if n_bits is None:
+                raise ValueError("n_bits is required for integer samples")
+            states = samples.astype(np.uint64)
+        if values is None:
+            values = np.ones(states.size, dtype=np.int64)
+        return cls(states, values, n_bits)
+
+    @classmethod
+    def from_probabilities(cls, probs, tolerance=None):
+        """
+        Convert the probabilities of all 2**n basis states.
+
+        Args:
+            probs (numpy.ndarray): Probabilities indexed by state
+            tolerance (float, optional): Drop states at or below this probability.
+                                         Defaults to None (keep all states).
+
+        Returns:
+            Distribution: The distribution
+
+        Raises:
+            ValueError: If the number of probabilities is not a power of two
+        """
+        probs = np.asarray(probs, dtype=np.float64).reshape(-1)
+        if probs.size == 0 or probs.size & (probs.size - 1):
+            raise ValueError(f"Expected 2**n probabilities, got {probs.size}")
+        n_bits = probs.size.bit_length() - 1
+        states = np.arange(probs.size) if tolerance is None else np.flatnonzero(probs > tolerance)
+        return cls(states, probs[states], n_bits, aggregate=False)
+
+    @classmethod
+    def merge(cls, distributions):
+        """
+        Merge distributions of the same width, e.g. the counts of several shot batches.
+
+        Args:
+            distributions (list): Distributions to merge
+
+        Returns:
+            Distribution: The summed distribution
+        """
+        distributions = list(distributions)
+        return cls(np.concatenate([d.states for d in distributions]),
+                   np.concatenate([d.weights for d in distributions]),
+                   distributions[0].n_bits)
+
+    def __add__(self, other):
+        if not isinstance(other, Distribution) or other.n_bits != self.n_bits:
+            return NotImplemented
+        return Distribution.merge([self, other])
+
+    def __repr__(self):
+        return f"Distribution(n_states={len(self)}, n_bits={self.n_bits}, total={self.total()})"
+
+    @property
+    def is_counts(self):
+        return np.issubdtype(self.weights.dtype, np.integer)
+
+    def total(self):
+        """
+        Sum of the values, i.e. the number of shots of counts.
+
+        Returns:
+            int or float: The total
+        """
+        return self.weights.sum().item()
+
+    def probabilities(self):
+        """
+        Normalized values.
+
+        Returns:
+            numpy.ndarray: Probabilities of the states
+        """
+        total = self.weights.sum()
+        return self.weights / total if total else self.weights.astype(np.float64)
+
+    def bits(self, states=None):
+        """
+        Unpack states into a 0/1 array, most significant bit first.
+
+        Args:
+            states (numpy.ndarray, optional): States to unpack. Defaults to all states.
+
+        Returns:
+            numpy.ndarray: uint8 array of shape (n_states, n_bits)
+        """
+        states = self.states if states is None else np.asarray(states, dtype=np.uint64)
+        shifts = np.arange(self.n_bits - 1, -1, -1, dtype=np.uint64)
+        return ((states[:, None] >> shifts) & np.uint64(1)).astype(np.uint8)
+
+    def bitstrings(self, states=None):
+        """
+        Format states as bitstrings.
+
+        Args:
+            states (numpy.ndarray, optional): States to format. Defaults to all states.
+
+        Returns:
+            list: Bitstrings, most significant bit first
+        """
+        characters = self.bits(states) + np.uint8(ord('0'))
+        if self.n_bits == 0:
+            return [''] * characters.shape[0]
+        return np.ascontiguousarray(characters).view(f'S{self.n_bits}').reshape(-1).astype(str).tolist()
+
+    def to_dict(self):
+        """
+        Convert to a ``{bitstring: value}`` dictionary.
+
+        Returns:
+            dict: Values keyed by bitstrings
+        """
+        return dict(zip(self.bitstrings(), self.weights.tolist()))
+
+    def _position(self, key):
+        """
+        Find the position of a state given as a bitstring or an integer.
+
+        Args:
+            key: Bitstring or integer state
+
+        Returns:
+            int or None: Index into the arrays, or None if the state is absent
+        """
+        state = int(key.replace(' ', ''), 2) if isinstance(key, str) else int(key)
+        if self._sorter is None:
+            self._sorter = np.argsort(self.states, kind='stable')
+        i = int(np.searchsorted(self.states, np.uint64(state), sorter=self._sorter))
+        if i < self.states.size and int(self.states[self._sorter[i]]) == state:
+            return int(self._sorter[i])
+        return None
+
+    def __getitem__(self, key):
+        position = self._position(key)
+        if position is None:
+            raise KeyError(key)
+        return self.weights[position].item()
+
+    def __contains__(self, key):
+        return self._position(key) is not None
+
+    def __iter__(self):
+        return iter(self.bitstrings())
+
+    def __len__(self):
+        return self.states.size
+
+    def items(self):
+        return zip(self.bitstrings(), self.weights.tolist())
+
+    def values(self):
+        return self.weights.tolist()
+
+    def top_k(self, k):
+        """
+        The k states with the largest values, largest first.
+
+        Args:
+            k (int): Number of states
+
+        Returns:
+            Distribution: The selected states, in decreasing order of value
+        """
+        k = min(k, len(self))
+        if k == 0:
+            return Distribution(self.states[:0], self.weights[:0], self.n_bits, aggregate=False)
+        selected = np.argpartition(-self.weights, k - 1)[:k]
+        selected = selected[np.lexsort((self.states[selected], -self.weights[selected]))]
+        return Distribution(self.states[selected], self.weights[selected], self.n_bits, aggregate=False)
+
+    def most_likely(self):
+        """
+        The state with the largest value.
+
+        Returns:
+            tuple: (bitstring, value)
+        """
+        best = self.top_k(1)
+        return best.bitstrings()[0], best.weights[0].item()
+
+    def marginal(self, bits):
+        """
+        Marginalize onto some bits, like Qiskit's ``marginal_counts``.
+
+        Args:
+            bits (list): Bit positions to keep, bit 0 being the least significant; bits[j]
+                         becomes bit j of the marginal states
+
+        Returns:
+            Distribution: The marginal distribution over len(bits) bits
+        """
+        states = np.zeros(self.states.size, dtype=np.uint64)
+        for j, bit in enumerate(bits):
+            states |= ((self.states >> np.uint64(bit)) & np.uint64(1)) << np.uint64(j)
+        return Distribution(states, self.weights, len(bits))
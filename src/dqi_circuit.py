@@ -0,0 +1,305 @@
+"""
+DQI Circuit Compiler Module
+
+This module compiles the DQI Max-XORSAT quantum circuit from an arbitrary binary
+parity check matrix H of shape (n_checks, n_bits). Register sizes, the CNOT fan-out
+for H·y and the syndrome decoding logic are all derived from the matrix, so any
+instance can be passed to ``DQIMaxXORSAT`` without editing the circuit code.
+
+The compiled circuit follows the DQI recipe:
+1. Prepare a superposition over error weights k <= t in unary form on the y register
+2. Spread each unary state into a Dicke state over all n_bits qubits of y
+3. Apply the phase (-1)^(v·y)
+4. Compute the syndrome H·y into the solution register
+5. Uncompute y from the syndrome with a coherent lookup-table decoder
+6. Apply the Hadamard transform to the solution register
+
+The CNOTs for H·y are scheduled into layers acting on disjoint qubits using a
+bipartite edge coloring of the Tanner graph of H, so the depth of the
+matrix-vector product equals the largest row or column weight of H.
+
+Example:
+    To compile a circuit for a custom matrix:
+
+    ```python
+    table = SyndromeTable(parity_check_matrix, max_weight=2)
+    compiler = DQICircuitCompiler(parity_check_matrix, table)
+    circuit = compiler.build_circuit()
+    ```
+"""
+
+import numpy as np
+from qiskit import QuantumCircuit, QuantumRegister, ClassicalRegister
+from qiskit.circuit.library import RYGate
+
+from dqi_classical import normalize_error_weights
+
+# Version of the circuits built by DQICircuitCompiler. It is part of the circuit cache
+# key, so bump it whenever a change alters the generated circuits.
+COMPILER_VERSION = 1
+
+
+def schedule_cnot_layers(matrix):
+    """
+    Schedule the CNOTs of a matrix-vector product into depth-optimal layers.
+
+    Every nonzero entry H[row, col] becomes a CNOT from input qubit ``col`` to output
+    qubit ``row``. Two CNOTs can run in parallel if they touch different qubits, so a
+    schedule is an edge coloring of the bipartite graph between columns and rows.
+    Colors are assigned with alternating-path recoloring, which always succeeds with
+    as many colors as the maximum vertex degree (König's theorem).
+
+    Args:
+        matrix (numpy.ndarray): Binary matrix of shape (n_rows, n_cols)
+
+    Returns:
+        list: Layers of CNOTs, each a list of (col, row) pairs on disjoint qubits
+    """
+    matrix = np.asarray(matrix) % 2
+    rows, cols = np.nonzero(matrix)
+
+    # at_col[c][color] = row and at_row[r][color] = col for every colored edge
+    at_col = [dict() for _ in range(matrix.shape[1])]
+    at_row = [dict() for _ in range(matrix.shape[0])]
+
+    def free_color(colors):
+        color = 0
+        while color in colors:
+            color += 1
+        return color
+
+    for row, col in zip(rows.tolist(), cols.tolist()):
+        a = free_color(at_col[col])
+        b = free_color(at_row[row])
+
+        if a in at_row[row]:
+            # Collect the a/b alternating path starting at the row and swap its colors
+            path = []
+            node, on_row, color = row, True, a
+            while True:
+                edges = at_row[node] if on_row else at_col[node]
+                if color not in edges:
+                    break
+                other = edges[color]
+                path.append((other, node, color) if on_row else (node, other, color))
+                node, on_row, color = other, not on_row, (b if color == a else a)
+
+            for c, r, color in path:
+                del at_col[c][color]
+                del at_row[r][color]
+            for c, r, color in path:
+                swapped = b if color == a else a
+                at_col[c][swapped] = r
+                at_row[r][swapped] = c
+
+        at_col[col][a] = row
+        at_row[row][a] = col
+
+    n_layers = max((max(colors) + 1 for colors in at_col if colors), default=0)
+    layers = [[] for _ in range(n_layers)]
+    for col, colors in enumerate(at_col):
+        for color, row in colors.items():
+            layers[color].append((col, row))
+
+    return [sorted(layer) for layer in layers]
+
+
+class DQICircuitCompiler:
+    """
+    Compiler for DQI Max-XORSAT circuits driven by the parity check matrix.
+
+    The y register has one qubit per column of the parity check matrix (one per
+    constraint) and the solution register one qubit per row (one per variable).
+
+    Attributes:
+        parity_check_matrix (numpy.ndarray): The parity check matrix H
+        syndrome_table (Mapping): Mapping from syndrome integers to error pattern integers
+        n_checks (int): Number of rows of H, i.e. size of the solution register
+        n_bits (int): Number of columns of H, i.e. size of the y register
+        max_error_weight (int): Largest error weight in the weight superposition
+        phase_vector (numpy.ndarray): The vector v of the phase (-1)^(v·y)
+        error_weights (numpy.ndarray): Normalized amplitudes of the error weights 0..t
+    """
+
+    def __init__(self, parity_check_matrix, syndrome_table, max_error_weight=2,
+                 phase_vector=None, error_weights=None):
+        """
+        Initialize the compiler.
+
+        Args:
+            parity_check_matrix (numpy.ndarray): Binary matrix of shape (n_checks, n_bits)
+            syndrome_table (Mapping): Mapping from syndrome integers to error pattern integers
+            max_error_weight (int, optional): Largest error weight t. Defaults to 2.
+            phase_vector (list, optional): Vector v of length n_bits. Defaults to all ones.
+            error_weights (list, optional): Amplitudes of the error weights 0..t. Defaults to
+                                            a uniform superposition over weights 1..t.
+        """
+        self.parity_check_matrix = np.asarray(parity_check_matrix) % 2
+        self.syndrome_table = syndrome_table
+        self.n_checks, self.n_bits = self.parity_check_matrix.shape
+        self.max_error_weight = min(max_error_weight, self.n_bits)
+
+        if phase_vector is None:
+            phase_vector = np.ones(self.n_bits)
+        self.phase_vector = np.asarray(phase_vector)
+        if self.phase_vector.shape != (self.n_bits,):
+            raise ValueError(f"phase_vector must have length {self.n_bits}")
+
+        self.error_weights = normalize_error_weights(error_weights, self.max_error_weight)
+
+    def _prepare_error_weights(self, qc, qubits):
+        """
+        Prepare sum_k w_k |0...0 1^k> in unary form on the last t qubits.
+
+        Args:
+            qc (QuantumCircuit): The quantum circuit to modify
+            qubits (list): The y register qubits
+        """
+        n = len(qubits)
+        tail = np.cumsum(self.error_weights[::-1] ** 2)[::-1]  # tail[k] = P(weight >= k)
+
+        for k in range(self.max_error_weight):
+            if tail[k + 1] <= 0:
+                break
+            # Probability of weight > k given weight >= k
+            angle = 2 * np.arcsin(np.sqrt(min(1.0, tail[k + 1] / tail[k])))
+            target = qubits[n - 1 - k]
+            if k == 0:
+                qc.ry(angle, target)
+            else:
+                qc.cry(angle, qubits[n - k], target)
+
+    def _split_and_cyclic_shift(self, qc, qubits, l, k):
+        """
+        Apply the split-and-cyclic-shift block SCS_{l,k} of Bärtschi and Eidenbenz.
+
+        Args:
+            qc (QuantumCircuit): The quantum circuit to modify
+            qubits (list): The Dicke state qubits
+            l (int): The block acts on the (1-indexed) qubits l-k..l
+            k (int): Number of qubits the block shifts
+        """
+        last = qubits[l - 1]
+
+        qc.cx(qubits[l - 2], last)
+        qc.cry(2 * np.arccos(np.sqrt(1 / l)), last, qubits[l - 2])
+        qc.cx(qubits[l - 2], last)
+
+        for i in range(2, k + 1):
+            target = qubits[l - i - 1]
+            qc.cx(target, last)
+            qc.append(RYGate(2 * np.arccos(np.sqrt(i / l))).control(2),
+                      [last, qubits[l - i], target])
+            qc.cx(target, last)
+
+    def _prepare_dicke_state(self, qc, qubits):
+        """
+        Map every unary state |0...0 1^k> with k <= t to the Dicke state |D^n_k>.
+
+        Args:
+            qc (QuantumCircuit): The quantum circuit to modify
+            qubits (list): The qubits to prepare in a superposition of Dicke states
+        """
+        for l in range(len(qubits), 1, -1):
+            k = min(self.max_error_weight, l - 1)
+            if k > 0:
+                self._split_and_cyclic_shift(qc, qubits, l, k)
+
+    def _apply_vector_product_phase(self, qc, qubits):
+        """
+        Apply the phase (-1)^(v·y).
+
+        Args:
+            qc (QuantumCircuit): The quantum circuit to modify
+            qubits (list): The y register qubits
+        """
+        for i, phase in enumerate(self.phase_vector):
+            if phase > 0:
+                qc.z(qubits[i])
+
+    def _apply_matrix_vector_product(self, qc, input_qubits, output_qubits):
+        """
+        Compute H·y into the output qubits in layers of parallel CNOTs.
+
+        Args:
+            qc (QuantumCircuit): The quantum circuit to modify
+            input_qubits (list): The y register qubits
+            output_qubits (list): The qubits for storing the result
+        """
+        for layer in schedule_cnot_layers(self.parity_check_matrix):
+            for col, row in layer:
+                qc.cx(input_qubits[col], output_qubits[row])
+
+    def _syndrome_decode(self, qc, syndrome_qubits, error_qubits):
+        """
+        Uncompute y from its syndrome with a coherent lookup-table decoder.
+
+        For every tabulated syndrome, X gates controlled on the full syndrome value are
+        applied to the error positions, which maps y to y ⊕ decode(H·y) without measuring.
+
+        Args:
+            qc (QuantumCircuit): The quantum circuit to modify
+            syndrome_qubits (list): The qubits containing the syndrome
+            error_qubits (list): The qubits holding the error pattern to uncompute
+        """
+        n_checks = len(syndrome_qubits)
+
+        for syndrome_int, error_pattern in self.syndrome_table.items():
+            if error_pattern == 0:
+                continue
+
+            # ctrl_state bit i refers to syndrome_qubits[i], i.e. row i (MSB of syndrome_int)
+            ctrl_state = sum(((syndrome_int >> (n_checks - 1 - row)) & 1) << row
+                             for row in range(n_checks))
+            for i in range(self.n_bits):
+                if (error_pattern >> (self.n_bits - 1 - i)) & 1:
+                    qc.mcx(list(syndrome_qubits), error_qubits[i], ctrl_state=ctrl_state)
+
+    def _hadamard_transform(self, qc, qubits):
+        """
+        Apply the Hadamard transform to the specified qubits.
+
+        Args:
+            qc (QuantumCircuit): The quantum circuit to modify
+            qubits (list): The qubits to apply the Hadamard transform to
+        """
+        for qubit in qubits:
+            qc.h(qubit)
+
+    def build_circuit(self, measure=True, measure_y=True):
+        """
+        Build the full DQI Max-XORSAT circuit.
+
+        Args:
+            measure (bool, optional): Whether to measure the solution register.
+                                      Defaults to True.
+            measure_y (bool, optional): Whether to also measure the y register. Leaving it
+                                        out marginalizes the counts onto the solution
+                                        register on the simulator side. Defaults to True.
+
+        Returns:
+            QuantumCircuit: The constructed quantum circuit
+        """
+        y_register = QuantumRegister(self.n_bits, "y")
+        solution_register = QuantumRegister(self.n_checks, "solution")
+        qc = QuantumCircuit(y_register, solution_register)
+
+        self._prepare_error_weights(qc, y_register)
+        self._prepare_dicke_state(qc, y_register)
+        self._apply_vector_product_phase(qc, y_register)
+        self._apply_matrix_vector_product(qc, y_register, solution_register)
+        self._syndrome_decode(qc, solution_register, y_register)
+        self._hadamard_transform(qc, solution_register)
+
+        if measure and measure_y:
+            # y measures all zeros whenever decoding succeeded
+            y_classical = ClassicalRegister(self.n_bits, "y_meas")
+            qc.add_register(y_classical)
+            qc.measure(y_register, y_classical)
+
+        if measure:
+            solution_classical = ClassicalRegister(self.n_checks, "solution_meas")
+            qc.add_register(solution_classical)
+            qc.measure(solution_register, solution_classical)
+
+        return qc
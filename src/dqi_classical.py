@@ -0,0 +1,356 @@
+"""
+Classical DQI Evaluator Module
+
+This module computes the output distribution of the DQI Max-XORSAT circuit
+classically, without simulating the circuit. For a parity check matrix H with
+n_bits columns (constraints) and n_checks rows (variables), the DQI state before
+measurement is
+
+    |P(f)> = 2^(-n_checks/2) * sum_x sum_y c_|y| (-1)^(v·y) (-1)^(x·H·y) |x, y ⊕ D(H·y)>
+
+where y runs over all error patterns of weight <= t, c_k = w_k / sqrt(C(n_bits, k)) and
+D is the syndrome decoder. Whenever the decoder recovers every such y, the y register
+returns to zero and the amplitude of an assignment x only depends on the number u of
+constraints it violates:
+
+    P(x) = 2^(-n_checks) * (sum_k c_k K_k(u))^2
+
+with K_k the Krawtchouk polynomials, i.e. the elementary symmetric polynomials of the
++/-1 constraint values. Otherwise the amplitudes are summed explicitly over the
+enumerated error patterns, grouped by the residual left in the y register.
+
+Example:
+    To score assignments and instances without a simulator:
+
+    ```python
+    evaluator = DQIEvaluator(parity_check_matrix, max_error_weight=2)
+
+    # DQI probability of every assignment, indexed like the run() bitstrings
+    probs = evaluator.probabilities(np.arange(2 ** evaluator.n_checks))
+
+    # Expected number of satisfied constraints
+    score = evaluator.expected_satisfied()
+    ```
+"""
+
+from math import comb
+
+import numpy as np
+
+from decoders import SyndromeDecoder
+from gf2 import BitMatrix, pack_bits, popcount, words_to_int
+from syndrome_table import SyndromeTable, enumerate_error_patterns
+
+
+def normalize_error_weights(error_weights, max_error_weight):
+    """
+    Validate and normalize the amplitudes of the error weights 0..t.
+
+    Args:
+        error_weights (list): Amplitudes of the error weights, or None for a uniform
+                              superposition over weights 1..t
+        max_error_weight (int): Largest error weight t
+
+    Returns:
+        numpy.ndarray: Non-negative amplitudes of length t + 1 with unit norm
+    """
+    if error_weights is None:
+        error_weights = [0.0] + [1.0] * max_error_weight
+    error_weights = np.abs(np.asarray(error_weights, dtype=float))
+    if error_weights.shape != (max_error_weight + 1,) or not error_weights.any():
+        raise ValueError(f"error_weights must have {max_error_weight + 1} entries, not all zero")
+    return error_weights / np.linalg.norm(error_weights)
+
+
+def krawtchouk_table(n, max_degree):
+    """
+    Tabulate the Krawtchouk polynomials K_k(u) for an n-bit space.
+
+    K_k(u) is the elementary symmetric polynomial of degree k in n values of which
+    u are -1 and the rest +1.
+
+    Args:
+        n (int): Number of +/-1 values
+        max_degree (int): Largest degree k
+
+    Returns:
+        numpy.ndarray: Array of shape (max_degree + 1, n + 1) with entry [k, u] = K_k(u)
+    """
+    table = np.zeros((max_degree + 1, n + 1))
+    for k in range(max_degree + 1):
+        for u in range(n + 1):
+            table[k, u] = sum((-1) ** j * comb(u, j) * comb(n - u, k - j) for j in range(k + 1))
+    return table
+
+
+def semicircle_matrix(n_constraints, max_error_weight):
+    """
+    Build the tridiagonal matrix A with <f> = w^T A w for Max-XORSAT.
+
+    Here f is the number of satisfied minus unsatisfied constraints and w the
+    normalized error weight amplitudes. The identity holds when the code has no
+    nonzero kernel vector of weight <= 2t + 1.
+
+    Args:
+        n_constraints (int): Number of constraints m
+        max_error_weight (int): Largest error weight t
+
+    Returns:
+        numpy.ndarray: Symmetric matrix of shape (t + 1, t + 1)
+    """
+    k = np.arange(1, max_error_weight + 1)
+    off_diagonal = np.sqrt(k * (n_constraints - k + 1))
+    return np.diag(off_diagonal, 1) + np.diag(off_diagonal, -1)
+
+
+def optimal_error_weights(n_constraints, max_error_weight):
+    """
+    Error weight amplitudes maximizing the semicircle estimate of satisfied constraints.
+
+    Args:
+        n_constraints (int): Number of constraints m
+        max_error_weight (int): Largest error weight t
+
+    Returns:
+        numpy.ndarray: Principal eigenvector of ``semicircle_matrix`` with non-negative entries
+    """
+    _, vectors = np.linalg.eigh(semicircle_matrix(n_constraints, max_error_weight))
+    principal = vectors[:, -1]
+    return np.abs(principal) / np.linalg.norm(principal)
+
+
+class DQIEvaluator:
+    """
+    Classical evaluator of the DQI Max-XORSAT output distribution.
+
+    Assignments are given either as integers indexed like the solution bitstrings
+    returned by ``DQIMaxXORSAT.run`` (bit r is variable r, i.e. row r of the matrix)
+    or as 0/1 arrays of shape (n_assignments, n_checks).
+
+    Attributes:
+        parity_check_matrix (numpy.ndarray): The parity check matrix H
+        n_checks (int): Number of variables (rows of H)
+        n_bits (int): Number of constraints (columns of H)
+        max_error_weight (int): Largest error weight t
+        phase_vector (numpy.ndarray): Right-hand side v of the constraints
+        error_weights (numpy.ndarray): Normalized amplitudes of the error weights 0..t
+        syndrome_table (SyndromeTable or SyndromeDecoder): The decoder
+        perfect_decoding (bool): Whether every error pattern of weight <= t is decoded
+    """
+
+    def __init__(self, parity_check_matrix, max_error_weight=2, phase_vector=None,
+                 error_weights=None, syndrome_table=None):
+        """
+        Initialize the evaluator.
+
+        Args:
+            parity_check_matrix (numpy.ndarray): Binary matrix of shape (n_checks, n_bits)
+            max_error_weight (int, optional): Largest error weight t. Defaults to 2.
+            phase_vector (list, optional): Right-hand side v. Defaults to all ones.
+            error_weights (list, optional): Amplitudes of the error weights 0..t. Defaults to
+                                            a uniform superposition over weights 1..t.
+            syndrome_table (SyndromeTable or SyndromeDecoder, optional): Decoder to evaluate.
+                                            Defaults to the lookup table for weight <= t.
+        """
+        self.parity_check_matrix = np.asarray(parity_check_matrix) % 2
+        self.n_checks, self.n_bits = self.parity_check_matrix.shape
+        self.max_error_weight = min(max_error_weight, self.n_bits)
+
+        if phase_vector is None:
+            phase_vector = np.ones(self.n_bits)
+        self.phase_vector = (np.asarray(phase_vector) > 0).astype(np.int64)
+        self.error_weights = normalize_error_weights(error_weights, self.max_error_weight)
+
+        if syndrome_table is None:
+            syndrome_table = SyndromeTable(self.parity_check_matrix, self.max_error_weight)
+        self.syndrome_table = syndrome_table
+
+        # Constraint j is row j of the transpose, so H^T x is one batched product
+        self._constraints = BitMatrix.from_dense(self.parity_check_matrix.T)
+        self._target_words = pack_bits(self.phase_vector)
+
+        self._prepare_patterns()
+
+    @classmethod
+    def from_solver(cls, solver):
+        """
+        Create an evaluator with the same instance and settings as a ``DQIMaxXORSAT`` solver.
+
+        Args:
+            solver (DQIMaxXORSAT): The solver to mirror
+
+        Returns:
+            DQIEvaluator: The evaluator
+        """
+        return cls(solver.parity_check_matrix, solver.max_error_weight,
+                   phase_vector=solver.phase_vector, error_weights=solver.error_weights,
+                   syndrome_table=solver.syndrome_table)
+
+    def _prepare_patterns(self):
+        """
+        Enumerate the error patterns and group them by the residual the decoder leaves.
+        """
+        patterns = enumerate_error_patterns(self.n_bits, self.max_error_weight)
+        weights = np.count_nonzero(patterns >= 0, axis=1)
+
+        # Pattern bits with a sentinel column for the -1 padding
+        y_bits = np.zeros((patterns.shape[0], self.n_bits + 1), dtype=np.int64)
+        np.put_along_axis(y_bits, np.where(patterns >= 0, patterns, self.n_bits), 1, axis=1)
+        y_bits = y_bits[:, :self.n_bits]
+
+        syndromes = BitMatrix.from_dense(self.parity_check_matrix).batch_matvec(y_bits)
+        scale = self.error_weights[weights] / np.sqrt([comb(self.n_bits, k) for k in weights])
+        signs = 1 - 2 * ((y_bits @ self.phase_vector) % 2)
+
+        # Residual y ⊕ D(H·y), packed so patterns can be grouped by it
+        decoded = self._decode(syndromes)
+        residuals = pack_bits(y_bits) ^ decoded
+        _, groups = np.unique(residuals, axis=0, return_inverse=True)
+        groups = groups.reshape(-1)
+
+        order = np.argsort(groups, kind='stable')
+        self._syndromes = BitMatrix(syndromes.words[order], self.n_checks)
+        self._pattern_amplitudes = (scale * signs)[order]
+        self._group_starts = np.flatnonzero(np.r_[True, np.diff(groups[order]) != 0])
+        self.perfect_decoding = not residuals.any()
+
+    def _decode(self, syndromes):
+        """
+        Decode packed syndromes into packed error patterns.
+
+        Args:
+            syndromes (BitMatrix): Syndromes of shape (n_syndromes, n_checks)
+
+        Returns:
+            numpy.ndarray: Packed error patterns, zero where the syndrome is not in the table
+        """
+        if isinstance(self.syndrome_table, SyndromeDecoder):
+            errors, _ = self.syndrome_table.decode(syndromes)
+            return errors.words
+
+        n_words = max(1, -(-self.n_bits // 64))
+
+        if self.n_checks <= 64:
+            # A single packed word is the syndrome integer, row 0 most significant
+            if hasattr(self.syndrome_table, 'decode'):
+                errors, _ = self.syndrome_table.decode(syndromes.words[:, 0])
+                return errors
+            syndrome_ints = [int(s) for s in syndromes.words[:, 0]]
+        else:
+            syndrome_ints = [words_to_int(row) for row in syndromes.words]
+
+        errors = np.zeros((len(syndrome_ints), n_words), dtype=np.uint64)
+        mask = (1 << 64) - 1
+        for i, syndrome in enumerate(syndrome_ints):
+            error = self.syndrome_table.get(syndrome, 0)
+            for w in range(n_words):
+                errors[i, w] = (error >> (64 * (n_words - 1 - w))) & mask
+        return errors
+
+    def _assignment_bits(self, assignments):
+        """
+        Convert assignments to a 0/1 array with one column per variable.
+
+        Args:
+            assignments (numpy.ndarray): Integer indices or a 0/1 array of shape (N, n_checks)
+
+        Returns:
+            numpy.ndarray: Integer array of shape (N, n_checks)
+        """
+        assignments = np.asarray(assignments)
+        if assignments.ndim == 2:
+            return assignments.astype(np.int64) & 1
+        return (assignments.astype(np.int64)[:, None] >> np.arange(self.n_checks)) & 1
+
+    def satisfied_counts(self, assignments):
+        """
+        Count the satisfied constraints H[:, j]·x = v_j for each assignment.
+
+        Args:
+            assignments (numpy.ndarray): Integer indices or a 0/1 array of shape (N, n_checks)
+
+        Returns:
+            numpy.ndarray: Number of satisfied constraints per assignment
+        """
+        products = self._constraints.batch_matvec(self._assignment_bits(assignments))
+        violated = popcount(products.words ^ self._target_words).sum(axis=1, dtype=np.int64)
+        return self.n_bits - violated
+
+    def probabilities(self, assignments, chunk_size=4096):
+        """
+        Compute the DQI output probability of each assignment.
+
+        Args:
+            assignments (numpy.ndarray): Integer indices or a 0/1 array of shape (N, n_checks)
+            chunk_size (int, optional): Assignments evaluated per vectorized step in the
+                                        general (imperfect decoding) case. Defaults to 4096.
+
+        Returns:
+            numpy.ndarray: Probability of each assignment
+        """
+        norm = 2.0 ** -self.n_checks
+
+        if self.perfect_decoding:
+            unsatisfied = self.n_bits - self.satisfied_counts(assignments)
+            return norm * self._perfect_amplitudes()[unsatisfied] ** 2
+
+        x_bits = self._assignment_bits(assignments)
+        probs = np.empty(x_bits.shape[0])
+        for start in range(0, x_bits.shape[0], chunk_size):
+            chunk = x_bits[start:start + chunk_size]
+            phases = 1 - 2 * self._syndromes.batch_matvec(chunk).to_dense().astype(np.int64)
+            amplitudes = np.add.reduceat(phases * self._pattern_amplitudes, self._group_starts, axis=1)
+            probs[start:start + chunk_size] = norm * np.sum(amplitudes ** 2, axis=1)
+        return probs
+
+    def _perfect_amplitudes(self):
+        """
+        Amplitude (up to 2^(-n_checks/2)) as a function of the number of unsatisfied constraints.
+
+        Returns:
+            numpy.ndarray: Array of length n_bits + 1 indexed by the unsatisfied count u
+        """
+        k = np.arange(self.max_error_weight + 1)
+        scale = self.error_weights / np.sqrt([comb(self.n_bits, int(i)) for i in k])
+        return scale @ krawtchouk_table(self.n_bits, self.max_error_weight)
+
+    def distribution(self):
+        """
+        Compute the DQI output probability of every assignment.
+
+        Returns:
+            numpy.ndarray: Probabilities of length 2**n_checks indexed like the run() bitstrings
+        """
+        return self.probabilities(np.arange(2 ** self.n_checks))
+
+    def expected_satisfied(self, chunk_size=1 << 16):
+        """
+        Compute the expected number of satisfied constraints under the DQI distribution.
+
+        All 2**n_checks assignments are enumerated in chunks.
+
+        Args:
+            chunk_size (int, optional): Assignments evaluated per vectorized step.
+                                        Defaults to 65536.
+
+        Returns:
+            float: Expected number of satisfied constraints
+        """
+        total = 0.0
+        for start in range(0, 2 ** self.n_checks, chunk_size):
+            chunk = np.arange(start, min(start + chunk_size, 2 ** self.n_checks))
+            total += float(self.probabilities(chunk) @ self.satisfied_counts(chunk))
+        return total
+
+    def semicircle_expected_satisfied(self):
+        """
+        Closed-form expected number of satisfied constraints, m/2 + w^T A w / 2.
+
+        This needs no enumeration and is exact when H has no nonzero kernel vector of
+        weight <= 2t + 1, which in particular requires ``perfect_decoding``.
+
+        Returns:
+            float: Expected number of satisfied constraints
+        """
+        A = semicircle_matrix(self.n_bits, self.max_error_weight)
+        return self.n_bits / 2 + float(self.error_weights @ A @ self.error_weights) / 2
@@ -5,7 +5,8 @@ This module implements the Digital Quantum Intermediate (DQI) approach for solvi
 the Maximum XOR Satisfiability (Max-XORSAT) problem. It uses Qiskit to build quantum 
 circuits for DQI and provides functionality to run the algorithm and process results.
 
-The implementation is based on a specific parity check matrix and includes:
+The circuit is compiled from the given parity check matrix (the example matrix by
+default) and the implementation includes:
 1. Core DQI algorithm implementation
 2. Circuit construction for various quantum operations
 3. Result visualization and export functionality
@@ -26,16 +27,22 @@ Example:
 """
 
 import numpy as np
-from qiskit import QuantumCircuit, QuantumRegister, ClassicalRegister
-from qiskit.circuit.library import QFT
+from qiskit import transpile
 from qiskit_aer import Aer
-from qiskit.visualization import plot_histogram
-import matplotlib.pyplot as plt
-import json
 import os
-import csv
+import time
+from concurrent.futures import Future
 from datetime import datetime
 
+from circuit_cache import circuit_key, default_circuit_cache
+from classical_max_xorsat import ClassicalMaxXORSAT
+from dqi_circuit import DQICircuitCompiler
+from distribution import Distribution
+from plotting import render_distribution
+from result_exporter import export_inline, render_histogram, write_counts_csv, write_json
+from result_store import instance_hash
+from syndrome_table import SyndromeTable
+
 class DQIMaxXORSAT:
     """
     Digital Quantum Intermediate (DQI) solver for the Max-XORSAT problem.
@@ -46,17 +53,30 @@ class DQIMaxXORSAT:
     
     Attributes:
         parity_check_matrix (numpy.ndarray): The parity check matrix defining the XORSAT problem
-        n_bits (int): Number of bits/qubits in the problem
-        syndrome_table (dict): Lookup table for syndrome decoding
+        n_bits (int): Number of bits/qubits in the problem (columns of the matrix)
+        n_checks (int): Number of solution qubits (rows of the matrix)
+        max_error_weight (int): Largest Hamming weight of the errors the decoder corrects
+        phase_vector (numpy.ndarray): The vector v of the phase (-1)^(v·y), one entry per column
+        error_weights (list): Amplitudes of the error weights 0..max_error_weight, or None
+        syndrome_table (SyndromeTable): Lookup table for syndrome decoding
+        circuit_cache (CircuitCache): Cache of built and transpiled circuits
     """
     
-    def __init__(self, parity_check_matrix=None):
+    def __init__(self, parity_check_matrix=None, max_error_weight=2, phase_vector=None,
+                 error_weights=None, circuit_cache=None):
         """
         Initialize the DQI Max-XORSAT solver.
         
         Args:
             parity_check_matrix (numpy.ndarray, optional): The parity check matrix for the XORSAT problem.
                                 Default is the one from the example.
+            max_error_weight (int, optional): Largest Hamming weight of the error patterns
+                                in the syndrome table. Defaults to 2.
+            phase_vector (list, optional): Vector v of the phase (-1)^(v·y). Defaults to all ones.
+            error_weights (list, optional): Amplitudes of the error weights 0..max_error_weight.
+                                Defaults to a uniform superposition over weights 1..max_error_weight.
+            circuit_cache (CircuitCache, optional): Cache for compiled circuits. Defaults to the
+                                cache shared by all solvers in the process.
         """
         # Default parity check matrix from the .qmod file
         if parity_check_matrix is None:
@@ -69,9 +89,16 @@ class DQIMaxXORSAT:
                 [0, 0, 0, 0, 1, 1]
             ])
         else:
-            self.parity_check_matrix = parity_check_matrix
+            self.parity_check_matrix = np.asarray(parity_check_matrix)
+        
+        self.n_checks, self.n_bits = self.parity_check_matrix.shape
+        self.max_error_weight = max_error_weight
         
-        self.n_bits = self.parity_check_matrix.shape[1]
+        if phase_vector is None:
+            phase_vector = [1.0] * self.n_bits  # Default from qmod file
+        self.phase_vector = np.asarray(phase_vector)
+        self.error_weights = error_weights
+        self.circuit_cache = circuit_cache if circuit_cache is not None else default_circuit_cache
         
         # Create lookup table for syndrome decoding
         self.syndrome_table = self._create_syndrome_table()
@@ -80,342 +107,250 @@ class DQIMaxXORSAT:
         """
         Create the syndrome lookup table for decoding.
         
-        This method generates a mapping from syndrome patterns to error patterns
-        with Hamming weight <= 2, which is used for syndrome decoding.
+        This method maps syndrome patterns to error patterns with Hamming weight
+        <= max_error_weight, which is used for syndrome decoding. Only the low-weight
+        patterns are enumerated and their syndromes are computed on bit-packed columns
+        of the parity check matrix (see ``syndrome_table.SyndromeTable``).
         
         Returns:
-            dict: A dictionary mapping syndrome integers to error pattern integers
+            SyndromeTable: A mapping from syndrome integers to error pattern integers
         """
-        syndrome_table = {}
-        
-        # For each possible error pattern with Hamming weight <= 2
-        for i in range(2**self.n_bits):
-            # Only consider patterns with at most 2 bits set
-            error = np.array([int(bit) for bit in bin(i)[2:].zfill(self.n_bits)])
-            if np.sum(error) <= 2:
-                # Calculate the syndrome for this error
-                syndrome = np.mod(np.dot(self.parity_check_matrix, error), 2)
-                syndrome_int = int("".join(map(str, syndrome)), 2)
-                syndrome_table[syndrome_int] = i
-        
-        return syndrome_table
+        return SyndromeTable(self.parity_check_matrix, max_weight=self.max_error_weight)
     
-    def _binary_to_unary(self, qc, binary_qubits, unary_qubits):
+    def build_circuit(self, measure=True, measure_y=True):
         """
-        Convert from binary to unary encoding using modern Qiskit approach.
+        Build the full DQI Max-XORSAT circuit.
         
-        Args:
-            qc (QuantumCircuit): The quantum circuit to modify
-            binary_qubits (list): The qubits with binary encoding
-            unary_qubits (list): The qubits for unary encoding output
-        """
-        # Create a temporary register for one-hot encoding
-        one_hot = QuantumRegister(4, "one_hot")
-        one_hot_c = ClassicalRegister(4, "one_hot_c")  # Classical register for conditioning
-        qc.add_register(one_hot)
-        qc.add_register(one_hot_c)
-        
-        # Map binary to one-hot positions
-        qc.cx(binary_qubits[1], one_hot[0])
-        qc.x(one_hot[0])
-        qc.cx(binary_qubits[0], one_hot[1])
-        
-        # Apply the transformation with properly controlled operations
-        qc.cx(one_hot[1], one_hot[0])
-        
-        # Instead of if_test, measure and use classical control
-        qc.measure(one_hot[3], one_hot_c[3])
-        with qc.if_test((one_hot_c[3], 1)):
-            qc.swap(one_hot[0], one_hot[2])
-        
-        # Reset the classical bit for potential reuse
-        qc.reset(one_hot[3])
-        
-        qc.cx(one_hot[2], one_hot[3])
-        qc.cx(one_hot[3], one_hot[1])
-        
-        # Convert one-hot to unary
-        for i in range(3):
-            qc.cx(one_hot[3-i], one_hot[2-i])
-        qc.x(one_hot[0])
-        
-        # Map one-hot to unary outputs
-        for i in range(3):
-            qc.cx(one_hot[i+1], unary_qubits[i])
-    
-    def _prepare_dicke_state(self, qc, qubits):
-        """
-        Prepare a Dicke state on the specified qubits using proper control structures.
+        Register sizes, the CNOT layers for the matrix-vector product and the decoder
+        are derived from ``parity_check_matrix`` (see ``dqi_circuit.DQICircuitCompiler``).
         
         Args:
-            qc (QuantumCircuit): The quantum circuit to modify
-            qubits (list): The qubits to prepare in a Dicke state
-        """
-        n = len(qubits)
-        
-        # Apply the cycle shift operations using control gates
-        if n >= 2:
-            qc.cx(qubits[1], qubits[0])
-            
-            # Using control gates instead of conditional blocks
-            angle = np.pi/2  # Default for n=2
-            if n == 3:
-                angle = 1.9106332362490186
-            elif n == 4:
-                angle = 2.0943951023931957
-            elif n == 5:
-                angle = 2.214297435588181
-            elif n == 6:
-                angle = 2.300523983021863
-                
-            # Controlled RY gate
-            qc.cry(angle, qubits[0], qubits[1])
-        
-        if n >= 3:
-            qc.cx(qubits[2], qubits[0])
-            
-            # Using multi-controlled RY for multi-qubit control
-            angle = 1.2309594173407747  # For n=3
-            if n == 4:
-                angle = 1.5707963267948968
-            elif n == 5:
-                angle = 1.7721542475852274
-            elif n == 6:
-                angle = 1.9106332362490186
-            
-            # For multi-controlled operation, decompose into basic gates
-            control_qubits = [qubits[0], qubits[1]]
-            target = qubits[2]
-            
-            # Simple implementation of multi-controlled RY 
-            # using available gates in Qiskit
-            qc.h(target)
-            qc.mcry(angle, control_qubits, target)
-            qc.h(target)
-        
-        # Recursively prepare Dicke state on the remaining qubits
-        if n > 1:
-            self._prepare_dicke_state(qc, qubits[1:])
-    
-    def _apply_vector_product_phase(self, qc, qubits, phase_vector=None):
-        """
-        Apply phase based on the vector product.
+            measure (bool, optional): Whether to measure the solution register.
+                                Defaults to True.
+            measure_y (bool, optional): Whether to also measure the y register. Defaults to True.
         
-        Args:
-            qc (QuantumCircuit): The quantum circuit to modify
-            qubits (list): The qubits to apply phases to
-            phase_vector (list, optional): Vector of phase values. Defaults to [1.0] * 6.
+        Returns:
+            QuantumCircuit: The constructed quantum circuit
         """
-        if phase_vector is None:
-            phase_vector = [1.0] * 6  # Default from qmod file
-        
-        for i, phase in enumerate(phase_vector):
-            if phase > 0:
-                qc.z(qubits[i])
+        compiler = DQICircuitCompiler(
+            self.parity_check_matrix,
+            self.syndrome_table,
+            max_error_weight=self.max_error_weight,
+            phase_vector=self.phase_vector,
+            error_weights=self.error_weights
+        )
+        return compiler.build_circuit(measure=measure, measure_y=measure_y)
     
-    def _apply_matrix_vector_product(self, qc, input_qubits, output_qubits):
+    def compile_circuit(self, backend, measure=True, measure_y=True, **transpile_options):
         """
-        Apply the matrix-vector product operation based on the parity check matrix.
+        Get the circuit transpiled for a backend, building it only on a cache miss.
+        
+        The cache key covers the parity check matrix, phase vector, error weights and
+        the backend with its transpile options, so solvers for the same instance share
+        one compiled circuit.
         
         Args:
-            qc (QuantumCircuit): The quantum circuit to modify
-            input_qubits (list): The input qubits
-            output_qubits (list): The output qubits for storing the result
+            backend (Backend): The backend to transpile for
+            measure (bool, optional): Whether the circuit ends in measurements. Defaults to True.
+            measure_y (bool, optional): Whether the y register is measured too. Defaults to True.
+            **transpile_options: Additional keyword arguments for ``transpile``
+            
+        Returns:
+            QuantumCircuit: The transpiled circuit
         """
-        # This implements the parity check matrix multiplication
-        # out[0] = y[0] ⊕ y[1]
-        qc.cx(input_qubits[0], output_qubits[0])
-        qc.cx(input_qubits[1], output_qubits[0])
-        
-        # out[1] = y[0] ⊕ y[2]
-        qc.cx(input_qubits[0], output_qubits[1])
-        qc.cx(input_qubits[2], output_qubits[1])
-        
-        # out[2] = y[2] ⊕ y[3]
-        qc.cx(input_qubits[2], output_qubits[2])
-        qc.cx(input_qubits[3], output_qubits[2])
-        
-        # out[3] = y[3] ⊕ y[4]
-        qc.cx(input_qubits[3], output_qubits[3])
-        qc.cx(input_qubits[4], output_qubits[3])
-        
-        # out[4] = y[1] ⊕ y[5]
-        qc.cx(input_qubits[1], output_qubits[4])
-        qc.cx(input_qubits[5], output_qubits[4])
-        
-        # out[5] = y[4] ⊕ y[5]
-        qc.cx(input_qubits[4], output_qubits[5])
-        qc.cx(input_qubits[5], output_qubits[5])
+        key = circuit_key(
+            self.parity_check_matrix,
+            self.phase_vector,
+            self.max_error_weight,
+            error_weights=self.error_weights,
+            backend_name=backend.name,
+            transpile_options=transpile_options,
+            measure=measure,
+            measure_y=measure_y
+        )
+        _, transpiled = self.circuit_cache.get_or_compile(
+            key,
+            lambda: self.build_circuit(measure=measure, measure_y=measure_y),
+            lambda circuit: transpile(circuit, backend, **transpile_options)
+        )
+        return transpiled
     
-    def _syndrome_decode(self, qc, syndrome_qubits, error_qubits):
+    def run(self, shots=1024, seed=None):
         """
-        Apply the syndrome decoding using classical bits and modern control approach.
+        Run the DQI Max-XORSAT algorithm.
+        
+        Only the solution register is measured, so the simulator returns counts already
+        marginalized onto it and their size is bounded by 2**n_checks rather than by the
+        width of the whole circuit.
         
         Args:
-            qc (QuantumCircuit): The quantum circuit to modify
-            syndrome_qubits (list): The qubits containing the syndrome
-            error_qubits (list): The qubits to store the decoded error pattern
+            shots (int, optional): Number of shots for the simulation. Defaults to 1024.
+            seed (int, optional): Seed of the simulator. Defaults to None.
+            
+        Returns:
+            Distribution: Result counts of the solution bitstrings
         """
-        # Create classical registers for syndrome measurement
-        syndrome_c = ClassicalRegister(len(syndrome_qubits), "syndrome_c")
-        qc.add_register(syndrome_c)
+        # Use the statevector simulator for accurate results
+        simulator = Aer.get_backend('qasm_simulator')
         
-        # Measure syndrome qubits to classical bits
-        qc.measure(syndrome_qubits, syndrome_c)
+        # Built and transpiled once per instance, then served from the circuit cache
+        circuit = self.compile_circuit(simulator, measure_y=False)
+        run_options = {'shots': shots}
+        if seed is not None:
+            run_options['seed_simulator'] = seed
+        job = simulator.run(circuit, **run_options)
+        result = job.result()
         
-        # For each possible syndrome in our table
-        for syndrome_int, error_pattern in self.syndrome_table.items():
-            # Convert syndrome to binary string
-            syndrome_bin = bin(syndrome_int)[2:].zfill(6)
-            
-            # Create control condition based on syndrome value
-            # For each syndrome bit that should be 1, check that classical bit
-            condition = []
-            for i, bit in enumerate(syndrome_bin):
-                if bit == '1':
-                    condition.append((syndrome_c[i], 1))
-                else:
-                    condition.append((syndrome_c[i], 0))
-            
-            # Apply error correction based on syndrome pattern
-            error_bin = bin(error_pattern)[2:].zfill(6)
-            for i, bit in enumerate(error_bin):
-                if bit == '1':
-                    # Apply X gate conditionally based on the syndrome
-                    # For simplicity, just handle each bit individually
-                    with qc.if_test(condition[0]):
-                        with qc.if_test(condition[1]):
-                            # Continue with additional conditions as needed
-                            qc.x(error_qubits[i])
-        
-        # Reset syndrome qubits for potential reuse
-        qc.reset(syndrome_qubits)
+        # Get the solution counts, keyed by integer states rather than bitstrings
+        return Distribution.from_int_dict(result.get_counts().int_outcomes(), self.n_checks)
     
-    def _hadamard_transform(self, qc, qubits):
+    def run_exact(self, postselect=False, tolerance=1e-12):
         """
-        Apply the Hadamard transform to the specified qubits.
+        Compute the exact output distribution of the solution register without sampling.
         
-        Args:
-            qc (QuantumCircuit): The quantum circuit to modify
-            qubits (list): The qubits to apply the Hadamard transform to
-        """
-        for qubit in qubits:
-            qc.h(qubit)
-    
-    def build_circuit(self):
-        """
-        Build the full DQI Max-XORSAT circuit.
+        The circuit is simulated once without measurements on the statevector simulator,
+        and the probabilities are marginalized onto the solution qubits with a NumPy
+        reduction over the y register.
         
+        Args:
+            postselect (bool, optional): Keep only the branch where decoding succeeded
+                                (y is all zeros) and renormalize. Defaults to False.
+            tolerance (float, optional): Probabilities at or below this value are dropped.
+                                Defaults to 1e-12.
+            
         Returns:
-            QuantumCircuit: The constructed quantum circuit
+            Distribution: Probabilities of the solution bitstrings
+            
+        Raises:
+            ValueError: If postselecting and the decoding success branch has no probability
         """
-        # Create quantum registers
-        k_register = QuantumRegister(2, "k")  # Register for k (number of errors)
-        y_register = QuantumRegister(6, "y")  # Register for y (the solution vector)
-        solution_register = QuantumRegister(6, "solution")  # Register for the solution
-        unary_register = QuantumRegister(3, "unary")  # Register for unary encoding
-        
-        # Create classical registers for measurement
-        y_classical = ClassicalRegister(6, "y_meas")
-        solution_classical = ClassicalRegister(6, "solution_meas")
-        
-        # Create circuit
-        qc = QuantumCircuit(k_register, unary_register, y_register, solution_register, 
-                           y_classical, solution_classical)
-        
-        # Prepare the superposition for k (number of errors)
-        # This creates a superposition of 1 and 2 errors
-        qc.ry(np.arccos(0.5), k_register[0])
-        qc.x(k_register[1])
-        qc.cx(k_register[0], k_register[1])
-        
-        # Convert binary k to unary representation
-        self._binary_to_unary(qc, k_register, unary_register)
-        
-        # Map unary to y register (which will be padded with zeros)
-        for i in range(3):
-            qc.cx(unary_register[i], y_register[i])
-        
-        # Prepare the Dicke state on y register
-        self._prepare_dicke_state(qc, y_register)
-        
-        # Apply phase based on vector product
-        self._apply_vector_product_phase(qc, y_register)
-        
-        # Apply matrix-vector product for syndrome calculation
-        self._apply_matrix_vector_product(qc, y_register, solution_register)
-        
-        # Apply syndrome decoding
-        self._syndrome_decode(qc, solution_register, y_register)
-        
-        # Apply Hadamard transform to solution register
-        self._hadamard_transform(qc, solution_register)
-        
-        # Measure the results
-        qc.measure(y_register, y_classical)
-        qc.measure(solution_register, solution_classical)
+        simulator = Aer.get_backend('statevector_simulator')
+        circuit = self.compile_circuit(simulator, measure=False)
+        state = np.asarray(simulator.run(circuit).result().get_statevector())
+        
+        # Qubit order is little-endian with the y register first, so the solution
+        # register indexes the rows and y the columns
+        probs = (np.abs(state) ** 2).reshape(2 ** self.n_checks, 2 ** self.n_bits)
+        if postselect:
+            success = probs[:, 0].sum()
+            if success <= tolerance:
+                raise ValueError(f"Cannot postselect: decoding succeeds with probability {success:.3g}")
+            solution_probs = probs[:, 0] / success
+        else:
+            solution_probs = probs.sum(axis=1)
         
-        return qc
+        return Distribution.from_probabilities(solution_probs, tolerance=tolerance)
     
-    def run(self, shots=1024):
+    @classmethod
+    def run_batch(cls, matrices, shots=1024, max_parallel_experiments=0,
+                  threads_per_experiment=None, seed=None, **solver_options):
         """
-        Run the DQI Max-XORSAT algorithm.
+        Run the DQI Max-XORSAT algorithm on many instances in a single simulator job.
+        
+        All circuits are compiled first (through the circuit cache) and submitted with one
+        ``backend.run([...])`` call, so Aer can simulate the experiments in parallel.
         
         Args:
-            shots (int, optional): Number of shots for the simulation. Defaults to 1024.
+            matrices (list): Parity check matrices of the instances
+            shots (int, optional): Number of shots per instance. Defaults to 1024.
+            max_parallel_experiments (int, optional): Maximum number of experiments Aer runs
+                                concurrently. 0 lets Aer use all available cores. Defaults to 0.
+            threads_per_experiment (int, optional): Threads available to each experiment.
+                                The total is capped at the CPU count. Defaults to None
+                                (chosen by Aer).
+            seed (int, optional): Seed of the simulator. Aer derives the seed of every
+                                experiment from it. Defaults to None.
+            **solver_options: Additional keyword arguments for the ``DQIMaxXORSAT`` constructor
             
         Returns:
-            dict: Result counts mapping bitstrings to their frequencies
+            list: One dictionary per instance with the solution 'counts', the 'seed' of its
+                  experiment, which reproduces them with ``run``, the 'compile_time' spent
+                  building and transpiling its circuit, and the 'simulation_time' Aer
+                  reports for its experiment, both in seconds
         """
-        circuit = self.build_circuit()
-        
-        # Use the statevector simulator for accurate results
         simulator = Aer.get_backend('qasm_simulator')
-        job = simulator.run(circuit, shots=shots)
-        result = job.result()
-        
-        # Get the solution counts
-        counts = result.get_counts()
-        
-        # Process results to separate y and solution measurements
-        solution_counts = {}
-        for bitstring, count in counts.items():
-            # Parse the solution part (last 6 bits)
-            solution = bitstring[:6]
-            if solution in solution_counts:
-                solution_counts[solution] += count
-            else:
-                solution_counts[solution] = count
         
-        return solution_counts
+        solvers = []
+        circuits = []
+        compile_times = []
+        for matrix in matrices:
+            start = time.perf_counter()
+            solver = cls(matrix, **solver_options)
+            circuits.append(solver.compile_circuit(simulator, measure_y=False))
+            compile_times.append(time.perf_counter() - start)
+            solvers.append(solver)
+        
+        run_options = {'shots': shots, 'max_parallel_experiments': max_parallel_experiments}
+        if seed is not None:
+            run_options['seed_simulator'] = seed
+        if threads_per_experiment is not None:
+            # More threads than cores would only oversubscribe them
+            n_cores = os.cpu_count() or 1
+            n_parallel = min(max_parallel_experiments or n_cores, len(circuits))
+            run_options['max_parallel_threads'] = min(threads_per_experiment * n_parallel, n_cores)
+        
+        result = simulator.run(circuits, **run_options).result()
+        
+        batch_results = []
+        for i, solver in enumerate(solvers):
+            batch_results.append({
+                'counts': Distribution.from_int_dict(result.get_counts(i).int_outcomes(), solver.n_checks),
+                'seed': result.results[i].seed_simulator,
+                'compile_time': compile_times[i],
+                'simulation_time': result.results[i].time_taken
+            })
+        
+        return batch_results
     
     def visualize_results(self, counts, save_path=None):
         """
-        Visualize the results as a histogram.
+        Visualize the results as a histogram of the most likely solutions.
         
         Args:
-            counts (dict): Result counts from the algorithm
+            counts (Distribution or dict): Result counts from the algorithm
             save_path (str, optional): Optional path to save the plot. If None, displays the plot.
         """
-        figure = plot_histogram(counts)
-        plt.title("DQI Max-XORSAT Solutions")
+        render_distribution(counts, save_path, title="DQI Max-XORSAT Solutions",
+                            show=save_path is None, dpi=300)
+            
+    def compare_to_baselines(self, counts, exhaustive_limit=24, seed=None):
+        """
+        Compare DQI results with classical Max-XORSAT baselines on the same instance.
         
-        if save_path:
-            plt.savefig(save_path, dpi=300, bbox_inches='tight')
-            plt.close()
-        else:
-            plt.show()
+        Args:
+            counts (Distribution or dict): Result counts or probabilities from the algorithm
+            exhaustive_limit (int, optional): Largest number of variables for which the
+                                optimum is found by exhaustive search. Defaults to 24.
+            seed (int, optional): Seed for the local search baselines. Defaults to None.
             
-    def export_results(self, results, output_dir='outputs'):
+        Returns:
+            dict: The report of ``ClassicalMaxXORSAT.report``
+        """
+        baselines = ClassicalMaxXORSAT.from_solver(self)
+        return baselines.report(counts, exhaustive_limit=exhaustive_limit, seed=seed)
+    
+    def export_results(self, results, output_dir='outputs', exporter=None, baselines=False):
         """
         Export the results to various file formats.
         
+        With ``baselines``, the results are also compared with the classical baselines
+        and the report is written next to them. The comparison runs the local searches
+        and, for up to 24 variables, an exhaustive search, so with an exporter it is
+        queued as one of its jobs.
+        
         Args:
-            results (dict): Dictionary containing the results
+            results (Distribution or dict): Result counts or probabilities
             output_dir (str, optional): Directory to save the outputs. Defaults to 'outputs'.
+            exporter (ResultExporter, optional): Background exporter the files are handed to,
+                                so this returns before they are written. Defaults to None
+                                (write them before returning).
+            baselines (bool, optional): Compare with the classical baselines. Defaults to False.
             
         Returns:
-            dict: Dictionary with paths to the exported files and summary information
+            dict: Dictionary with paths to the exported files and summary information;
+                  the plot path is None when the exporter skips plots, and 'jobs'
+                  holds the futures of the exporter's jobs, which carry their errors.
+                  'baseline_report' is the report, its future with an exporter, or None.
         """
         # Create timestamp for unique filenames
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -427,36 +362,88 @@ class DQIMaxXORSAT:
         json_path = os.path.join(output_dir, f"results_{timestamp}.json")
         csv_path = os.path.join(output_dir, f"results_{timestamp}.csv")
         plot_path = os.path.join(output_dir, f"histogram_{timestamp}.png")
+        baselines_path = os.path.join(output_dir, f"baselines_{timestamp}.json") if baselines else None
         
-        # Export as JSON
-        with open(json_path, 'w') as f:
-            json.dump(results, f, indent=2)
-            
-        # Export as CSV
-        with open(csv_path, 'w', newline='') as f:
-            writer = csv.writer(f)
-            writer.writerow(['Solution', 'Count'])
-            for solution, count in results.items():
-                writer.writerow([solution, count])
+        results = Distribution.from_dict(results, self.n_checks)
+        
+        # Export as JSON and CSV, in the background if an exporter is given
+        write = exporter.write if exporter is not None else export_inline
+        jobs = [write(write_json, json_path, results.to_dict()),
+                write(write_counts_csv, csv_path, results)]
         
         # Export plot
-        self.visualize_results(results, save_path=plot_path)
+        if exporter is None:
+            self.visualize_results(results, save_path=plot_path)
+        else:
+            jobs.append(exporter.plot(render_histogram, results, plot_path, "DQI Max-XORSAT Solutions"))
+            if exporter.plots == 'skip':
+                plot_path = None
+        
+        # Export the comparison with the classical baselines
+        baseline_report = None
+        if baselines:
+            baseline_report = write(write_baseline_report, baselines_path,
+                                    self.parity_check_matrix, self.phase_vector, results)
+            jobs.append(baseline_report)
         
         # Find best solution
-        best_solution = max(results.items(), key=lambda x: x[1])[0]
+        best_solution = results.most_likely()[0]
         
         # Create summary
         summary = {
             'best_solution': best_solution,
+            'jobs': [job for job in jobs if isinstance(job, Future)],
+            'baseline_report': baseline_report,
             'output_files': {
                 'json': json_path,
                 'csv': csv_path,
-                'plot': plot_path
+                'plot': plot_path,
+                'baselines': baselines_path
             }
         }
         
         return summary
 
+    def save_results(self, results, store, params=None):
+        """
+        Record the results in a columnar result store instead of per-run files.
+        
+        Args:
+            results (Distribution or dict): Result counts or probabilities
+            store (ResultStore): The store
+            params (dict, optional): Further parameters of the run to record
+            
+        Returns:
+            str: The run id
+        """
+        results = Distribution.from_dict(results, self.n_checks)
+        return store.append(
+            instance_hash(self.parity_check_matrix, self.phase_vector),
+            'dqi',
+            results.states,
+            counts=results.weights if results.is_counts else None,
+            probabilities=None if results.is_counts else results.weights,
+            n_bits=self.n_checks,
+            params={'max_error_weight': self.max_error_weight, **(params or {})}
+        )
+
+def write_baseline_report(path, parity_check_matrix, phase_vector, results):
+    """
+    Compare results with the classical baselines and write the report, as an export job.
+    
+    Args:
+        path (str): Path of the JSON file
+        parity_check_matrix (numpy.ndarray): The instance's parity check matrix
+        phase_vector (numpy.ndarray): The instance's phase vector
+        results (Distribution or dict): Result counts or probabilities
+        
+    Returns:
+        dict: The report of ``ClassicalMaxXORSAT.report``
+    """
+    report = ClassicalMaxXORSAT(parity_check_matrix, phase_vector).report(results)
+    write_json(path, report)
+    return report
+
 # Example usage
 if __name__ == "__main__":
     # Create and run the DQI Max-XORSAT solver
@@ -470,10 +457,13 @@ if __name__ == "__main__":
     
     # Export results to files
     print("Exporting results to files...")
-    output_summary = dqi_solver.export_results(results)
+    output_summary = dqi_solver.export_results(results, baselines=True)
     
     # Print summary information
     print(f"\nBest solution: {output_summary['best_solution']}")
+    report = output_summary['baseline_report']
+    print(f"Expected satisfied constraints: {report['dqi_expected_satisfied']:.3f} "
+          f"(optimum {report['optimum']}, random {report['random_expected_satisfied']:.1f})")
     print("\nFiles exported:")
     for file_type, path in output_summary['output_files'].items():
         print(f"- {file_type.upper()}: {path}") 
\ No newline at end of file
@@ -0,0 +1,422 @@
+"""
+GF(2) Linear Algebra Module
+
+This module provides linear algebra over GF(2) on bit-packed matrices. A
+``BitMatrix`` stores each row as big-endian uint64 words, 64 entries per word
+instead of one int64 per entry, and every operation works on whole words:
+
+- a product of two binary vectors is the parity of the popcount of their AND
+- adding a row to another over GF(2) is one XOR per word
+- Gaussian elimination XORs the pivot row into all rows with a set pivot bit at once
+
+Rows are packed like ``pack_bits``: left-padded with zeros to a multiple of 64 bits,
+so column 0 is the most significant bit of the row and the words of a row read
+most significant first give ``int("".join(row), 2)``.
+
+Example:
+    To compute syndromes and the kernel of a parity check matrix:
+
+    ```python
+    H = BitMatrix.from_dense(parity_check_matrix)
+
+    # Syndromes H·e of many error patterns at once, one packed row per pattern
+    syndromes = H.batch_matvec(errors)
+
+    # Basis of {y : H·y = 0}
+    kernel = H.kernel_basis()
+    ```
+"""
+
+import numpy as np
+
+WORD_BITS = 64
+
+# Set bits of every byte value, for popcounts without np.bitwise_count (NumPy < 2.0)
+_BYTE_POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+# Shifts and masks of the swap rounds of the 64x64 block transpose
+_TRANSPOSE_ROUNDS = [(np.uint64(shift), np.uint64(mask)) for shift, mask in [
+    (32, 0x00000000FFFFFFFF), (16, 0x0000FFFF0000FFFF), (8, 0x00FF00FF00FF00FF),
+    (4, 0x0F0F0F0F0F0F0F0F), (2, 0x3333333333333333), (1, 0x5555555555555555)]]
+
+
+def popcount(words):
+    """
+    Count the set bits of every word.
+
+    Uses ``np.bitwise_count`` where NumPy provides it (2.0 and later) and a byte lookup
+    table otherwise.
+
+    Args:
+        words (numpy.ndarray): Array of uint64 words
+
+    Returns:
+        numpy.ndarray: uint8 array of the same shape with the set bits per word
+    """
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(words)
+    words = np.ascontiguousarray(words, dtype=np.uint64)
+    return _BYTE_POPCOUNT[words.view(np.uint8)].reshape(words.shape + (8,)).sum(axis=-1, dtype=np.uint8)
+
+
+def pack_bits(bits):
+    """
+    Pack the last axis of a 0/1 array into big-endian uint64 words.
+
+    The bits are left-padded with zeros to a multiple of 64, so the words read most
+    significant first give the same integer as ``int("".join(bits), 2)``.
+
+    Args:
+        bits (numpy.ndarray): Array of 0/1 values with shape (..., n_bits)
+
+    Returns:
+        numpy.ndarray: Array of uint64 words with shape (..., ceil(n_bits / 64))
+    """
+    bits = np.asarray(bits, dtype=np.uint8) & 1
+    n_bits = bits.shape[-1]
+    n_words = max(1, -(-n_bits // WORD_BITS))
+    padding = n_words * WORD_BITS - n_bits
+
+    padded = np.zeros(bits.shape[:-1] + (n_words * WORD_BITS,), dtype=np.uint8)
+    padded[..., padding:] = bits
+    packed = np.packbits(padded, axis=-1, bitorder='big')
+
+    return np.ascontiguousarray(packed).view('>u8').astype(np.uint64)
+
+
+def unpack_bits(words, n_bits):
+    """
+    Unpack big-endian uint64 words into a 0/1 array, the inverse of ``pack_bits``.
+
+    Args:
+        words (numpy.ndarray): Array of uint64 words with shape (..., n_words)
+        n_bits (int): Number of bits per packed row
+
+    Returns:
+        numpy.ndarray: uint8 array with shape (..., n_bits)
+    """
+    words = np.ascontiguousarray(words, dtype=np.uint64)
+    as_bytes = words.astype('>u8').view(np.uint8)
+    bits = np.unpackbits(as_bytes, axis=-1, bitorder='big')
+    return bits[..., bits.shape[-1] - n_bits:]
+
+
+def words_to_int(words):
+    """
+    Convert a row of big-endian uint64 words back to a Python integer.
+
+    Args:
+        words (numpy.ndarray): One-dimensional array of uint64 words
+
+    Returns:
+        int: The integer value of the packed words
+    """
+    value = 0
+    for word in words:
+        value = (value << WORD_BITS) | int(word)
+    return value
+
+
+class BitMatrix:
+    """
+    Binary matrix with bit-packed rows and GF(2) arithmetic.
+
+    Attributes:
+        words (numpy.ndarray): Packed rows, uint64 array of shape (n_rows, n_words)
+        n_rows (int): Number of rows
+        n_cols (int): Number of columns
+    """
+
+    def __init__(self, words, n_cols):
+        """
+        Wrap packed rows in a matrix.
+
+        Args:
+            words (numpy.ndarray): Packed rows of shape (n_rows, n_words) as made by ``pack_bits``
+            n_cols (int): Number of columns
+        """
+        self.words = np.ascontiguousarray(words, dtype=np.uint64).reshape(-1, max(1, -(-n_cols // WORD_BITS)))
+        self.n_rows = self.words.shape[0]
+        self.n_cols = n_cols
+        self._columns = None
+
+    @classmethod
+    def from_dense(cls, matrix):
+        """
+        Pack a dense matrix, taking entries mod 2.
+
+        Args:
+            matrix (numpy.ndarray): Integer matrix of shape (n_rows, n_cols)
+
+        Returns:
+            BitMatrix: The packed matrix
+        """
+        matrix = np.asarray(matrix)
+        if matrix.ndim != 2:
+            raise ValueError("BitMatrix needs a two-dimensional matrix")
+        return cls(pack_bits(matrix % 2), matrix.shape[1])
+
+    @property
+    def shape(self):
+        return (self.n_rows, self.n_cols)
+
+    @property
+    def n_words(self):
+        return self.words.shape[1]
+
+    def __repr__(self):
+        return f"BitMatrix(shape={self.shape})"
+
+    def __eq__(self, other):
+        return isinstance(other, BitMatrix) and self.shape == other.shape \
+            and np.array_equal(self.words, other.words)
+
+    def copy(self):
+        return BitMatrix(self.words.copy(), self.n_cols)
+
+    def to_dense(self):
+        """
+        Unpack the matrix.
+
+        Returns:
+            numpy.ndarray: uint8 array of shape (n_rows, n_cols)
+        """
+        return unpack_bits(self.words, self.n_cols)
+
+    def transpose(self):
+        """
+        Transpose the matrix on the packed words, one 64x64 bit block at a time.
+
+        The rows are padded to whole blocks, and every block is transposed by six
+        rounds that swap its off-diagonal halves, quarters and so on down to single
+        bits, with all blocks of the matrix processed at once.
+
+        Returns:
+            BitMatrix: Matrix of shape (n_cols, n_rows)
+        """
+        n_blocks = max(1, -(-self.n_rows // WORD_BITS))
+        # Padding rows go first, as the leading zero bits of the transposed rows
+        blocks = np.zeros((n_blocks * WORD_BITS, self.n_words), dtype=np.uint64)
+        blocks[n_blocks * WORD_BITS - self.n_rows:] = self.words
+        blocks = blocks.reshape(n_blocks, WORD_BITS, self.n_words).transpose(0, 2, 1).copy()
+
+        for shift, mask in _TRANSPOSE_ROUNDS:
+            # Row k of a block pairs with row k + shift, for the k with that bit clear
+            pairs = blocks.reshape(n_blocks, self.n_words, -1, 2, int(shift))
+            low, high = pairs[..., 0, :], pairs[..., 1, :]
+            swap = (low ^ (high >> shift)) & mask
+            low ^= swap
+            high ^= swap << shift
+
+        # Block (i, j) now holds columns 64j..64j+63 of row block i
+        columns = blocks.transpose(1, 2, 0).reshape(self.n_words * WORD_BITS, n_blocks)
+        return BitMatrix(columns[self.n_words * WORD_BITS - self.n_cols:], self.n_rows)
+
+    @property
+    def T(self):
+        return self.transpose()
+
+    def _bit(self, col):
+        """
+        Locate a column in the packed rows.
+
+        Args:
+            col (int): Column index
+
+        Returns:
+            tuple: (word index, uint64 mask of the column's bit)
+        """
+        position = self.n_words * WORD_BITS - self.n_cols + col
+        return position // WORD_BITS, np.uint64(1) << np.uint64(WORD_BITS - 1 - position % WORD_BITS)
+
+    def column(self, col):
+        """
+        Read one column.
+
+        Args:
+            col (int): Column index
+
+        Returns:
+            numpy.ndarray: Boolean array of length n_rows
+        """
+        word, mask = self._bit(col)
+        return (self.words[:, word] & mask) != 0
+
+    def row_weights(self):
+        """
+        Hamming weight of every row.
+
+        Returns:
+            numpy.ndarray: Integer array of length n_rows
+        """
+        return popcount(self.words).sum(axis=1, dtype=np.int64)
+
+    def matvec(self, vector):
+        """
+        Multiply the matrix with one vector over GF(2).
+
+        Args:
+            vector (numpy.ndarray): 0/1 vector of length n_cols
+
+        Returns:
+            numpy.ndarray: uint8 vector of length n_rows
+        """
+        packed = pack_bits(np.asarray(vector).reshape(self.n_cols))
+        return (popcount(self.words & packed).sum(axis=1) & 1).astype(np.uint8)
+
+    def _column_words(self):
+        """
+        The columns packed as rows, i.e. the words of the transpose, built once.
+
+        Returns:
+            numpy.ndarray: uint64 array of shape (n_cols, ceil(n_rows / 64))
+        """
+        if self._columns is None:
+            self._columns = self.transpose().words
+        return self._columns
+
+    def batch_matvec(self, vectors):
+        """
+        Multiply the matrix with many vectors over GF(2).
+
+        Row s of the result is the product of the matrix with vector s, i.e. the XOR of
+        the packed columns selected by the set bits of vector s. Two strategies are used,
+        whichever touches fewer words:
+
+        - sparse vectors XOR each column into the rows of the vectors that select it
+        - dense vectors use the method of four Russians: the 256 XOR combinations of each
+          group of 8 columns are tabulated and selected by one byte of every vector
+
+        Args:
+            vectors: BitMatrix or 0/1 array of shape (n_vectors, n_cols)
+
+        Returns:
+            BitMatrix: Products of shape (n_vectors, n_rows)
+        """
+        if isinstance(vectors, BitMatrix):
+            if vectors.n_cols != self.n_cols:
+                raise ValueError(f"Expected {self.n_cols} columns, got {vectors.n_cols}")
+            dense = vectors.to_dense()
+        else:
+            dense = np.atleast_2d(np.asarray(vectors, dtype=np.uint8)) & 1
+            if dense.shape[1] != self.n_cols:
+                raise ValueError(f"Expected {self.n_cols} columns, got {dense.shape[1]}")
+
+        columns = self._column_words()
+        n_vectors = dense.shape[0]
+        result = np.zeros((n_vectors, max(1, -(-self.n_rows // WORD_BITS))), dtype=np.uint64)
+
+        n_groups = -(-self.n_cols // 8)
+        nonzero = np.count_nonzero(dense)
+        if nonzero <= n_groups * (256 + n_vectors):
+            for col in np.flatnonzero(dense.any(axis=0)):
+                result[dense[:, col] != 0] ^= columns[col]
+            return BitMatrix(result, self.n_rows)
+
+        # Byte g of a vector selects a combination of columns 8g..8g+7, MSB first
+        vector_bytes = np.packbits(dense, axis=1, bitorder='big')
+        padded = np.vstack([columns, np.zeros((n_groups * 8 - self.n_cols, columns.shape[1]), dtype=np.uint64)])
+        for group in range(n_groups):
+            table = np.zeros((1, columns.shape[1]), dtype=np.uint64)
+            for bit in range(8):
+                # Doubling the table adds byte bit value 2**bit, i.e. column 8g + 7 - bit
+                table = np.concatenate([table, table ^ padded[group * 8 + 7 - bit]])
+            result ^= table[vector_bytes[:, group]]
+
+        return BitMatrix(result, self.n_rows)
+
+    def matmul(self, other):
+        """
+        Multiply two matrices over GF(2).
+
+        Args:
+            other (BitMatrix): Matrix of shape (n_cols, k)
+
+        Returns:
+            BitMatrix: Product of shape (n_rows, k)
+        """
+        if not isinstance(other, BitMatrix):
+            other = BitMatrix.from_dense(other)
+        if other.n_rows != self.n_cols:
+            raise ValueError(f"Cannot multiply {self.shape} by {other.shape}")
+        # Entry [i, j] is the parity of row i AND column j of other
+        return other.transpose().batch_matvec(self)
+
+    def __matmul__(self, other):
+        return self.matmul(other)
+
+    def row_reduce(self, column_order=None):
+        """
+        Bring the matrix to reduced row echelon form by Gaussian elimination.
+
+        Args:
+            column_order (list, optional): Columns in the order they are tried as pivots.
+                                           Defaults to left to right.
+
+        Returns:
+            tuple: (BitMatrix with one row per pivot, list of pivot columns)
+        """
+        words = self.words.copy()
+        pivots = []
+        if column_order is None:
+            column_order = range(self.n_cols)
+
+        for col in column_order:
+            rank = len(pivots)
+            if rank == self.n_rows:
+                break
+            word, mask = self._bit(int(col))
+            has_bit = (words[:, word] & mask) != 0
+            candidates = np.flatnonzero(has_bit[rank:])
+            if candidates.size == 0:
+                continue
+
+            pivot = rank + candidates[0]
+            words[[rank, pivot]] = words[[pivot, rank]]
+            has_bit[[rank, pivot]] = has_bit[[pivot, rank]]
+            has_bit[rank] = False
+            words[has_bit] ^= words[rank]
+            pivots.append(int(col))
+
+        return BitMatrix(words[:len(pivots)], self.n_cols), pivots
+
+    def rank(self):
+        """
+        Rank of the matrix over GF(2).
+
+        Returns:
+            int: The rank
+        """
+        return len(self.row_reduce()[1])
+
+    def row_space_basis(self):
+        """
+        Basis of the row space in reduced row echelon form.
+
+        Returns:
+            BitMatrix: Matrix of shape (rank, n_cols)
+        """
+        return self.row_reduce()[0]
+
+    def kernel_basis(self):
+        """
+        Basis of the kernel {y : M·y = 0}.
+
+        Returns:
+            BitMatrix: Matrix of shape (n_cols - rank, n_cols), one basis vector per row
+        """
+        reduced, pivots = self.row_reduce()
+        pivot_set = set(pivots)
+        free = np.array([col for col in range(self.n_cols) if col not in pivot_set], dtype=np.int64)
+
+        # Setting one free variable to 1 fixes each pivot variable to its row's entry,
+        # so basis vector i has bit free[i] and bit pivots[r] wherever row r has bit free[i]
+        basis = BitMatrix(np.zeros((len(free), self.n_words), dtype=np.uint64), self.n_cols)
+        for i, col in enumerate(free):
+            word, mask = self._bit(col)
+            basis.words[i, word] |= mask
+        for r, col in enumerate(pivots):
+            word, mask = self._bit(col)
+            has_free = unpack_bits(reduced.words[r], self.n_cols)[free] != 0
+            basis.words[has_free, word] |= mask
+        return basis
@@ -5,36 +5,74 @@ This module implements the Quantum Approximate Optimization Algorithm (QAOA)
 for solving optimization problems based on an N x N matrix. The implementation
 uses PennyLane for quantum circuit simulation.
 
+Importing the module does no work: PennyLane and matplotlib are only imported when
+a solver first needs them, so a worker process can import ``QAOASolver`` cheaply and
+solve many QUBOs without re-importing or plotting.
+
 Example:
-    Run this script directly to execute the QAOA algorithm on a default 5x5 matrix:
-    
+    To solve a QUBO from Python:
+
+    ```python
+    solver = QAOASolver(Q, depth=2, steps=300)
+    result = solver.solve()
+    print(result['best_solution'], result['energy'])
+    ```
+
+    Run this script directly to execute the QAOA algorithm on the example 9x9 matrix,
+    or on a generated N x N matrix:
+
     $ python implementingQAOA_N_by_N.py
+    $ python implementingQAOA_N_by_N.py 5
 """
 
-import pennylane as qml
-from pennylane import numpy as np
-import matplotlib.pyplot as plt
+import copy
 import csv
-
-# Set the size of the N x N matrix
-N = 5  # You can change this to any value you want
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from distribution import Distribution
+from plotting import render_distribution
+from qaoa_simulator import QAOASimulator
+from qubo import qubo_to_ising
+
+# Largest register for which the script plots and exports every basis state
+MAX_DENSE_QUBITS = 12
+
+# Number of solutions and samples reported for larger registers
+TOP_K = 20
+TOP_K_SHOTS = 10000
+
+# Example 9x9 QUBO matrix
+EXAMPLE_Q = np.array([
+    [-5, 1, 0, 2, 0, 0, 0, 0, 0],
+    [1, 3, 0, 0, 2, 0, 1, 0, 0],
+    [0, 0, 1, 0, 0, 0, 0, 0, 0],
+    [2, 0, 0, -9, 1, 0, 0, 2, 0],
+    [0, 2, 0, 1, -7, 0, 0, 1, 0],
+    [0, 0, 0, 0, 0, 1, 0, 0, 0],
+    [0, 1, 0, 0, 0, 0, -1, 0, 0],
+    [0, 0, 0, 2, 1, 0, 0, 5, 0],
+    [0, 0, 0, 0, 0, 0, 0, 0, 11]
+])
 
 def create_q_matrix(n):
     """
     Create a Q matrix of size n x n for the QUBO problem.
-    
+
     The matrix follows a specific pattern with 5's in most positions,
     and special values on the diagonal.
-    
+
     Args:
         n (int): Size of the matrix (n x n)
-        
+
     Returns:
         numpy.ndarray: The generated Q matrix
     """
     # Initialize a matrix with 5's
     Q = np.ones((n, n)) * 5
-    
+
     # Set diagonal elements with a pattern similar to the original
     for i in range(n):
         if i == 0:
@@ -43,192 +81,680 @@ def create_q_matrix(n):
             Q[i, i] = -6
         else:
             Q[i, i] = 5
-    
+
     return Q
 
-# Create the Q matrix with the specified size
-Q = np.array([[-5, 1, 0, 2, 0, 0, 0, 0, 0], [1, 3, 0, 0, 2, 0, 1, 0, 0], [0, 0, 1, 0, 0, 0, 0, 0, 0], [2, 0, 0, -9, 1, 0, 0, 2, 0], [0, 2, 0, 1, -7, 0, 0, 1, 0], [0, 0, 0, 0, 0, 1, 0, 0, 0], [0, 1, 0, 0, 0, 0, -1, 0, 0], [0, 0, 0, 2, 1, 0, 0, 5, 0], [0, 0, 0, 0, 0, 0, 0, 0, 11]])
-print("Q matrix:")
-print(Q)
+def interpolate_params(params):
+    """
+    Extend depth-p angles to depth p + 1 with the INTERP rule of Zhou et al.
 
-# Number of qubits
-n_qubits = Q.shape[0]
-wires = range(n_qubits)
+    Each angle schedule is treated as samples of a smooth curve and linearly
+    resampled at p + 1 points.
 
-# Translate QUBO to cost Hamiltonian
-coeffs = []
-ops = []
+    Args:
+        params (numpy.ndarray): Angles of shape (p, 2)
 
-for i in range(n_qubits):
-    coeffs.append(Q[i, i] / 2)
-    ops.append(qml.PauliZ(i))
-    for j in range(i + 1, n_qubits):
-        coeffs.append(Q[i, j] / 4)
-        ops.append(qml.PauliZ(i) @ qml.PauliZ(j))
+    Returns:
+        numpy.ndarray: Angles of shape (p + 1, 2)
+    """
+    params = np.asarray(params, dtype=float).reshape(-1, 2)
+    p = params.shape[0]
+    padded = np.vstack([np.zeros((1, 2)), params, np.zeros((1, 2))])
+    i = np.arange(p + 1)[:, None]
+    return (i / p) * padded[:p + 1] + ((p - i) / p) * padded[1:p + 2]
 
-cost_h = qml.Hamiltonian(coeffs, ops)
-print("\nCost Hamiltonian:")
-print(cost_h)
+def initial_params(depth, strategy="random", rng=None, base_params=None):
+    """
+    Draw initial QAOA angles.
 
-# Define mixer Hamiltonian (standard X mixer)
-mixer_coeffs = [1 for _ in range(n_qubits)]
-mixer_ops = [qml.PauliX(i) for i in range(n_qubits)]
-mixer_h = qml.Hamiltonian(mixer_coeffs, mixer_ops)
+    Strategies:
+        "random": gamma uniform in [0, pi) and alpha uniform in [0, pi/2)
+        "ramp": linear ramp with gamma increasing and alpha decreasing over the layers,
+                with a random overall scale
+        "interp": INTERP extension of ``base_params`` (depth - 1 layers) with small noise
 
-print("\nMixer Hamiltonian:")
-print(mixer_h)
+    Args:
+        depth (int): Number of QAOA layers
+        strategy (str, optional): Initialization strategy. Defaults to "random".
+        rng (numpy.random.Generator, optional): Random generator. Defaults to a fresh one.
+        base_params (numpy.ndarray, optional): Optimized angles of depth - 1 layers,
+                                               required by "interp"
 
-def qaoa_layer(gamma, alpha):
+    Returns:
+        numpy.ndarray: Angles of shape (depth, 2)
     """
-    Apply a single QAOA layer consisting of a cost Hamiltonian evolution 
-    followed by a mixer Hamiltonian evolution.
-    
-    Args:
-        gamma (float): Parameter for the cost Hamiltonian evolution
-        alpha (float): Parameter for the mixer Hamiltonian evolution
+    rng = np.random.default_rng() if rng is None else rng
+
+    if strategy == "random":
+        return rng.uniform(0, 1, (depth, 2)) * [np.pi, np.pi / 2]
+
+    if strategy == "ramp":
+        fraction = (np.arange(depth) + 0.5) / depth
+        scale = rng.uniform(0.3, 1.0)
+        return scale * np.column_stack([fraction, 1 - fraction])
+
+    if strategy == "interp":
+        if base_params is None:
+            raise ValueError("The interp strategy requires base_params")
+        if np.asarray(base_params).reshape(-1, 2).shape[0] != depth - 1:
+            raise ValueError(f"base_params must have {depth - 1} layers")
+        return interpolate_params(base_params) + rng.normal(0, 0.05, (depth, 2))
+
+    raise ValueError(f"Unknown initialization strategy: {strategy}")
+
+class QAOASolver:
+    """
+    QAOA solver for QUBO problems.
+
+    The cost Hamiltonian, device, QNodes and the diagonal simulator are all built
+    lazily on first use, so constructing a solver is cheap.
+
+    Attributes:
+        Q (numpy.ndarray): The QUBO matrix
+        n_qubits (int): Number of qubits (variables)
+        depth (int): Number of QAOA layers
+        steps (int): Number of optimization steps
+        diff_method (str): "numpy" for the adjoint gradient of the diagonal NumPy simulator,
+                           or a PennyLane differentiation method
+        ising (IsingModel): The Ising form of the QUBO
     """
-    qml.qaoa.cost_layer(gamma, cost_h)
-    qml.qaoa.mixer_layer(alpha, mixer_h)
 
-# Circuit
-depth = 2
+    def __init__(self, Q, depth=2, steps=300, optimizer=None, device="default.qubit",
+                 diff_method="numpy"):
+        """
+        Initialize the QAOA solver.
+
+        Args:
+            Q (numpy.ndarray): The QUBO matrix
+            depth (int, optional): Number of QAOA layers. Defaults to 2.
+            steps (int, optional): Number of optimization steps. Defaults to 300.
+            optimizer (optional): A PennyLane optimizer. Defaults to
+                                  ``qml.GradientDescentOptimizer()``.
+            device (str or Device, optional): PennyLane device or device name, used by the
+                                  PennyLane differentiation methods. Defaults to "default.qubit".
+            diff_method (str, optional): Differentiation method. Defaults to "numpy".
+        """
+        self.Q = np.asarray(Q)
+        self.n_qubits = self.Q.shape[0]
+        self.depth = depth
+        self.steps = steps
+        self.diff_method = diff_method
+        self.ising = qubo_to_ising(self.Q)
+
+        self._optimizer = optimizer
+        self._device = device
+        self._simulator = None
+        self._qnodes = None
+        self._circuit = None
+
+    @property
+    def optimizer(self):
+        """The optimizer, created on first use."""
+        if self._optimizer is None:
+            import pennylane as qml
+            self._optimizer = qml.GradientDescentOptimizer()
+        return self._optimizer
+
+    @property
+    def simulator(self):
+        """The diagonal NumPy simulator, created on first use."""
+        if self._simulator is None:
+            self._simulator = QAOASimulator(self.ising, self.depth)
+        return self._simulator
+
+    def _build_qnodes(self):
+        """
+        Build the cost and probability QNodes on the PennyLane device.
+
+        Returns:
+            tuple: (cost_fn, prob_circuit) QNodes taking params of shape (depth, 2)
+        """
+        if self._qnodes is not None:
+            return self._qnodes
+
+        import pennylane as qml
+
+        wires = range(self.n_qubits)
+        cost_h = self.ising.to_hamiltonian()
+        mixer_h = qml.Hamiltonian([1 for _ in wires], [qml.PauliX(i) for i in wires])
+
+        device = self._device
+        if isinstance(device, str):
+            device = qml.device(device, wires=self.n_qubits)
+
+        def circuit(params):
+            for w in wires:
+                qml.Hadamard(wires=w)
+            for d in range(self.depth):
+                qml.qaoa.cost_layer(params[d, 0], cost_h)
+                qml.qaoa.mixer_layer(params[d, 1], mixer_h)
+
+        diff_method = "adjoint" if self.diff_method == "numpy" else self.diff_method
+
+        @qml.qnode(device, diff_method=diff_method)
+        def cost_fn(params):
+            circuit(params)
+            return qml.expval(cost_h)
+
+        @qml.qnode(device)
+        def prob_circuit(params):
+            circuit(params)
+            return qml.probs(wires=wires)
+
+        self._circuit = circuit
+        self._qnodes = (cost_fn, prob_circuit)
+        return self._qnodes
+
+    def _build_sampler(self, shots):
+        """
+        Build a QNode drawing computational basis samples on the PennyLane device.
+
+        Args:
+            shots (int): Number of samples per execution
+
+        Returns:
+            QNode: Sampling QNode returning a 0/1 array of shape (shots, n_qubits)
+        """
+        import pennylane as qml
+
+        _, prob_circuit = self._build_qnodes()
+        wires = range(self.n_qubits)
+
+        @qml.set_shots(shots)
+        @qml.qnode(prob_circuit.device)
+        def sample_circuit(params):
+            self._circuit(params)
+            return qml.sample(wires=wires)
+
+        return sample_circuit
+
+    def cost(self, params):
+        """
+        Evaluate the expected value of the cost Hamiltonian (without the constant offset).
+
+        Args:
+            params (numpy.ndarray): Angles of shape (depth, 2), gamma then alpha per layer
+
+        Returns:
+            float: Expected value of the cost Hamiltonian
+        """
+        if self.diff_method == "numpy":
+            return self.simulator.expectation(params)
+        cost_fn, _ = self._build_qnodes()
+        return float(cost_fn(params))
+
+    def optimize(self, params=None, log_every=None, patience=None, tol=1e-6):
+        """
+        Optimize the QAOA angles.
+
+        Args:
+            params (numpy.ndarray, optional): Initial angles of shape (depth, 2). Defaults
+                                  to 0.5 for every angle.
+            log_every (int, optional): Print the cost every this many steps. Defaults to None.
+            patience (int, optional): Stop early once the best cost has not improved by more
+                                  than ``tol`` for this many steps. Defaults to None (run all steps).
+            tol (float, optional): Minimum improvement for early stopping. Defaults to 1e-6.
+
+        Returns:
+            tuple: (optimized params, list of the cost at each step)
+        """
+        from pennylane import numpy as pnp
+
+        if params is None:
+            params = [[0.5, 0.5] for _ in range(self.depth)]
+        params = pnp.array(params, requires_grad=True)
+
+        opt = self.optimizer
+        if self.diff_method != "numpy":
+            cost_fn, _ = self._build_qnodes()
+
+        costs = []
+        best_cost = np.inf
+        best_step = 0
+        for i in range(self.steps):
+            # Each step returns the cost of its forward pass, which is reused for logging
+            if self.diff_method == "numpy":
+                cost, grad = self.simulator.expectation_and_gradient(params)
+                params = opt.apply_grad((grad,), (params,))[0]
+            else:
+                params, cost = opt.step_and_cost(cost_fn, params)
+            costs.append(float(cost))
+            if log_every and i % log_every == 0:
+                print(f"Step {i}: Cost = {cost:.6f}")
+
+            if cost < best_cost - tol:
+                best_cost, best_step = cost, i
+            elif patience and i - best_step >= patience:
+                break
+
+        return np.asarray(params), costs
+
+    def probabilities(self, params):
+        """
+        Compute the probabilities of all computational basis states.
+
+        Args:
+            params (numpy.ndarray): Angles of shape (depth, 2)
+
+        Returns:
+            numpy.ndarray: Probabilities of all computational basis states
+        """
+        if self.diff_method == "numpy":
+            return self.simulator.probabilities(params)
+        _, prob_circuit = self._build_qnodes()
+        return np.asarray(prob_circuit(np.asarray(params)))
+
+    def sample(self, params, shots, seed=None):
+        """
+        Draw measurement samples of the QAOA state.
+
+        Args:
+            params (numpy.ndarray): Angles of shape (depth, 2)
+            shots (int): Number of samples
+            seed (int, optional): Seed for the NumPy simulator's sampling. Defaults to None.
+
+        Returns:
+            numpy.ndarray: uint8 array of shape (shots, n_qubits), wire 0 first
+        """
+        if self.diff_method == "numpy":
+            rng = np.random.default_rng(seed)
+            indices = rng.choice(2 ** self.n_qubits, size=shots, p=self.simulator.probabilities(params))
+            shifts = np.arange(self.n_qubits - 1, -1, -1)
+            return ((indices[:, None] >> shifts) & 1).astype(np.uint8)
+
+        samples = self._build_sampler(shots)(np.asarray(params))
+        return np.asarray(samples, dtype=np.uint8).reshape(shots, self.n_qubits)
+
+    def top_solutions(self, params, k=10, shots=None, seed=None):
+        """
+        Find the k lowest-energy distinct solutions without listing every basis state.
+
+        With ``shots``, the candidates are the distinct sampled bitstrings and their
+        probabilities are estimated from the sample frequencies. Without, the candidates
+        are the k most likely basis states of the NumPy simulator, found with a partial
+        argpartition, with exact probabilities. Only the candidates are scored, with a
+        vectorized energy, so the output size is bounded by k.
+
+        Args:
+            params (numpy.ndarray): Angles of shape (depth, 2)
+            k (int, optional): Number of solutions to return. Defaults to 10.
+            shots (int, optional): Number of samples to draw. Defaults to None.
+            seed (int, optional): Seed for sampling. Defaults to None.
+
+        Returns:
+            list: Up to k dicts with the 'bitstring', its 'probability', its cost Hamiltonian
+                  'energy' and its 'qubo_value', sorted by increasing energy and then
+                  decreasing probability
+        """
+        if shots is None:
+            if self.diff_method != "numpy":
+                raise ValueError("Top-k without shots requires the numpy diff_method")
+            probs = self.simulator.probabilities(params)
+            k_exact = min(k, probs.size)
+            indices = np.argpartition(-probs, k_exact - 1)[:k_exact]
+            shifts = np.arange(self.n_qubits - 1, -1, -1)
+            candidates = ((indices[:, None] >> shifts) & 1).astype(np.uint8)
+            frequencies = probs[indices]
+        else:
+            counts = Distribution.from_samples(self.sample(params, shots, seed))
+            candidates, frequencies = counts.bits(), counts.probabilities()
+
+        energies = self.ising.energies(candidates)
+        order = np.lexsort((-frequencies, energies))[:k]
+
+        return [{
+            'bitstring': ''.join(map(str, candidates[i])),
+            'probability': float(frequencies[i]),
+            'energy': float(energies[i]),
+            'qubo_value': float(energies[i] + self.ising.offset)
+        } for i in order]
+
+    def solve(self, params=None, log_every=None, top_k=None, shots=None):
+        """
+        Optimize the angles and extract the most likely solution.
+
+        With ``top_k``, the probabilities of all basis states are not returned and the
+        best solution is taken from ``top_solutions`` instead, which scales to registers
+        where listing all 2**n_qubits states is impractical.
+
+        Args:
+            params (numpy.ndarray, optional): Initial angles of shape (depth, 2)
+            log_every (int, optional): Print the cost every this many steps. Defaults to None.
+            top_k (int, optional): Number of lowest-energy solutions to extract. Defaults to None.
+            shots (int, optional): Number of samples for ``top_solutions``. Defaults to None.
+
+        Returns:
+            dict: The optimized 'params', the 'cost_history', the 'probs' of all basis
+                  states (or the 'top_solutions' with ``top_k``), the 'best_solution'
+                  bitstring, its 'probability', its cost Hamiltonian 'energy' and its
+                  'qubo_value' x^T Q x
+        """
+        params, costs = self.optimize(params, log_every=log_every)
+
+        if top_k is not None:
+            solutions = self.top_solutions(params, k=top_k, shots=shots)
+            return {
+                'params': params,
+                'cost_history': costs,
+                'top_solutions': solutions,
+                'best_solution': solutions[0]['bitstring'],
+                'probability': solutions[0]['probability'],
+                'energy': solutions[0]['energy'],
+                'qubo_value': solutions[0]['qubo_value']
+            }
+
+        probs = self.probabilities(params)
+
+        most_likely = int(np.argmax(probs))
+        best_solution = format(most_likely, f'0{self.n_qubits}b')
+        energy = self.ising.energies(bitstrings_to_array([best_solution]))
+
+        return {
+            'params': params,
+            'cost_history': costs,
+            'probs': probs,
+            'best_solution': best_solution,
+            'probability': float(probs[most_likely]),
+            'energy': float(energy[0]),
+            'qubo_value': float(energy[0] + self.ising.offset)
+        }
+
+    def solve_multistart(self, n_starts=8, strategy="random", max_workers=None, seed=None,
+                         base_params=None, patience=20, tol=1e-6):
+        """
+        Run independent optimizations from several initial angles in parallel.
+
+        Each start runs in a worker of a process pool, and every worker builds its own
+        solver and device once and reuses it for all the starts it runs.
+
+        Args:
+            n_starts (int, optional): Number of independent optimizations. Defaults to 8.
+            strategy (str, optional): Initialization strategy, see ``initial_params``.
+                                      Defaults to "random".
+            max_workers (int, optional): Number of worker processes. Defaults to the CPU count.
+            seed (int, optional): Seed for the initial angles. Defaults to None.
+            base_params (numpy.ndarray, optional): Lower-depth angles for the "interp" strategy
+            patience (int, optional): Early-stopping patience in steps, or None to run all
+                                      steps. Defaults to 20.
+            tol (float, optional): Minimum improvement for early stopping. Defaults to 1e-6.
+
+        Returns:
+            dict: The best 'params' and their final 'cost', the index of the 'best_start',
+                  and per start the 'initial_params' and the 'traces' of costs per step
+        """
+        rng = np.random.default_rng(seed)
+        starts = [initial_params(self.depth, strategy, rng, base_params) for _ in range(n_starts)]
+
+        device = self._device if isinstance(self._device, str) else getattr(self._device, "name", "default.qubit")
+        solver_args = (self.Q, self.depth, self.steps, self._optimizer, device, self.diff_method)
+
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                 initargs=solver_args) as executor:
+            runs = list(executor.map(_optimize_start, [(start, patience, tol) for start in starts]))
+
+        final_costs = [self.cost(params) for params, _ in runs]
+        best = int(np.argmin(final_costs))
+
+        return {
+            'params': runs[best][0],
+            'cost': final_costs[best],
+            'best_start': best,
+            'initial_params': starts,
+            'traces': [costs for _, costs in runs]
+        }
+
+    def _with_depth(self, depth):
+        """
+        Copy the solver with a different number of layers.
+
+        The copy shares the Ising model and, once built, the simulator energies. It gets
+        its own copy of the optimizer with any accumulated state, such as Adam's moments,
+        reset, since that state has the shape of the old angles.
+
+        Args:
+            depth (int): Number of QAOA layers
+
+        Returns:
+            QAOASolver: The solver for the given depth
+        """
+        solver = copy.copy(self)
+        solver.depth = depth
+        solver._qnodes = None
+        if self._optimizer is not None:
+            solver._optimizer = copy.deepcopy(self._optimizer)
+            if hasattr(solver._optimizer, "reset"):
+                solver._optimizer.reset()
+        if self._simulator is not None:
+            solver._simulator = copy.copy(self._simulator)
+            solver._simulator.depth = depth
+        return solver
+
+    def solve_layerwise(self, store=None, patience=20, tol=1e-6, log_every=None):
+        """
+        Optimize the angles layer by layer up to ``depth``.
+
+        Depth 1 is optimized first, and each depth p + 1 starts from the INTERP extension
+        of the optimized depth-p angles, so every layer starts close to its optimum and
+        stops early. With a ``ParameterStore``, angles of a similar stored instance are
+        used instead: at full depth if available, which skips the schedule altogether,
+        otherwise for depth 1. The optimized angles of every depth are added to the store.
+
+        Args:
+            store (ParameterStore, optional): Store of previously optimized angles
+            patience (int, optional): Early-stopping patience in steps per layer. Defaults to 20.
+            tol (float, optional): Minimum improvement for early stopping. Defaults to 1e-6.
+            log_every (int, optional): Print the cost every this many steps. Defaults to None.
+
+        Returns:
+            dict: The optimized 'params' and their final 'cost', the concatenated
+                  'cost_history', the final cost of each depth in 'layer_costs', the total
+                  number of optimizer 'steps' and whether the angles were 'transferred'
+        """
+        transferred = store.lookup(self.Q, self.depth) if store is not None else None
+        if transferred is not None:
+            schedule = [(self.depth, transferred)]
+        else:
+            start = store.lookup(self.Q, 1) if store is not None else None
+            schedule = [(1, start)] + [(p, None) for p in range(2, self.depth + 1)]
+
+        history = []
+        layer_costs = {}
+        params = None
+        for depth, start in schedule:
+            if start is None and params is not None:
+                start = interpolate_params(params)
+
+            solver = self._with_depth(depth)
+            params, costs = solver.optimize(start, log_every=log_every, patience=patience, tol=tol)
+            history.extend(costs)
+            layer_costs[depth] = solver.cost(params)
+
+            if store is not None:
+                store.add(self.Q, params, layer_costs[depth])
+
+        return {
+            'params': params,
+            'cost': layer_costs[self.depth],
+            'cost_history': history,
+            'layer_costs': layer_costs,
+            'steps': len(history),
+            'transferred': transferred is not None
+        }
+
+# Solver of the current worker process, built once by _init_worker
+_worker_solver = None
+
+def _init_worker(Q, depth, steps, optimizer, device, diff_method):
+    """
+    Build the solver used by a multi-start worker process.
+    """
+    global _worker_solver
+    _worker_solver = QAOASolver(Q, depth, steps, optimizer=optimizer, device=device,
+                                diff_method=diff_method)
 
-def circuit(params, **kwargs):
+def _optimize_start(args):
     """
-    Construct the full QAOA circuit with the specified parameters.
-    
+    Run one multi-start optimization in a worker process.
+
     Args:
-        params (list): List containing gamma and alpha parameters for each layer
-        **kwargs: Additional keyword arguments
+        args (tuple): (initial params, patience, tol)
+
+    Returns:
+        tuple: (optimized params, list of the cost at each step)
     """
-    for w in wires:
-        qml.Hadamard(wires=w)
-    for d in range(depth):
-        qaoa_layer(params[d, 0], params[d, 1])
+    params, patience, tol = args
+    return _worker_solver.optimize(params, patience=patience, tol=tol)
 
-# Define device
-dev = qml.device("default.qubit", wires=n_qubits)
+def visualize_results(probs, n_qubits, save_path=None, show=True, energies=None):
+    """
+    Visualize the output distribution from the QAOA algorithm.
+
+    Only the most likely basis states get their own bar, so the plot stays readable
+    and cheap to render for any number of qubits.
+
+    Args:
+        probs (numpy.ndarray): Probabilities of computational basis states
+        n_qubits (int): Number of qubits
+        save_path (str, optional): Path to save the plot. Defaults to None.
+        show (bool, optional): Whether to display the plot. Defaults to True.
+        energies (numpy.ndarray, optional): Energy of every basis state, to add a panel of
+                                            the probability per energy level. Defaults to None.
+    """
+    render_distribution(Distribution.from_probabilities(probs), save_path,
+                        title=f"QAOA Output Distribution for {n_qubits}x{n_qubits} Q Matrix",
+                        energies=energies, show=show)
 
-@qml.qnode(dev)
-def cost_fn(params):
+def bitstrings_to_array(solutions):
     """
-    Quantum node that evaluates the cost function for given parameters.
-    
+    Convert bitstrings such as '0101' to a 0/1 array.
+
     Args:
-        params (list): List containing gamma and alpha parameters
-        
+        solutions (list): Bitstrings of equal length
+
     Returns:
-        float: Expected value of the cost Hamiltonian
+        numpy.ndarray: uint8 array of shape (len(solutions), n_qubits)
     """
-    circuit(params)
-    return qml.expval(cost_h)
+    n_qubits = len(solutions[0]) if solutions else 0
+    characters = np.frombuffer(''.join(solutions).encode(), dtype=np.uint8)
+    return (characters - ord('0')).reshape(len(solutions), n_qubits)
 
-# Optimize
-opt = qml.GradientDescentOptimizer()
-steps = 300
-params = np.array([[0.5, 0.5] for _ in range(depth)], requires_grad=True)
+def calculate_solution_energies(solutions, Q, packed=False):
+    """
+    Calculate the energies of many solutions at once.
+
+    The energies are the eigenvalues of the cost Hamiltonian minimized by the solver,
+    i.e. the Ising energies without the constant offset, so they are on the same scale
+    as the optimized cost. Adding the offset gives the QUBO values x^T Q x.
 
-print("\nOptimizing parameters...")
-for i in range(steps):
-    params = opt.step(cost_fn, params)
-    if i % 10 == 0:
-        print(f"Step {i}: Cost = {cost_fn(params):.6f}")
+    Args:
+        solutions: Bitstrings, a 0/1 array of shape (n_samples, n_qubits), or bit-packed
+                   rows as produced by ``numpy.packbits(..., axis=1)``
+        Q (numpy.ndarray): The QUBO matrix
+        packed (bool, optional): Whether the rows are bit-packed. Defaults to False.
 
-print("\nOptimal Parameters:")
-print(params)
+    Returns:
+        tuple: (cost Hamiltonian energies, QUBO values), arrays of length n_samples
+    """
+    if isinstance(solutions, (list, tuple)) and solutions and isinstance(solutions[0], str):
+        solutions = bitstrings_to_array(solutions)
 
-@qml.qnode(dev)
-def prob_circuit(params):
-    circuit(params)
-    return qml.probs(wires=wires)
+    ising = qubo_to_ising(Q)
+    energies = ising.energies(solutions, packed=packed)
+    return energies, energies + ising.offset
 
-probs = prob_circuit(params)
-def prob_circuit(gamma, alpha):
+def calculate_solution_energy(binary_solution, Q):
     """
-    Quantum node that returns the probabilities of all computational basis states.
-    
+    Calculate the cost Hamiltonian energy of a single solution.
+
     Args:
-        gamma (list): Gamma parameters for each QAOA layer
-        alpha (list): Alpha parameters for each QAOA layer
-        
+        binary_solution (str): Binary representation of the solution
+        Q (numpy.ndarray): The QUBO matrix
+
     Returns:
-        numpy.ndarray: Probabilities of all computational basis states
+        float: Energy value of the solution
     """
-    circuit([gamma, alpha])
-    return qml.probs(wires=wires)
-
-# Get final probabilities
-probs = prob_circuit(params[0], params[1])
+    energies, _ = calculate_solution_energies([binary_solution], Q)
+    return float(energies[0])
 
-def visualize_results(probs):
+def export_probabilities(probs, n_qubits, csv_filename):
     """
-    Visualize the output distribution from the QAOA algorithm.
-    
+    Write the probability of every basis state to a CSV file.
+
     Args:
         probs (numpy.ndarray): Probabilities of computational basis states
+        n_qubits (int): Number of qubits
+        csv_filename (str): Path of the CSV file
     """
-    plt.style.use("seaborn-v0_8") if "seaborn-v0_8" in plt.style.available else plt.style.use("default")
-    plt.figure(figsize=(10, 6))
-    plt.bar(range(2 ** n_qubits), probs)
-    plt.xlabel("Bitstring (decimal)")
-    plt.ylabel("Probability")
-    plt.title(f"QAOA Output Distribution for {n_qubits}x{n_qubits} Q Matrix")
-    plt.xticks(range(2 ** n_qubits))
-    plt.savefig(f"qaoa_output_N{N}.png")
-    plt.show()
+    distribution = Distribution.from_probabilities(probs)
 
-# Plot results
-visualize_results(probs)
+    with open(csv_filename, mode='w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(["Binary Value", "Probability"])  # Write header
+        writer.writerows(distribution.items())  # Write the rows
 
-# Find the most likely solution
-most_likely_bitstring = np.argmax(probs)
-binary_solution = format(most_likely_bitstring, f'0{n_qubits}b')
-print(f"\nMost likely solution: |{binary_solution}⟩ with probability {probs[most_likely_bitstring]:.4f}")
-
-def calculate_solution_energy(binary_solution):
+def export_top_solutions(solutions, csv_filename):
     """
-    Calculate the energy of a given solution.
-    
+    Write the solutions returned by ``QAOASolver.top_solutions`` to a CSV file.
+
     Args:
-        binary_solution (str): Binary representation of the solution
-        
-    Returns:
-        float: Energy value of the solution
+        solutions (list): Dicts with 'bitstring', 'probability', 'energy' and 'qubo_value'
+        csv_filename (str): Path of the CSV file
     """
-    solution_energy = 0
-    for i in range(n_qubits):
-        bit_i = int(binary_solution[i])
-        # Convert bit from 0/1 to +1/-1 for Ising model
-        spin_i = 1 - 2 * bit_i
-        solution_energy += Q[i, i] * spin_i
-        for j in range(i + 1, n_qubits):
-            bit_j = int(binary_solution[j])
-            spin_j = 1 - 2 * bit_j
-            solution_energy += Q[i, j] * spin_i * spin_j
-            
-    return solution_energy
-
-# Calculate the energy of the solution
-solution_energy = calculate_solution_energy(binary_solution)
-print(f"Energy of the solution: {solution_energy}")
-
-data = [(format(i, f"0{n_qubits}b"), prob) for i, prob in enumerate(probs)]
-
-# Define the file name
-csv_filename = f"qaoa_output_N{N}.csv"
-
-# Write the data to a CSV file
-with open(csv_filename, mode='w', newline='') as file:
-    writer = csv.writer(file)
-    writer.writerow(["Binary Value", "Probability"])  # Write header
-    writer.writerows(data)  # Write the rows
-
-print(f"CSV file saved as {csv_filename}")
-
-
-# Show how to use different N values
-print("\nTo use a different matrix size, change the N value at the top of the script.")
-print("Examples:")
-print("- For 4x4 matrix: N = 4")
-print("- For 5x5 matrix: N = 5")
-print("- For larger matrices, you may need to increase computation resources.") 
\ No newline at end of file
+    with open(csv_filename, mode='w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(["Binary Value", "Probability", "Energy", "QUBO Value"])
+        writer.writerows((s['bitstring'], s['probability'], s['energy'], s['qubo_value'])
+                         for s in solutions)
+
+if __name__ == "__main__":
+    # Use a generated N x N matrix if N is given, otherwise the example matrix
+    if len(sys.argv) > 1:
+        N = int(sys.argv[1])
+        Q = create_q_matrix(N)
+    else:
+        Q = EXAMPLE_Q
+    n_qubits = Q.shape[0]
+
+    print("Q matrix:")
+    print(Q)
+
+    solver = QAOASolver(Q, depth=2, steps=300)
+    print("\nCost Hamiltonian:")
+    print(solver.ising.to_hamiltonian())
+    print(f"Constant offset: {solver.ising.offset}")
+
+    # Beyond this size, report only the best sampled solutions instead of all basis states
+    dense_output = n_qubits <= MAX_DENSE_QUBITS
+
+    print("\nOptimizing parameters...")
+    if dense_output:
+        result = solver.solve(log_every=10)
+    else:
+        result = solver.solve(log_every=10, top_k=TOP_K, shots=TOP_K_SHOTS)
+
+    print("\nOptimal Parameters:")
+    print(result['params'])
+
+    if dense_output:
+        # Plot results
+        distribution = Distribution.from_probabilities(result['probs'])
+        visualize_results(result['probs'], n_qubits, save_path=f"qaoa_output_N{n_qubits}.png",
+                          energies=solver.ising.energies(distribution.bits()))
+        print(f"\nMost likely solution: |{result['best_solution']}⟩ with probability {result['probability']:.4f}")
+    else:
+        print(f"\nBest sampled solution: |{result['best_solution']}⟩ with estimated probability {result['probability']:.4f}")
+    print(f"Energy of the solution: {result['energy']} (QUBO value {result['qubo_value']})")
+
+    csv_filename = f"qaoa_output_N{n_qubits}.csv"
+    if dense_output:
+        export_probabilities(result['probs'], n_qubits, csv_filename)
+    else:
+        export_top_solutions(result['top_solutions'], csv_filename)
+    print(f"CSV file saved as {csv_filename}")
+
+    # Show how to use different N values
+    print("\nTo use a generated N x N matrix, pass N on the command line.")
+    print("Examples:")
+    print("- For 4x4 matrix: python implementingQAOA_N_by_N.py 4")
+    print("- For 5x5 matrix: python implementingQAOA_N_by_N.py 5")
+    print("- For larger matrices, you may need to increase computation resources.")
@@ -0,0 +1,453 @@
+"""
+Instance Generator Module
+
+This module samples random sparse Max-XORSAT instances for DQI and keeps the ones
+that pass a filter on their structure. It generalizes the notebook helper
+``random_binary_matrix_one_or_two_ones_unique``: every constraint touches a few
+variables drawn from a row weight profile, no two constraints are equal, and no
+variable appears in more than a given number of constraints.
+
+Candidates are sampled a whole batch at a time, and a candidate is rejected as soon
+as one check fails, cheapest first:
+
+- a codeword lighter than the required distance among few columns of H, tested for
+  the whole batch at once by XORing all small combinations of bit-packed columns
+- the rank of the parity check matrix H
+- the minimum distance of its kernel, computed only up to the required value
+- the number of optimal assignments of the Max-XORSAT instance, by exhaustive search
+
+Candidates are generated and filtered in batches on a process pool. Every batch
+draws from its own child of one ``numpy.random.SeedSequence``, and batches are
+collected in submission order, so a seed reproduces the same instances for any
+number of workers. Accepted instances are appended to a binary file of fixed-size
+records holding the bit-packed matrix and its statistics.
+
+Example:
+    To generate 1000 instances with 9 variables and 15 constraints of distance 4:
+
+    ```python
+    generator = InstanceGenerator(9, 15, row_weights=(1, 2), min_distance=4)
+    instances = generator.generate(1000, path='outputs/instances.bin', seed=7)
+    H = instances[0]['parity_check_matrix']
+    ```
+"""
+
+import json
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+from math import comb
+
+import numpy as np
+
+from classical_max_xorsat import ClassicalMaxXORSAT
+from code_distance import COMBINATION_CHUNK, minimum_distance
+from gf2 import BitMatrix, pack_bits, unpack_bits
+
+# Candidates sampled per worker task
+BATCH_SIZE = 1024
+
+# Default candidate budget per requested instance, after which generation gives up
+CANDIDATES_PER_INSTANCE = 100_000
+
+
+class InstanceGenerator:
+    """
+    Sampler and filter of sparse Max-XORSAT instances.
+
+    The parity check matrix H has one row per variable and one column per
+    constraint, as in ``DQIMaxXORSAT``; the sampled constraint rows are therefore
+    the columns of H.
+
+    Attributes:
+        n_variables (int): Number of variables (rows of H)
+        n_constraints (int): Number of constraints (columns of H)
+        row_weights (tuple): Allowed numbers of variables per constraint
+        max_column_weight (int): Largest number of constraints per variable, or None
+        min_rank (int): Smallest accepted rank of H, or None
+        min_distance (int): Smallest accepted minimum distance of the kernel of H, or None
+        min_optimal (int): Smallest accepted number of optimal assignments, or None
+        max_optimal (int): Largest accepted number of optimal assignments, or None
+        phase_vector (numpy.ndarray): Right-hand side of the constraints
+    """
+
+    def __init__(self, n_variables, n_constraints, row_weights=(1, 2), max_column_weight=None,
+                 min_rank=None, min_distance=None, min_optimal=None, max_optimal=None,
+                 phase_vector=None, exhaustive_limit=24):
+        """
+        Initialize the generator.
+
+        Args:
+            n_variables (int): Number of variables
+            n_constraints (int): Number of constraints
+            row_weights (tuple, optional): Numbers of variables per constraint, drawn uniformly.
+                                           Defaults to (1, 2) as in the notebook.
+            max_column_weight (int, optional): Largest number of constraints per variable.
+                                               Defaults to None (unbounded).
+            min_rank (int, optional): Smallest accepted rank. Defaults to None.
+            min_distance (int, optional): Smallest accepted distance. Defaults to None.
+            min_optimal (int, optional): Smallest accepted number of optima. Defaults to None.
+            max_optimal (int, optional): Largest accepted number of optima. Defaults to None.
+            phase_vector (list, optional): Right-hand side, positive entries mean 1.
+                                           Defaults to all ones, as in ``DQIMaxXORSAT``.
+            exhaustive_limit (int, optional): Largest number of variables for which the
+                                              optima are counted. Defaults to 24.
+        """
+        self.n_variables = n_variables
+        self.n_constraints = n_constraints
+        self.row_weights = tuple(sorted(set(row_weights)))
+        self.max_column_weight = max_column_weight
+        self.min_rank = min_rank
+        self.min_distance = min_distance
+        self.min_optimal = min_optimal
+        self.max_optimal = max_optimal
+        self.phase_vector = np.ones(n_constraints) if phase_vector is None else np.asarray(phase_vector)
+
+        if not self.row_weights or self.row_weights[0] < 1 or self.row_weights[-1] > n_variables:
+            raise ValueError(f"Row weights must lie between 1 and {n_variables}")
+        if max_column_weight is not None and max_column_weight * n_variables < n_constraints * self.row_weights[0]:
+            raise ValueError("The column weight bound leaves too few entries for the constraints")
+        if (min_optimal is not None or max_optimal is not None) and n_variables > exhaustive_limit:
+            raise ValueError(f"Counting optima needs at most {exhaustive_limit} variables")
+
+    def sample_batch(self, rng, batch_size, max_attempts=100):
+        """
+        Draw parity check matrices with distinct sparse constraints.
+
+        Constraint j of all matrices is drawn at once over the variables whose column
+        weight is still below the bound, and the matrices where it repeats an earlier
+        constraint draw it again. Matrices where no new constraint fits are dropped.
+
+        Args:
+            rng (numpy.random.Generator): Random generator
+            batch_size (int): Number of matrices drawn
+            max_attempts (int, optional): Draws per constraint before a matrix is dropped.
+                                          Defaults to 100.
+
+        Returns:
+            numpy.ndarray: uint8 array of shape (n_sampled, n_variables, n_constraints)
+                           with n_sampled <= batch_size
+        """
+        H = np.zeros((batch_size, self.n_variables, self.n_constraints), dtype=np.uint8)
+        columns = np.zeros((batch_size, self.n_constraints, max(1, -(-self.n_variables // 64))), dtype=np.uint64)
+        column_weights = np.zeros((batch_size, self.n_variables), dtype=np.int64)
+        alive = np.ones(batch_size, dtype=bool)
+        weights = np.array(self.row_weights)
+
+        for j in range(self.n_constraints):
+            todo = np.flatnonzero(alive)
+            for _ in range(max_attempts):
+                if todo.size == 0:
+                    break
+
+                # The w smallest random keys among the available variables form the support
+                w = rng.choice(weights, size=todo.size)
+                keys = rng.random((todo.size, self.n_variables))
+                if self.max_column_weight is not None:
+                    keys[column_weights[todo] >= self.max_column_weight] = np.inf
+                kth = np.take_along_axis(np.sort(keys, axis=1), w[:, None] - 1, axis=1)
+                support = keys <= kth
+                fits = np.isfinite(kth[:, 0])
+                alive[todo[~fits]] = False
+                todo, support = todo[fits], support[fits]
+
+                packed = pack_bits(support)
+                repeated = np.all(columns[todo, :j] == packed[:, None], axis=2).any(axis=1)
+                new = todo[~repeated]
+                H[new, :, j] = support[~repeated]
+                columns[new, j] = packed[~repeated]
+                column_weights[new] += support[~repeated]
+                todo = todo[repeated]
+            alive[todo] = False
+
+        return H[alive]
+
+    def _light_codewords(self, H):
+        """
+        Find the matrices with a codeword lighter than ``min_distance``, vectorized over
+        the batch by XORing every combination of up to min_distance - 1 packed columns.
+
+        Weights with more than COMBINATION_CHUNK combinations are left to the exact check.
+
+        Args:
+            H (numpy.ndarray): uint8 array of shape (n_matrices, n_variables, n_constraints)
+
+        Returns:
+            numpy.ndarray: Boolean mask of the matrices known to have a light codeword
+        """
+        light = np.zeros(H.shape[0], dtype=bool)
+        if self.min_distance is None:
+            return light
+
+        columns = pack_bits(np.swapaxes(H, 1, 2))
+        for w in range(1, min(self.min_distance, self.n_constraints + 1)):
+            if comb(self.n_constraints, w) > COMBINATION_CHUNK:
+                break
+            combos = np.array(list(combinations(range(self.n_constraints), w)), dtype=np.int64)
+            sums = np.bitwise_xor.reduce(columns[:, combos], axis=2)
+            light |= np.all(sums == 0, axis=2).any(axis=1)
+        return light
+
+    def evaluate(self, H):
+        """
+        Check a parity check matrix against the filter.
+
+        Args:
+            H (numpy.ndarray): Parity check matrix of shape (n_variables, n_constraints)
+
+        Returns:
+            dict: The 'rank', 'distance' (-1 for a trivial kernel, and capped at
+                  ``min_distance`` when it is known to be at least that), 'optimum' and
+                  'n_optimal' (-1 when not counted), or None if the matrix is rejected
+        """
+        rank = BitMatrix.from_dense(H).rank()
+        if self.min_rank is not None and rank < self.min_rank:
+            return None
+
+        distance = -1
+        if self.min_distance is not None:
+            distance = minimum_distance(H, target=self.min_distance)
+            if distance is not None and distance < self.min_distance:
+                return None
+            distance = -1 if distance is None else distance
+
+        optimum, n_optimal = -1, -1
+        if self.min_optimal is not None or self.max_optimal is not None:
+            search = ClassicalMaxXORSAT(H, self.phase_vector).exhaustive_search(max_solutions=0)
+            optimum, n_optimal = search['satisfied'], search['n_optimal']
+            if self.min_optimal is not None and n_optimal < self.min_optimal:
+                return None
+            if self.max_optimal is not None and n_optimal > self.max_optimal:
+                return None
+
+        return {'rank': rank, 'distance': distance, 'optimum': optimum, 'n_optimal': n_optimal}
+
+    def generate_batch(self, seed, batch_size=BATCH_SIZE):
+        """
+        Sample and filter one batch of candidates.
+
+        Args:
+            seed: Seed or ``numpy.random.SeedSequence`` of the batch
+            batch_size (int, optional): Number of candidates. Defaults to BATCH_SIZE.
+
+        Returns:
+            list: Accepted (parity check matrix, statistics) pairs in sampling order
+        """
+        rng = np.random.default_rng(seed)
+        candidates = self.sample_batch(rng, batch_size)
+        accepted = []
+        for H in candidates[~self._light_codewords(candidates)]:
+            stats = self.evaluate(H)
+            if stats is not None:
+                accepted.append((H, stats))
+        return accepted
+
+    def generate(self, n_instances, path=None, max_workers=None, seed=None,
+                 batch_size=BATCH_SIZE, max_candidates=None):
+        """
+        Generate accepted instances on a process pool.
+
+        Args:
+            n_instances (int): Number of accepted instances wanted
+            path (str, optional): Binary file the instances are appended to as they arrive.
+                                  Defaults to None (keep them in memory only).
+            max_workers (int, optional): Number of worker processes. Defaults to the CPU count.
+            seed (int, optional): Root seed; batch i draws from child i of its SeedSequence.
+                                  Defaults to None.
+            batch_size (int, optional): Candidates per task. Defaults to BATCH_SIZE.
+            max_candidates (int, optional): Candidate budget. Defaults to
+                                            CANDIDATES_PER_INSTANCE per requested instance.
+
+        Returns:
+            list: Dicts with the 'parity_check_matrix' and its statistics, in generation order
+
+        Raises:
+            RuntimeError: If the budget runs out before ``n_instances`` are accepted; the
+                          accepted instances are still written to ``path``
+        """
+        root = np.random.SeedSequence(seed)
+        max_workers = max_workers or os.cpu_count() or 1
+        if max_candidates is None:
+            max_candidates = CANDIDATES_PER_INSTANCE * n_instances
+        instances = []
+        candidates = 0
+
+        writer = InstanceWriter(path, self.n_variables, self.n_constraints, self._settings(seed)) if path else None
+        try:
+            with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                     initargs=(self,)) as executor:
+                pending = deque()
+
+                def submit():
+                    # The last batch is cut to what is left of the budget
+                    size = min(batch_size, max_candidates - candidates - sum(size for _, size in pending))
+                    if size > 0:
+                        pending.append((executor.submit(_generate_batch, (root.spawn(1)[0], size)), size))
+
+                for _ in range(2 * max_workers):
+                    submit()
+
+                # Batches are consumed in submission order, which keeps the output reproducible
+                while pending and len(instances) < n_instances:
+                    future, size = pending.popleft()
+                    batch = future.result()
+                    candidates += size
+                    for H, stats in batch[:n_instances - len(instances)]:
+                        instances.append({'parity_check_matrix': H, **stats})
+                        if writer is not None:
+                            writer.append(H, stats)
+
+                    submit()
+
+                for future, _ in pending:
+                    future.cancel()
+        finally:
+            if writer is not None:
+                writer.close()
+
+        if len(instances) < n_instances:
+            raise RuntimeError(f"Accepted {len(instances)} of {n_instances} instances in {candidates} "
+                               f"candidates; relax the filters or raise max_candidates")
+        return instances
+
+    def _settings(self, seed):
+        """
+        Describe the generator for the metadata of an instance file.
+
+        Args:
+            seed (int): Root seed of the run
+
+        Returns:
+            dict: JSON-serializable settings
+        """
+        return {
+            'row_weights': list(self.row_weights),
+            'max_column_weight': self.max_column_weight,
+            'min_rank': self.min_rank,
+            'min_distance': self.min_distance,
+            'min_optimal': self.min_optimal,
+            'max_optimal': self.max_optimal,
+            'phase_vector': np.asarray(self.phase_vector).tolist(),
+            'seed': seed
+        }
+
+
+def _record_dtype(n_variables, n_constraints):
+    """
+    Record layout of an instance file: the packed rows of H and its statistics.
+
+    Args:
+        n_variables (int): Number of rows of H
+        n_constraints (int): Number of columns of H
+
+    Returns:
+        numpy.dtype: Structured dtype of one record
+    """
+    n_words = max(1, -(-n_constraints // 64))
+    return np.dtype([('matrix', '<u8', (n_variables, n_words)), ('rank', '<i4'),
+                     ('distance', '<i4'), ('optimum', '<i4'), ('n_optimal', '<i8')])
+
+
+class InstanceWriter:
+    """
+    Appends instances to a binary file of fixed-size records.
+
+    The shape, record count and generator settings are kept in ``<path>.json``,
+    which ``load_instances`` needs to read the records back.
+
+    Attributes:
+        path (str): Path of the record file
+        count (int): Number of records written
+    """
+
+    def __init__(self, path, n_variables, n_constraints, settings=None):
+        """
+        Open the record file, truncating it.
+
+        Args:
+            path (str): Path of the record file
+            n_variables (int): Number of rows of H
+            n_constraints (int): Number of columns of H
+            settings (dict, optional): Generator settings stored with the metadata
+        """
+        self.path = path
+        self.count = 0
+        self._dtype = _record_dtype(n_variables, n_constraints)
+        self._metadata = {'n_variables': n_variables, 'n_constraints': n_constraints,
+                          'settings': settings or {}}
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(path, 'wb')
+
+    def append(self, H, stats):
+        """
+        Write one instance.
+
+        Args:
+            H (numpy.ndarray): Parity check matrix
+            stats (dict): Its 'rank', 'distance', 'optimum' and 'n_optimal'
+        """
+        record = np.zeros(1, dtype=self._dtype)
+        record['matrix'] = BitMatrix.from_dense(H).words
+        for field in ('rank', 'distance', 'optimum', 'n_optimal'):
+            record[field] = stats[field]
+        record.tofile(self._file)
+        self.count += 1
+
+    def close(self):
+        """
+        Flush the records and write the metadata.
+        """
+        self._file.close()
+        with open(self.path + '.json', 'w') as f:
+            json.dump({**self._metadata, 'count': self.count}, f, indent=2)
+
+
+def load_instances(path):
+    """
+    Read the instances of a record file written by ``InstanceWriter``.
+
+    Args:
+        path (str): Path of the record file
+
+    Returns:
+        list: Dicts with the 'parity_check_matrix' and its statistics
+    """
+    with open(path + '.json') as f:
+        metadata = json.load(f)
+    n_variables, n_constraints = metadata['n_variables'], metadata['n_constraints']
+
+    records = np.fromfile(path, dtype=_record_dtype(n_variables, n_constraints))
+    return [
+        {'parity_check_matrix': unpack_bits(record['matrix'], n_constraints),
+         'rank': int(record['rank']), 'distance': int(record['distance']),
+         'optimum': int(record['optimum']), 'n_optimal': int(record['n_optimal'])}
+        for record in records
+    ]
+
+
+# Generator of the current worker process, set once by _init_worker
+_worker_generator = None
+
+def _init_worker(generator):
+    """
+    Store the generator used by an instance worker process.
+    """
+    global _worker_generator
+    _worker_generator = generator
+
+def _generate_batch(args):
+    """
+    Generate one batch of instances in a worker process.
+
+    Args:
+        args (tuple): (seed sequence, batch size)
+
+    Returns:
+        list: Accepted (parity check matrix, statistics) pairs
+    """
+    seed, batch_size = args
+    return _worker_generator.generate_batch(seed, batch_size)
@@ -0,0 +1,165 @@
+"""
+Plotting Module
+
+This module draws result histograms whose rendering cost does not depend on the
+size of the state space. A distribution is reduced with NumPy before anything
+reaches matplotlib:
+
+- the k most likely states become one bar each, and the rest of the probability
+  mass one "other" bar, found with ``argpartition`` in linear time
+- with the energy of every state, a second panel shows the probability mass per
+  energy level, binned into at most ``MAX_LEVELS`` bars
+
+Figures are drawn on a ``matplotlib.figure.Figure`` with the Agg canvas, so saving
+a plot works headless and never touches pyplot; pyplot is only imported when a
+plot is shown.
+
+Example:
+    To plot the QAOA output of a large register:
+
+    ```python
+    distribution = Distribution.from_probabilities(probs)
+    render_distribution(distribution, 'qaoa.png', energies=solver.ising.energies(distribution.bits()))
+    ```
+"""
+
+import numpy as np
+
+from distribution import Distribution
+
+# Bars drawn for the most likely states, not counting "other"
+MAX_BARS = 32
+
+# Bars of the energy level panel
+MAX_LEVELS = 64
+
+
+def top_k_bars(distribution, k=MAX_BARS):
+    """
+    Reduce a distribution to its k most likely states and the remaining mass.
+
+    Args:
+        distribution (Distribution): The distribution
+        k (int, optional): Number of states with their own bar. Defaults to MAX_BARS.
+
+    Returns:
+        tuple: (labels, probabilities) with the bitstrings of the k most likely states,
+               largest first, followed by "other" if any probability mass remains
+    """
+    top = distribution.top_k(k)
+    probabilities = top.weights / distribution.total() if distribution.total() else top.weights.astype(float)
+    labels = top.bitstrings()
+
+    other = len(distribution) - len(top)
+    if other:
+        labels.append(f"other ({other})")
+        probabilities = np.append(probabilities, max(0.0, 1.0 - probabilities.sum()))
+    return labels, probabilities
+
+
+def energy_levels(distribution, energies, max_levels=MAX_LEVELS):
+    """
+    Sum the probability of the states with the same energy.
+
+    Args:
+        distribution (Distribution): The distribution
+        energies (numpy.ndarray): Energy of every state of the distribution, in its order
+        max_levels (int, optional): Largest number of levels; beyond it the energies are
+                                    binned into equal-width intervals. Defaults to MAX_LEVELS.
+
+    Returns:
+        tuple: (level energies, or bin centers, probability mass per level)
+    """
+    energies = np.asarray(energies, dtype=np.float64)
+    probabilities = distribution.probabilities()
+
+    levels, inverse = np.unique(energies, return_inverse=True)
+    if levels.size <= max_levels:
+        return levels, np.bincount(inverse.reshape(-1), weights=probabilities, minlength=levels.size)
+
+    mass, edges = np.histogram(energies, bins=max_levels, weights=probabilities)
+    return (edges[:-1] + edges[1:]) / 2, mass
+
+
+def _new_figure(n_panels, show):
+    """
+    Create a figure, managed by pyplot only when it is going to be shown.
+
+    Args:
+        n_panels (int): Number of stacked panels
+        show (bool): Whether the figure will be shown
+
+    Returns:
+        tuple: (figure, list of axes)
+    """
+    size = (10, 6 if n_panels == 1 else 9)
+    if show:
+        import matplotlib.pyplot as plt
+        figure = plt.figure(figsize=size)
+    else:
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+        figure = Figure(figsize=size)
+        FigureCanvasAgg(figure)
+    return figure, [figure.add_subplot(n_panels, 1, i + 1) for i in range(n_panels)]
+
+
+def render_distribution(distribution, save_path=None, title="Solutions", k=MAX_BARS,
+                        energies=None, log=False, show=False, dpi=150):
+    """
+    Plot the most likely states of a distribution, and optionally its energy levels.
+
+    Args:
+        distribution (Distribution or dict): Counts or probabilities
+        save_path (str, optional): Path of the image file. Defaults to None.
+        title (str, optional): Title of the plot. Defaults to "Solutions".
+        k (int, optional): Number of states with their own bar. Defaults to MAX_BARS.
+        energies (numpy.ndarray, optional): Energy of every state, in the distribution's
+                                            order, for the energy level panel. Defaults to None.
+        log (bool, optional): Use a logarithmic probability axis. Defaults to False.
+        show (bool, optional): Display the plot with pyplot. Defaults to False.
+        dpi (int, optional): Resolution of the saved image. Defaults to 150.
+    """
+    if not save_path and not show:
+        raise ValueError("Nothing to do: give a save_path or set show")
+
+    distribution = Distribution.from_dict(distribution)
+    figure, axes = _new_figure(1 if energies is None else 2, show)
+
+    labels, probabilities = top_k_bars(distribution, k)
+    has_other = len(distribution) > k
+    colors = ['tab:blue'] * len(labels)
+    if has_other:
+        colors[-1] = 'tab:gray'
+    axes[0].bar(range(len(labels)), probabilities, color=colors)
+
+    # A dominant "other" bar is clipped and labeled, so the top states stay visible
+    top_max = probabilities[:-1].max() if has_other and k > 0 else None
+    if top_max and probabilities[-1] > 1.5 * top_max and not log:
+        axes[0].set_ylim(0, 1.5 * top_max)
+        axes[0].annotate(f"{probabilities[-1]:.3g}", (len(labels) - 1, 1.45 * top_max),
+                         ha='center', va='top')
+    axes[0].set_xticks(range(len(labels)))
+    axes[0].set_xticklabels(labels, rotation=90 if distribution.n_bits > 8 else 45,
+                            fontsize=8 if distribution.n_bits > 16 else 10)
+    axes[0].set_xlabel('Solutions')
+    axes[0].set_ylabel('Probability')
+    axes[0].set_title(title)
+
+    if energies is not None:
+        levels, mass = energy_levels(distribution, energies)
+        width = np.min(np.diff(levels)) * 0.8 if levels.size > 1 else 0.8
+        axes[1].bar(levels, mass, width=width)
+        axes[1].set_xlabel('Energy')
+        axes[1].set_ylabel('Probability')
+
+    if log:
+        for ax in axes:
+            ax.set_yscale('log')
+
+    figure.tight_layout()
+    if save_path:
+        figure.savefig(save_path, dpi=dpi, bbox_inches='tight')
+    if show:
+        import matplotlib.pyplot as plt
+        plt.show()
@@ -0,0 +1,176 @@
+"""
+QAOA Parameter Transfer Module
+
+This module stores optimized QAOA angles of solved QUBOs so they can warm-start
+similar instances. Optimal angles concentrate for instances of the same size and
+structure, so a new QUBO is matched to the nearest stored instance by its number of
+variables and the density of its nonzero couplings, and the stored angles are used
+as the starting point instead of a fixed or random guess.
+
+The cost angles gamma multiply the energies, so they are rescaled by the ratio of
+the coefficient scales of the stored and the new instance on transfer.
+
+Entries can be persisted to a JSON file, which lets a nightly job reuse the angles
+found for the previous day's instances.
+
+Example:
+    To reuse angles across runs:
+
+    ```python
+    store = ParameterStore('outputs/qaoa_parameters.json')
+    result = QAOASolver(Q, depth=3).solve_layerwise(store=store)
+    store.save()
+    ```
+"""
+
+import json
+import os
+
+import numpy as np
+
+
+def qubo_features(Q):
+    """
+    Compute the features used to match similar QUBOs.
+
+    Args:
+        Q (numpy.ndarray): The QUBO matrix
+
+    Returns:
+        tuple: (n_qubits, density of nonzero off-diagonal pairs, mean absolute coefficient)
+    """
+    Q = np.asarray(Q, dtype=float)
+    n_qubits = Q.shape[0]
+
+    coupled = np.triu((Q + Q.T) != 0, k=1)
+    n_pairs = n_qubits * (n_qubits - 1) // 2
+    density = coupled.sum() / n_pairs if n_pairs else 0.0
+
+    nonzero = Q[Q != 0]
+    scale = float(np.abs(nonzero).mean()) if nonzero.size else 1.0
+
+    return n_qubits, float(density), scale
+
+
+class ParameterStore:
+    """
+    Store of optimized QAOA angles keyed by instance features and depth.
+
+    Attributes:
+        path (str): JSON file the store is loaded from and saved to, or None
+        max_distance (float): Largest feature distance at which angles are transferred,
+                              the relative size difference plus the density difference
+        entries (list): Stored entries, each a dict with 'n_qubits', 'density', 'scale',
+                        'depth', 'params' and 'cost'
+    """
+
+    def __init__(self, path=None, max_distance=0.25):
+        """
+        Initialize the store, loading existing entries from ``path`` if it exists.
+
+        Args:
+            path (str, optional): JSON file for persistence. Defaults to None.
+            max_distance (float, optional): Largest feature distance for a match.
+                                            Defaults to 0.25.
+        """
+        self.path = path
+        self.max_distance = max_distance
+        self.entries = []
+
+        if path and os.path.exists(path):
+            with open(path) as f:
+                self.entries = json.load(f)
+
+    def __len__(self):
+        return len(self.entries)
+
+    @staticmethod
+    def _distance(entry, n_qubits, density):
+        """
+        Distance between a stored entry and the features of a new instance.
+
+        Both terms are fractions between 0 and 1, so they are added without weights:
+        the size difference relative to the larger instance, and the difference of
+        the coupling densities, which are already fractions of all pairs. A distance
+        of 0.25 allows, e.g., 12 qubits for a stored 16-qubit instance of the same
+        density, or the same size with a density differing by 0.25.
+        """
+        size = abs(entry['n_qubits'] - n_qubits) / max(entry['n_qubits'], n_qubits)
+        return size + abs(entry['density'] - density)
+
+    def add(self, Q, params, cost=None):
+        """
+        Store the optimized angles of a QUBO.
+
+        An existing entry with the same features and depth is replaced if the new
+        angles reached a lower cost.
+
+        Args:
+            Q (numpy.ndarray): The QUBO matrix
+            params (numpy.ndarray): Optimized angles of shape (depth, 2)
+            cost (float, optional): Final cost reached by the angles
+        """
+        n_qubits, density, scale = qubo_features(Q)
+        params = np.asarray(params, dtype=float).reshape(-1, 2)
+        entry = {
+            'n_qubits': n_qubits,
+            'density': density,
+            'scale': scale,
+            'depth': params.shape[0],
+            'params': params.tolist(),
+            'cost': None if cost is None else float(cost)
+        }
+
+        for i, other in enumerate(self.entries):
+            if (other['n_qubits'], other['depth']) == (n_qubits, entry['depth']) \
+                    and np.isclose(other['density'], density) and np.isclose(other['scale'], scale):
+                if other['cost'] is None or cost is None or cost < other['cost']:
+                    self.entries[i] = entry
+                return
+
+        self.entries.append(entry)
+
+    def lookup(self, Q, depth):
+        """
+        Find starting angles for a QUBO from the most similar stored instance.
+
+        Args:
+            Q (numpy.ndarray): The QUBO matrix
+            depth (int): Number of QAOA layers
+
+        Returns:
+            numpy.ndarray: Angles of shape (depth, 2), or None if no stored instance of
+                           this depth is within ``max_distance``
+        """
+        n_qubits, density, scale = qubo_features(Q)
+
+        candidates = [e for e in self.entries if e['depth'] == depth]
+        if not candidates:
+            return None
+
+        distances = [self._distance(e, n_qubits, density) for e in candidates]
+        best = int(np.argmin(distances))
+        if distances[best] > self.max_distance:
+            return None
+
+        entry = candidates[best]
+        params = np.array(entry['params'])
+        params[:, 0] *= entry['scale'] / scale
+        return params
+
+    def save(self, path=None):
+        """
+        Write the entries to a JSON file.
+
+        Args:
+            path (str, optional): Output file. Defaults to the store's path.
+        """
+        path = path or self.path
+        if path is None:
+            raise ValueError("No path given for saving the parameter store")
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(self.entries, f, indent=2)
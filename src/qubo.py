@@ -0,0 +1,268 @@
+"""
+QUBO Utilities Module
+
+This module converts Quadratic Unconstrained Binary Optimization (QUBO) problems
+into Ising models for QAOA. A QUBO with matrix Q has energy E(x) = x^T Q x over
+binary x. Substituting x_i = (1 - z_i) / 2, so that bit 1 corresponds to the PauliZ
+eigenvalue -1, gives
+
+    E = offset + sum_i h_i z_i + sum_{i<j} J_ij z_i z_j
+
+Both forms are evaluated in batches: ``qubo_energies`` gives x^T Q x and
+``IsingModel.energies`` the eigenvalues of the cost Hamiltonian, for assignments
+given as 0/1 arrays or bit-packed rows, processed in fixed-size chunks so the
+temporaries stay small however many assignments are scored.
+
+The conversion works on sparse input, merges the symmetric entries Q_ij and Q_ji into
+a single coupling, drops zero terms and tracks the constant offset, so the resulting
+cost Hamiltonian holds one term per nonzero coupling instead of one per matrix entry.
+
+Example:
+    To build the QAOA cost Hamiltonian of a QUBO:
+
+    ```python
+    ising = qubo_to_ising(Q)
+    cost_h = ising.to_hamiltonian()
+    ```
+"""
+
+import numpy as np
+
+# Number of assignments scored per vectorized chunk
+CHUNK_SIZE = 1 << 16
+
+
+class IsingModel:
+    """
+    Ising model E(z) = offset + sum_i h_i z_i + sum_k J_k z_{rows_k} z_{cols_k}.
+
+    Attributes:
+        n_qubits (int): Number of spins
+        h (numpy.ndarray): Linear coefficients, one per spin
+        rows (numpy.ndarray): First spin of each coupling (rows < cols)
+        cols (numpy.ndarray): Second spin of each coupling
+        couplings (numpy.ndarray): Coupling strengths J
+        offset (float): Constant energy offset
+    """
+
+    def __init__(self, n_qubits, h, rows, cols, couplings, offset=0.0):
+        """
+        Initialize the Ising model.
+
+        Args:
+            n_qubits (int): Number of spins
+            h (numpy.ndarray): Linear coefficients, one per spin
+            rows (numpy.ndarray): First spin of each coupling
+            cols (numpy.ndarray): Second spin of each coupling
+            couplings (numpy.ndarray): Coupling strengths
+            offset (float, optional): Constant energy offset. Defaults to 0.0.
+        """
+        self.n_qubits = n_qubits
+        self.h = np.asarray(h, dtype=float)
+        self.rows = np.asarray(rows, dtype=np.int64)
+        self.cols = np.asarray(cols, dtype=np.int64)
+        self.couplings = np.asarray(couplings, dtype=float)
+        self.offset = float(offset)
+
+    def to_hamiltonian(self, include_offset=False):
+        """
+        Build the PennyLane cost Hamiltonian with one term per nonzero coefficient.
+
+        All terms are products of PauliZ, so they are grouped into a single
+        qubit-wise commuting group and measured together.
+
+        Args:
+            include_offset (bool, optional): Add the constant offset as an identity term.
+                                             Defaults to False.
+
+        Returns:
+            qml.Hamiltonian: The cost Hamiltonian
+        """
+        import pennylane as qml
+
+        coeffs = []
+        ops = []
+
+        for i in np.flatnonzero(self.h):
+            coeffs.append(float(self.h[i]))
+            ops.append(qml.PauliZ(int(i)))
+
+        for i, j, J in zip(self.rows.tolist(), self.cols.tolist(), self.couplings.tolist()):
+            coeffs.append(J)
+            ops.append(qml.PauliZ(i) @ qml.PauliZ(j))
+
+        if include_offset and self.offset != 0:
+            coeffs.append(self.offset)
+            ops.append(qml.Identity(0))
+
+        return qml.Hamiltonian(coeffs, ops, grouping_type="qwc")
+
+    def coupling_matrix(self):
+        """
+        Build the dense upper-triangular matrix of the couplings.
+
+        Returns:
+            numpy.ndarray: Matrix J of shape (n_qubits, n_qubits) with J[rows, cols] = couplings
+        """
+        J = np.zeros((self.n_qubits, self.n_qubits))
+        np.add.at(J, (self.rows, self.cols), self.couplings)
+        return J
+
+    def energies(self, samples, packed=False, include_offset=False, chunk_size=CHUNK_SIZE):
+        """
+        Compute the energies of many binary assignments at once.
+
+        Bit 1 maps to the spin z = -1, as in ``qubo_to_ising``, so without the offset the
+        energies are the eigenvalues of ``to_hamiltonian()`` and with it they equal the
+        QUBO values x^T Q x.
+
+        Args:
+            samples (numpy.ndarray): 0/1 array of shape (n_samples, n_qubits), or bit-packed
+                                     rows as produced by ``numpy.packbits(..., axis=1)``
+            packed (bool, optional): Whether the rows are bit-packed. Defaults to False.
+            include_offset (bool, optional): Whether to add the constant offset. Defaults to False.
+            chunk_size (int, optional): Number of assignments per vectorized chunk
+
+        Returns:
+            numpy.ndarray: Energies of length n_samples
+        """
+        J = self.coupling_matrix()
+        offset = self.offset if include_offset else 0.0
+
+        def chunk_energies(x):
+            z = 1.0 - 2.0 * x
+            return offset + z @ self.h + np.einsum('ij,ij->i', z @ J, z)
+
+        return _map_chunks(chunk_energies, samples, self.n_qubits, packed, chunk_size)
+
+
+def unpack_samples(samples, n_qubits):
+    """
+    Unpack bit-packed assignments into a 0/1 array.
+
+    Args:
+        samples (numpy.ndarray): uint8 array of shape (n_samples, ceil(n_qubits / 8)),
+                                 big-endian within each byte
+        n_qubits (int): Number of variables
+
+    Returns:
+        numpy.ndarray: uint8 array of shape (n_samples, n_qubits)
+    """
+    return np.unpackbits(np.asarray(samples, dtype=np.uint8), axis=1, count=n_qubits)
+
+
+def _map_chunks(function, samples, n_qubits, packed, chunk_size):
+    """
+    Apply a per-chunk energy function to the rows of a sample array.
+
+    Args:
+        function (callable): Maps a float 0/1 array of shape (chunk, n_qubits) to energies
+        samples (numpy.ndarray): 0/1 or bit-packed assignments
+        n_qubits (int): Number of variables
+        packed (bool): Whether the rows are bit-packed
+        chunk_size (int): Number of rows per chunk
+
+    Returns:
+        numpy.ndarray: Energies of length n_samples
+    """
+    samples = np.asarray(samples)
+    if samples.ndim == 1:
+        samples = samples[None, :]
+
+    energies = np.empty(samples.shape[0])
+    for start in range(0, samples.shape[0], chunk_size):
+        chunk = samples[start:start + chunk_size]
+        x = unpack_samples(chunk, n_qubits) if packed else chunk
+        energies[start:start + chunk_size] = function(x.astype(float))
+
+    return energies
+
+
+def qubo_energies(Q, samples, packed=False, chunk_size=CHUNK_SIZE):
+    """
+    Compute the QUBO energies x^T Q x of many binary assignments at once.
+
+    Args:
+        Q: QUBO matrix as a dense array or a SciPy sparse matrix
+        samples (numpy.ndarray): 0/1 array of shape (n_samples, n_qubits), or bit-packed
+                                 rows as produced by ``numpy.packbits(..., axis=1)``
+        packed (bool, optional): Whether the rows are bit-packed. Defaults to False.
+        chunk_size (int, optional): Number of assignments per vectorized chunk
+
+    Returns:
+        numpy.ndarray: Energies of length n_samples
+    """
+    if not hasattr(Q, 'tocoo'):
+        Q = np.asarray(Q, dtype=float)
+
+    def chunk_energies(x):
+        # (Q x^T)^T row by row, so a sparse Q never becomes dense
+        return np.einsum('ij,ij->i', np.asarray((Q @ x.T).T), x)
+
+    return _map_chunks(chunk_energies, samples, Q.shape[0], packed, chunk_size)
+
+
+def _to_coo(Q, n_qubits=None):
+    """
+    Convert a QUBO matrix given in any supported format to COO triplets.
+
+    Args:
+        Q: Dense array, SciPy sparse matrix or a (rows, cols, values) tuple
+        n_qubits (int, optional): Number of variables, required only when it cannot be
+                                  inferred from COO triplets
+
+    Returns:
+        tuple: (n_qubits, rows, cols, values)
+    """
+    if isinstance(Q, tuple):
+        rows, cols, values = (np.asarray(a) for a in Q)
+        if n_qubits is None:
+            n_qubits = int(max(rows.max(initial=-1), cols.max(initial=-1))) + 1
+    elif hasattr(Q, 'tocoo'):
+        coo = Q.tocoo()
+        rows, cols, values = coo.row, coo.col, coo.data
+        n_qubits = coo.shape[0]
+    else:
+        Q = np.asarray(Q)
+        rows, cols = np.nonzero(Q)
+        values = Q[rows, cols]
+        n_qubits = Q.shape[0]
+
+    return n_qubits, rows.astype(np.int64), cols.astype(np.int64), values.astype(float)
+
+
+def qubo_to_ising(Q, n_qubits=None):
+    """
+    Convert a QUBO matrix into an Ising model.
+
+    Args:
+        Q: QUBO matrix as a dense array, a SciPy sparse matrix or COO triplets
+           ``(rows, cols, values)``. Duplicate triplets are summed.
+        n_qubits (int, optional): Number of variables for COO triplets. Defaults to
+                                  one more than the largest index.
+
+    Returns:
+        IsingModel: Ising model with E(x) = x^T Q x for x = (1 - z) / 2
+    """
+    n_qubits, rows, cols, values = _to_coo(Q, n_qubits)
+
+    diagonal = rows == cols
+    linear = np.bincount(rows[diagonal], weights=values[diagonal], minlength=n_qubits)
+
+    # Merge Q_ij and Q_ji into one coupling on the pair (min, max)
+    first = np.minimum(rows[~diagonal], cols[~diagonal])
+    second = np.maximum(rows[~diagonal], cols[~diagonal])
+    pairs, inverse = np.unique(first * n_qubits + second, return_inverse=True)
+    quadratic = np.bincount(inverse.reshape(-1), weights=values[~diagonal], minlength=len(pairs))
+
+    nonzero = quadratic != 0
+    pairs, quadratic = pairs[nonzero], quadratic[nonzero]
+    pair_rows, pair_cols = pairs // n_qubits, pairs % n_qubits
+
+    # x_i = (1 - z_i) / 2 and x_i x_j = (1 - z_i - z_j + z_i z_j) / 4
+    h = -linear / 2
+    h -= np.bincount(pair_rows, weights=quadratic, minlength=n_qubits) / 4
+    h -= np.bincount(pair_cols, weights=quadratic, minlength=n_qubits) / 4
+    offset = linear.sum() / 2 + quadratic.sum() / 4
+
+    return IsingModel(n_qubits, h, pair_rows, pair_cols, quadratic / 4, offset)
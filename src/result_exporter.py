@@ -0,0 +1,341 @@
+"""
+Result Exporter Module
+
+This module writes result files off the solver's thread. A ``ResultExporter``
+holds a bounded queue of export jobs and a background writer thread that runs
+them, so ``export_results`` returns as soon as its jobs are queued, and a solver
+that produces results faster than they are written blocks on the full queue
+instead of piling them up in memory.
+
+Plots usually dominate the export time, so they can be handled separately:
+
+- ``plots='background'`` renders them on the writer like any other job
+- ``plots='deferred'`` keeps them until ``render_deferred`` is called, e.g. after
+  a batch of solves
+- ``plots='skip'`` drops them
+
+Plots are drawn by ``plotting.render_distribution`` on a Figure with the Agg
+canvas and never touch pyplot, so rendering in the background cannot interfere
+with plots drawn on the main thread. With ``processes`` set, jobs run on a process pool instead
+of the writer thread, which keeps rendering from competing with the solver for
+the interpreter lock; up to ``max_pending`` jobs then run at once. Every exporter is
+flushed and closed at interpreter exit; jobs the process pool no longer accepts by
+then run on the writer thread. Closing an exporter with deferred plots that were
+never rendered prints a warning naming them.
+
+Failed jobs are reported rather than lost: their exceptions are set on the futures
+that ``write`` returns, which ``export_results`` includes in its summary, and the
+next ``flush`` or ``close`` raises a ``RuntimeError`` listing them.
+
+Example:
+    To export many runs without waiting for the files:
+
+    ```python
+    with ResultExporter(plots='deferred') as exporter:
+        for solver in solvers:
+            solver.export_results(solver.run(), exporter=exporter)
+        exporter.render_deferred()
+    ```
+"""
+
+import atexit
+import csv
+import json
+import os
+import queue
+import sys
+import threading
+import weakref
+from concurrent.futures import Future, ProcessPoolExecutor
+
+from plotting import render_distribution
+
+PLOT_MODES = ('background', 'deferred', 'skip')
+
+# Exporters that are still open, closed at interpreter exit
+_open_exporters = weakref.WeakSet()
+
+
+def write_json(path, data):
+    """
+    Write data to a JSON file.
+
+    Args:
+        path (str): Path of the JSON file
+        data: JSON-serializable data
+    """
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2)
+
+
+def write_counts_csv(path, counts):
+    """
+    Write result counts to a CSV file with one row per solution.
+
+    Args:
+        path (str): Path of the CSV file
+        counts (dict): Result counts, mapping solution strings to counts
+    """
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['Solution', 'Count'])
+        writer.writerows(counts.items())
+
+
+def render_histogram(counts, save_path, title="Max-XORSAT Solutions", dpi=300):
+    """
+    Draw result counts as a bar chart of the most likely solutions and save it,
+    without using pyplot.
+
+    Args:
+        counts (Distribution or dict): Result counts, mapping solution strings to counts
+        save_path (str): Path of the image file
+        title (str, optional): Title of the chart. Defaults to "Max-XORSAT Solutions".
+        dpi (int, optional): Resolution of the image. Defaults to 300.
+    """
+    render_distribution(counts, save_path, title=title, dpi=dpi)
+
+
+class ResultExporter:
+    """
+    Bounded queue of export jobs run by a background writer.
+
+    A job that fails does not stop the writer: its exception is set on the job's
+    future and kept in ``failures``, and the next ``flush`` or ``close`` raises it.
+
+    Attributes:
+        plots (str): How plots are handled, one of PLOT_MODES
+        max_pending (int): Largest number of queued jobs before ``write`` blocks, and of
+                           jobs running on the process pool at once
+        deferred (list): Plot jobs kept for ``render_deferred``
+        failures (list): (description, exception) of the failed jobs not yet reported
+    """
+
+    def __init__(self, max_pending=16, plots='background', processes=None):
+        """
+        Start the writer thread.
+
+        Args:
+            max_pending (int, optional): Capacity of the job queue. Defaults to 16.
+            plots (str, optional): 'background', 'deferred' or 'skip'. Defaults to 'background'.
+            processes (int, optional): Number of worker processes running the jobs.
+                                       Defaults to None (run them on the writer thread).
+        """
+        if plots not in PLOT_MODES:
+            raise ValueError(f"Unknown plot mode: {plots}. Use one of {', '.join(PLOT_MODES)}")
+
+        self.plots = plots
+        self.max_pending = max_pending
+        self.deferred = []
+        self.failures = []
+        self._jobs = queue.Queue(maxsize=max_pending)
+        self._pool = ProcessPoolExecutor(max_workers=processes) if processes else None
+        self._in_flight = threading.BoundedSemaphore(max_pending)
+        self._failures_lock = threading.Lock()
+        self._closed = False
+        self._pid = os.getpid()
+
+        self._writer = threading.Thread(target=self._run, name='result-exporter', daemon=True)
+        self._writer.start()
+        _open_exporters.add(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _finish(self, future, function, args, result=None, error=None):
+        """
+        Complete a job's future, record its failure and mark it done in the queue.
+        """
+        if error is None:
+            future.set_result(result)
+        else:
+            with self._failures_lock:
+                self.failures.append((_describe(function, args), error))
+            future.set_exception(error)
+        self._jobs.task_done()
+
+    def _run(self):
+        """
+        Run queued jobs until the stop sentinel arrives.
+
+        On the writer thread a job runs to completion before the next one starts. With a
+        process pool the writer only submits jobs, at most ``max_pending`` at once, and
+        each job is marked done when its pool future completes.
+        """
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                self._jobs.task_done()
+                return
+            future, function, args = job
+            if not future.set_running_or_notify_cancel():
+                self._jobs.task_done()
+                continue
+
+            if self._pool is None:
+                self._run_inline(future, function, args)
+                continue
+
+            self._in_flight.acquire()
+            try:
+                pool_future = self._pool.submit(function, *args)
+            except RuntimeError:
+                # The pool is broken, or shut down because the interpreter is exiting
+                self._in_flight.release()
+                self._run_inline(future, function, args)
+                continue
+            except Exception as error:
+                self._in_flight.release()
+                self._finish(future, function, args, error=error)
+                continue
+            pool_future.add_done_callback(
+                lambda done, future=future, function=function, args=args:
+                    self._chain(done, future, function, args))
+
+    def _run_inline(self, future, function, args):
+        """
+        Run a job on the writer thread.
+        """
+        try:
+            result = function(*args)
+        except Exception as error:
+            self._finish(future, function, args, error=error)
+        else:
+            self._finish(future, function, args, result)
+
+    def _chain(self, done, future, function, args):
+        """
+        Copy the outcome of a pool future into the caller's future.
+        """
+        self._in_flight.release()
+        error = done.exception()
+        self._finish(future, function, args, None if error else done.result(), error)
+
+    def write(self, function, *args):
+        """
+        Queue an export job, blocking while the queue is full.
+
+        Args:
+            function (callable): The job, e.g. ``write_json``; it must be picklable when
+                                 running on processes
+            *args: Arguments of the job
+
+        Returns:
+            concurrent.futures.Future: Future of the job's return value
+        """
+        if self._closed:
+            raise RuntimeError("The exporter is closed")
+        future = Future()
+        self._jobs.put((future, function, args))
+        return future
+
+    def plot(self, function, *args):
+        """
+        Queue, defer or skip a plot job according to the plot mode.
+
+        Args:
+            function (callable): The plot job, e.g. ``render_histogram``
+            *args: Arguments of the job
+
+        Returns:
+            concurrent.futures.Future: Future of the job, or None if it was deferred or skipped
+        """
+        if self.plots == 'background':
+            return self.write(function, *args)
+        if self.plots == 'deferred':
+            self.deferred.append((function, args))
+        return None
+
+    def render_deferred(self):
+        """
+        Queue all deferred plot jobs.
+
+        Returns:
+            list: Futures of the queued jobs
+        """
+        jobs, self.deferred = self.deferred, []
+        return [self.write(function, *args) for function, args in jobs]
+
+    def _raise_failures(self):
+        """
+        Raise the failures recorded since the last call, if any.
+        """
+        with self._failures_lock:
+            failures, self.failures = self.failures, []
+        if failures:
+            lines = '\n'.join(f"- {description}: {error!r}" for description, error in failures)
+            raise RuntimeError(f"{len(failures)} export job(s) failed:\n{lines}") from failures[0][1]
+
+    def flush(self):
+        """
+        Wait until every queued job has completed.
+
+        Raises:
+            RuntimeError: If jobs failed since the last flush
+        """
+        self._jobs.join()
+        self._raise_failures()
+
+    def close(self):
+        """
+        Run the remaining jobs and stop the writer. Deferred plots that were never
+        rendered are dropped with a warning on stderr.
+
+        Raises:
+            RuntimeError: If jobs failed since the last flush
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._jobs.put(None)
+        self._jobs.join()
+        self._writer.join()
+        if self._pool is not None:
+            self._pool.shutdown()
+        _open_exporters.discard(self)
+        if self.deferred:
+            names = ', '.join(_describe(function, args) for function, args in self.deferred)
+            print(f"Result exporter: {len(self.deferred)} deferred plot(s) were never rendered: "
+                  f"{names}", file=sys.stderr)
+            self.deferred = []
+        self._raise_failures()
+
+
+def _describe(function, args):
+    """
+    Name a job for failure reports, by its function and its path argument if it has one.
+    """
+    name = getattr(function, '__name__', repr(function))
+    paths = [arg for arg in args if isinstance(arg, (str, os.PathLike))]
+    return f"{name}({paths[0]})" if paths else name
+
+
+def export_inline(function, *args):
+    """
+    Run an export job on the calling thread, the fallback when no exporter is given.
+
+    Args:
+        function (callable): The job
+        *args: Arguments of the job
+
+    Returns:
+        The job's return value
+    """
+    return function(*args)
+
+
+def _close_open_exporters():
+    for exporter in list(_open_exporters):
+        # Forked pool workers inherit the set but not the writer threads
+        if exporter._pid != os.getpid():
+            continue
+        try:
+            exporter.close()
+        except RuntimeError as error:
+            print(f"Result exporter: {error}", file=sys.stderr)
+
+
+atexit.register(_close_open_exporters)
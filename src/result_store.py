@@ -0,0 +1,442 @@
+"""
+Result Store Module
+
+This module keeps the results of many runs in one append-only, columnar store
+instead of a set of timestamped JSON, CSV and PNG files per run. A run is recorded
+as integer arrays: the measured states as integers (bitstring ``b`` is state
+``int(b, 2)``), their counts and probabilities, next to the hash of the solved
+instance, the algorithm and its parameters.
+
+Runs are buffered and written as NumPy ``.npz`` shards named by a random id, so
+parallel writers never collide, and every shard adds its runs to ``index.jsonl``
+for lookup by run id, instance or algorithm. Buffered runs are flushed when the
+store is used as a context manager and exits, and at interpreter exit.
+``consolidate`` merges all shards into one ``.npy`` file per column, which
+``columns`` memory-maps for analysis over a whole campaign. Each consolidation is
+built in a directory of its own and published by atomically replacing the
+``campaign.json`` pointer, under a lock file, so concurrent consolidations do not
+interfere and readers always see one complete set of columns. ``to_parquet`` exports the same
+tables when pyarrow is installed.
+
+Column layout, with one row per run and one row per measured state:
+
+- runs: ``run_id``, ``instance``, ``algorithm``, ``params`` (JSON), ``n_bits``,
+  ``shots`` (0 for exact distributions), ``offset`` and ``length`` into the states
+- states: ``states`` (uint64), ``counts`` (int64), ``probabilities`` (float64)
+
+Example:
+    To record DQI runs and analyze them together:
+
+    ```python
+    store = ResultStore('outputs/store')
+    run_id = solver.save_results(solver.run(shots=1024), store)
+    store.flush()
+
+    columns = store.columns()
+    best = columns['states'][columns['offset'][0]]
+    ```
+"""
+
+import atexit
+import hashlib
+import json
+import os
+import shutil
+import time
+import uuid
+import weakref
+from contextlib import contextmanager
+
+import numpy as np
+
+from gf2 import pack_bits
+
+# Runs buffered before a shard is written
+SHARD_RUNS = 256
+
+RUN_COLUMNS = ('run_id', 'instance', 'algorithm', 'params', 'n_bits', 'shots', 'offset', 'length')
+STATE_COLUMNS = ('states', 'counts', 'probabilities')
+
+# Stores with buffered runs, flushed at interpreter exit
+_open_stores = weakref.WeakSet()
+
+
+@contextmanager
+def _exclusive_lock(path):
+    """
+    Hold an exclusive lock on a lock file, with flock on POSIX and msvcrt on Windows.
+
+    The operating system releases the lock if the process dies, so a crashed
+    consolidation never leaves the store locked.
+
+    Args:
+        path (str): Path of the lock file, created if missing
+    """
+    with open(path, 'a+b') as lock:
+        try:
+            import fcntl
+        except ImportError:
+            import msvcrt
+            # msvcrt locks a byte range and gives up after 10 seconds, so retry
+            while True:
+                try:
+                    lock.seek(0)
+                    msvcrt.locking(lock.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    time.sleep(0.1)
+            try:
+                yield
+            finally:
+                lock.seek(0)
+                msvcrt.locking(lock.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def instance_hash(matrix, phase_vector=None):
+    """
+    Hash a problem instance, i.e. a parity check matrix or a QUBO matrix.
+
+    Binary matrices are hashed by their packed bits, so the hash does not depend on
+    the integer dtype; other matrices by their float64 values.
+
+    Args:
+        matrix (numpy.ndarray): The instance matrix
+        phase_vector (list, optional): Right-hand side of a Max-XORSAT instance
+
+    Returns:
+        str: 16 hexadecimal digits
+    """
+    matrix = np.asarray(matrix)
+    digest = hashlib.sha256(repr(matrix.shape).encode())
+    if np.isin(matrix, (0, 1)).all():
+        digest.update(b'binary')
+        digest.update(pack_bits(matrix).tobytes())
+    else:
+        digest.update(np.ascontiguousarray(matrix, dtype=np.float64).tobytes())
+    if phase_vector is not None:
+        digest.update(pack_bits(np.asarray(phase_vector) > 0).tobytes())
+    return digest.hexdigest()[:16]
+
+
+class ResultStore:
+    """
+    Append-only columnar store of run results.
+
+    Attributes:
+        directory (str): Directory holding the shards, the index and the consolidated columns
+        shard_runs (int): Number of buffered runs that triggers writing a shard
+    """
+
+    def __init__(self, directory, shard_runs=SHARD_RUNS):
+        """
+        Open a store, creating its directory.
+
+        Args:
+            directory (str): Directory of the store
+            shard_runs (int, optional): Runs per shard. Defaults to SHARD_RUNS.
+        """
+        self.directory = directory
+        self.shard_runs = shard_runs
+        self._buffer = []
+        self._pid = os.getpid()
+        os.makedirs(directory, exist_ok=True)
+        _open_stores.add(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.flush()
+
+    @property
+    def index_path(self):
+        return os.path.join(self.directory, 'index.jsonl')
+
+    @property
+    def campaign_path(self):
+        """Pointer file naming the directory of the latest consolidated columns."""
+        return os.path.join(self.directory, 'campaign.json')
+
+    @property
+    def lock_path(self):
+        return os.path.join(self.directory, 'consolidate.lock')
+
+    def append(self, instance, algorithm, states, counts=None, probabilities=None,
+               n_bits=None, params=None, run_id=None):
+        """
+        Record one run.
+
+        Args:
+            instance (str): Instance hash, see ``instance_hash``
+            algorithm (str): Name of the algorithm, e.g. 'dqi' or 'qaoa'
+            states: Measured states as integers, or as bitstrings
+            counts (list, optional): Integer count of every state
+            probabilities (list, optional): Probability of every state, used for exact
+                                            distributions; derived from the counts if omitted
+            n_bits (int, optional): Width of the states. Defaults to the bitstring length.
+            params (dict, optional): JSON-serializable parameters of the run
+            run_id (str, optional): Id of the run. Defaults to a random id.
+
+        Returns:
+            str: The run id
+        """
+        states = list(states)
+        if states and isinstance(states[0], str):
+            n_bits = len(states[0]) if n_bits is None else n_bits
+            states = [int(state, 2) for state in states]
+        if n_bits is None:
+            raise ValueError("n_bits is required for integer states")
+        if n_bits > 64:
+            raise ValueError("The store holds states of at most 64 bits")
+        if counts is None and probabilities is None:
+            raise ValueError("A run needs counts or probabilities")
+
+        states = np.asarray(states, dtype=np.uint64)
+        counts = np.zeros(states.size, dtype=np.int64) if counts is None else np.asarray(counts, dtype=np.int64)
+        shots = int(counts.sum())
+        if probabilities is None:
+            probabilities = counts / shots if shots else np.zeros(states.size)
+
+        run_id = run_id or uuid.uuid4().hex
+        self._buffer.append({
+            'run_id': run_id,
+            'instance': instance,
+            'algorithm': algorithm,
+            'params': json.dumps(params or {}, sort_keys=True),
+            'n_bits': n_bits,
+            'shots': shots,
+            'states': states,
+            'counts': counts,
+            'probabilities': np.asarray(probabilities, dtype=np.float64)
+        })
+        if len(self._buffer) >= self.shard_runs:
+            self.flush()
+        return run_id
+
+    def flush(self):
+        """
+        Write the buffered runs to a new shard and add them to the index.
+
+        Returns:
+            str: Path of the shard, or None if nothing was buffered
+        """
+        if not self._buffer:
+            return None
+        runs, self._buffer = self._buffer, []
+
+        lengths = np.array([run['states'].size for run in runs], dtype=np.int64)
+        columns = {
+            'run_id': np.array([run['run_id'] for run in runs]),
+            'instance': np.array([run['instance'] for run in runs]),
+            'algorithm': np.array([run['algorithm'] for run in runs]),
+            'params': np.array([run['params'] for run in runs]),
+            'n_bits': np.array([run['n_bits'] for run in runs], dtype=np.int64),
+            'shots': np.array([run['shots'] for run in runs], dtype=np.int64),
+            'offset': np.concatenate([[0], np.cumsum(lengths)[:-1]]).astype(np.int64),
+            'length': lengths
+        }
+        for name in STATE_COLUMNS:
+            columns[name] = np.concatenate([run[name] for run in runs])
+
+        # Written under a temporary name and renamed, so readers never see a partial shard
+        name = f"shard-{uuid.uuid4().hex}.npz"
+        path = os.path.join(self.directory, name)
+        with open(path + '.tmp', 'wb') as f:
+            np.savez(f, **columns)
+        os.replace(path + '.tmp', path)
+
+        # One append per shard keeps concurrent writers' index lines whole
+        lines = ''.join(json.dumps({'run_id': run['run_id'], 'instance': run['instance'],
+                                    'algorithm': run['algorithm'], 'shard': name, 'row': i}) + '\n'
+                        for i, run in enumerate(runs))
+        with open(self.index_path, 'a') as f:
+            f.write(lines)
+        return path
+
+    def index(self, instance=None, algorithm=None, run_id=None):
+        """
+        Look up flushed runs in the index.
+
+        Args:
+            instance (str, optional): Keep only runs of this instance hash
+            algorithm (str, optional): Keep only runs of this algorithm
+            run_id (str, optional): Keep only the run with this id
+
+        Returns:
+            list: Index entries with 'run_id', 'instance', 'algorithm', 'shard' and 'row'
+        """
+        if not os.path.exists(self.index_path):
+            return []
+        with open(self.index_path) as f:
+            entries = [json.loads(line) for line in f if line.strip()]
+        return [entry for entry in entries
+                if (instance is None or entry['instance'] == instance)
+                and (algorithm is None or entry['algorithm'] == algorithm)
+                and (run_id is None or entry['run_id'] == run_id)]
+
+    def runs(self, instance=None, algorithm=None, run_id=None):
+        """
+        Read flushed runs, each shard loaded once.
+
+        Args:
+            instance (str, optional): Keep only runs of this instance hash
+            algorithm (str, optional): Keep only runs of this algorithm
+            run_id (str, optional): Keep only the run with this id
+
+        Returns:
+            list: Dicts with the run columns, ``params`` decoded, and the run's 'states',
+                  'counts' and 'probabilities' arrays
+        """
+        entries = self.index(instance, algorithm, run_id)
+        by_shard = {}
+        for position, entry in enumerate(entries):
+            by_shard.setdefault(entry['shard'], []).append((position, entry['row']))
+
+        runs = [None] * len(entries)
+        for name, rows in by_shard.items():
+            with np.load(os.path.join(self.directory, name)) as shard:
+                columns = {column: shard[column] for column in RUN_COLUMNS + STATE_COLUMNS}
+            for position, row in rows:
+                start, length = int(columns['offset'][row]), int(columns['length'][row])
+                run = {column: columns[column][row].item() for column in RUN_COLUMNS}
+                run['params'] = json.loads(run['params'])
+                for column in STATE_COLUMNS:
+                    run[column] = columns[column][start:start + length]
+                runs[position] = run
+        return runs
+
+    def _shard_names(self):
+        return sorted(name for name in os.listdir(self.directory)
+                      if name.startswith('shard-') and name.endswith('.npz'))
+
+    def _current_campaign(self):
+        """
+        Read the campaign pointer once, so all columns are read from one version.
+
+        Returns:
+            str: Directory of the latest consolidated columns, or None if there is none
+        """
+        try:
+            with open(self.campaign_path) as f:
+                version = json.load(f)['version']
+        except FileNotFoundError:
+            return None
+        return os.path.join(self.directory, version)
+
+    def consolidate(self):
+        """
+        Merge all shards into one ``.npy`` file per column.
+
+        Returns:
+            int: Number of runs in the consolidated columns
+        """
+        self.flush()
+        with _exclusive_lock(self.lock_path):
+            return self._consolidate()
+
+    def _consolidate(self):
+        """
+        Build a new campaign version and publish it, with the lock held.
+        """
+        shard_names = self._shard_names()
+        merged = {name: [] for name in RUN_COLUMNS + STATE_COLUMNS}
+        base = 0
+        for name in shard_names:
+            with np.load(os.path.join(self.directory, name)) as shard:
+                for column in RUN_COLUMNS + STATE_COLUMNS:
+                    values = shard[column]
+                    merged[column].append(values + base if column == 'offset' else values)
+                base += shard['states'].size
+
+        version = f"campaign-{uuid.uuid4().hex}"
+        building = os.path.join(self.directory, f".{version}.tmp")
+        os.makedirs(building)
+        for column, parts in merged.items():
+            np.save(os.path.join(building, column + '.npy'), np.concatenate(parts) if parts else np.array([]))
+        with open(os.path.join(building, 'shards.json'), 'w') as f:
+            json.dump(shard_names, f)
+        os.rename(building, os.path.join(self.directory, version))
+
+        # Older stores kept the columns in a plain directory or behind a symlink
+        legacy = os.path.join(self.directory, 'campaign')
+        if os.path.islink(legacy):
+            os.unlink(legacy)
+        elif os.path.isdir(legacy):
+            shutil.rmtree(legacy)
+
+        previous = self._current_campaign()
+        pointer = os.path.join(self.directory, f".{version}.json")
+        with open(pointer, 'w') as f:
+            json.dump({'version': version}, f)
+        os.replace(pointer, self.campaign_path)
+
+        # The previous version is kept for readers that read the pointer before the swap
+        keep = {version, os.path.basename(previous) if previous else None}
+        for name in os.listdir(self.directory):
+            if name.startswith('campaign-') and name not in keep:
+                shutil.rmtree(os.path.join(self.directory, name), ignore_errors=True)
+        return sum(len(part) for part in merged['run_id'])
+
+    def columns(self, mmap=True):
+        """
+        Load the consolidated columns, consolidating first if shards were added since.
+
+        Args:
+            mmap (bool, optional): Memory-map the arrays instead of reading them. Defaults to True.
+
+        Returns:
+            dict: Column name to array, with the run columns indexed by run and the
+                  state columns by state; run r owns states offset[r]:offset[r] + length[r]
+        """
+        self.flush()
+        campaign = self._current_campaign()
+        consolidated = None
+        if campaign is not None:
+            with open(os.path.join(campaign, 'shards.json')) as f:
+                consolidated = json.load(f)
+        if consolidated != self._shard_names():
+            self.consolidate()
+            campaign = self._current_campaign()
+
+        return {column: np.load(os.path.join(campaign, column + '.npy'),
+                                mmap_mode='r' if mmap else None)
+                for column in RUN_COLUMNS + STATE_COLUMNS}
+
+    def to_parquet(self, path):
+        """
+        Export the store as two Parquet files, ``<path>.runs.parquet`` and
+        ``<path>.states.parquet``, where the states carry the index of their run.
+
+        Args:
+            path (str): Path prefix of the Parquet files
+
+        Returns:
+            tuple: Paths of the runs and states files
+        """
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as error:
+            raise ImportError("Parquet export requires pyarrow: pip install pyarrow") from error
+
+        columns = self.columns(mmap=False)
+        runs_path, states_path = path + '.runs.parquet', path + '.states.parquet'
+        pq.write_table(pa.table({name: columns[name] for name in RUN_COLUMNS}), runs_path)
+
+        states = {name: columns[name] for name in STATE_COLUMNS}
+        states['run'] = np.repeat(np.arange(columns['length'].size), columns['length'])
+        pq.write_table(pa.table(states), states_path)
+        return runs_path, states_path
+
+
+@atexit.register
+def _flush_open_stores():
+    for store in list(_open_stores):
+        if store._pid == os.getpid():
+            store.flush()
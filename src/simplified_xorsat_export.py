@@ -15,12 +15,14 @@ Example:
     This will generate mock results and export them to the 'outputs' directory.
 """
 
-import matplotlib.pyplot as plt
-import json
 import os
-import csv
+from concurrent.futures import Future
 from datetime import datetime
 
+from distribution import Distribution
+from plotting import render_distribution
+from result_exporter import export_inline, render_histogram, write_counts_csv, write_json
+
 def generate_mock_results():
     """
     Generate mock results for demonstration purposes.
@@ -41,32 +43,19 @@ def generate_mock_results():
 
 def visualize_results(counts, save_path=None):
     """
-    Visualize the results as a simple bar chart.
+    Visualize the results as a bar chart of the most likely solutions.
     
     Args:
-        counts (dict): Result counts from the algorithm, mapping solution strings to counts
+        counts (Distribution or dict): Result counts, mapping solution strings to counts
         save_path (str, optional): Optional path to save the plot. If None, displays the plot.
     
     Returns:
         None
     """
-    plt.figure(figsize=(10, 6))
-    solutions = list(counts.keys())
-    counts_values = list(counts.values())
-    
-    plt.bar(solutions, counts_values)
-    plt.xlabel('Solutions')
-    plt.ylabel('Counts')
-    plt.title("Max-XORSAT Solutions")
-    plt.xticks(rotation=45)
-    
-    if save_path:
-        plt.savefig(save_path, dpi=300, bbox_inches='tight')
-        plt.close()
-    else:
-        plt.show()
+    render_distribution(counts, save_path, title="Max-XORSAT Solutions",
+                        show=save_path is None, dpi=300)
         
-def export_results(results, output_dir='outputs'):
+def export_results(results, output_dir='outputs', exporter=None):
     """
     Export the results to various file formats.
     
@@ -76,11 +65,15 @@ def export_results(results, output_dir='outputs'):
     - PNG image with a histogram visualization
     
     Args:
-        results (dict): Dictionary containing the results, mapping solution strings to counts
+        results (Distribution or dict): The results, mapping solution strings to counts
         output_dir (str): Directory to save the outputs, defaults to 'outputs'
+        exporter (ResultExporter, optional): Background exporter the files are handed to,
+                                             so this returns before they are written
     
     Returns:
-        dict: Dictionary with paths to the exported files and summary information
+        dict: Dictionary with paths to the exported files and summary information;
+              the plot path is None when the exporter skips plots, and 'jobs'
+              holds the futures of the exporter's jobs, which carry their errors
     """
     # Create timestamp for unique filenames
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -93,26 +86,28 @@ def export_results(results, output_dir='outputs'):
     csv_path = os.path.join(output_dir, f"results_{timestamp}.csv")
     plot_path = os.path.join(output_dir, f"histogram_{timestamp}.png")
     
-    # Export as JSON
-    with open(json_path, 'w') as f:
-        json.dump(results, f, indent=2)
-        
-    # Export as CSV
-    with open(csv_path, 'w', newline='') as f:
-        writer = csv.writer(f)
-        writer.writerow(['Solution', 'Count'])
-        for solution, count in results.items():
-            writer.writerow([solution, count])
+    results = Distribution.from_dict(results)
+    
+    # Export as JSON and CSV, in the background if an exporter is given
+    write = exporter.write if exporter is not None else export_inline
+    jobs = [write(write_json, json_path, results.to_dict()),
+            write(write_counts_csv, csv_path, results)]
     
     # Export plot
-    visualize_results(results, save_path=plot_path)
+    if exporter is None:
+        visualize_results(results, save_path=plot_path)
+    else:
+        jobs.append(exporter.plot(render_histogram, results, plot_path))
+        if exporter.plots == 'skip':
+            plot_path = None
     
     # Find best solution
-    best_solution = max(results.items(), key=lambda x: x[1])[0]
+    best_solution = results.most_likely()[0]
     
     # Create summary
     summary = {
         'best_solution': best_solution,
+        'jobs': [job for job in jobs if isinstance(job, Future)],
         'output_files': {
             'json': json_path,
             'csv': csv_path,
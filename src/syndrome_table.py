@@ -0,0 +1,220 @@
+"""
+Syndrome Table Module
+
+This module builds syndrome lookup tables for the DQI Max-XORSAT decoder without
+scanning all 2**n error patterns. Only the error patterns of Hamming weight <= t are
+enumerated (as combinations of column indices), the columns of the parity check
+matrix are packed into uint64 words, and the syndromes of all patterns are computed
+at once as a batched XOR over the packed columns.
+
+Bit conventions match the original dict-based table in ``DQIMaxXORSAT``: the
+integer form of a syndrome has row 0 of the parity check matrix as its most
+significant bit, and the integer form of an error pattern has column 0 as its most
+significant bit.
+
+Example:
+    To build a table and decode a syndrome:
+
+    ```python
+    table = SyndromeTable(parity_check_matrix, max_weight=2)
+
+    # Error pattern integer for syndrome 0b000011
+    error = table[3]
+
+    # Vectorized lookup of many syndromes at once
+    errors = table.decode(np.array([3, 5, 6]))
+    ```
+"""
+
+from collections.abc import Mapping
+from itertools import combinations
+
+import numpy as np
+
+from gf2 import WORD_BITS, BitMatrix, words_to_int
+
+
+def enumerate_error_patterns(n_bits, max_weight):
+    """
+    Enumerate all error patterns with Hamming weight <= max_weight.
+
+    Patterns are returned as arrays of column positions padded with -1, which keeps
+    the representation independent of n_bits.
+
+    Args:
+        n_bits (int): Number of bits in an error pattern
+        max_weight (int): Largest Hamming weight to enumerate
+
+    Returns:
+        numpy.ndarray: Integer array of shape (n_patterns, max_weight) holding the set
+                       positions of each pattern, padded with -1
+    """
+    max_weight = min(max_weight, n_bits)
+    blocks = [np.full((1, max_weight), -1, dtype=np.int64)]
+
+    for weight in range(1, max_weight + 1):
+        positions = np.fromiter(
+            (p for combo in combinations(range(n_bits), weight) for p in combo),
+            dtype=np.int64
+        ).reshape(-1, weight)
+        block = np.full((positions.shape[0], max_weight), -1, dtype=np.int64)
+        block[:, :weight] = positions
+        blocks.append(block)
+
+    return np.concatenate(blocks, axis=0)
+
+
+class SyndromeTable(Mapping):
+    """
+    Bit-packed syndrome lookup table for parity check matrices.
+
+    The table is stored as flat NumPy arrays: ``syndromes`` holds the packed syndromes
+    sorted in ascending order and ``errors`` holds the matching packed error patterns.
+    It behaves like the original ``{syndrome_int: error_int}`` dict, and ``decode``
+    looks up whole batches of syndromes with a binary search.
+
+    When several error patterns share a syndrome, the one with the largest integer
+    value is kept, which is the pattern the original ascending 2**n scan wrote last.
+
+    Attributes:
+        parity_check_matrix (numpy.ndarray): The parity check matrix the table decodes
+        max_weight (int): Largest Hamming weight of the tabulated error patterns
+        n_rows (int): Number of rows (syndrome bits) of the parity check matrix
+        n_bits (int): Number of columns (error bits) of the parity check matrix
+        syndromes (numpy.ndarray): Sorted packed syndromes, shape (size, syndrome words)
+        errors (numpy.ndarray): Packed error patterns, shape (size, error words)
+        weights (numpy.ndarray): Hamming weight of each tabulated error pattern
+    """
+
+    def __init__(self, parity_check_matrix, max_weight=2):
+        """
+        Build the syndrome table.
+
+        Args:
+            parity_check_matrix (numpy.ndarray): Binary matrix of shape (n_rows, n_bits)
+            max_weight (int, optional): Largest Hamming weight of the tabulated error
+                                        patterns. Defaults to 2.
+        """
+        if max_weight < 0:
+            raise ValueError("max_weight must be non-negative")
+
+        self.parity_check_matrix = np.asarray(parity_check_matrix) % 2
+        self.n_rows, self.n_bits = self.parity_check_matrix.shape
+        self.max_weight = min(max_weight, self.n_bits)
+
+        self.syndromes, self.errors, self.weights = self._build()
+        self._keys = self.syndromes[:, 0] if self.syndromes.shape[1] == 1 else None
+        self._index = None
+
+    def _build(self):
+        """
+        Enumerate the low-weight error patterns and compute their syndromes.
+
+        Returns:
+            tuple: Sorted packed syndromes, packed error patterns and pattern weights
+        """
+        patterns = enumerate_error_patterns(self.n_bits, self.max_weight)
+        weights = np.count_nonzero(patterns >= 0, axis=1)
+
+        # Packed columns, with an all-zero sentinel row for the -1 padding
+        columns = BitMatrix.from_dense(self.parity_check_matrix).transpose().words
+        columns = np.vstack([columns, np.zeros((1, columns.shape[1]), dtype=np.uint64)])
+        syndromes = np.zeros((patterns.shape[0], columns.shape[1]), dtype=np.uint64)
+        for j in range(patterns.shape[1]):
+            syndromes ^= columns[patterns[:, j]]
+
+        # Packed error patterns: set the bit for each position, MSB = column 0
+        n_words = max(1, -(-self.n_bits // WORD_BITS))
+        offsets = patterns + (n_words * WORD_BITS - self.n_bits)
+        errors = np.zeros((patterns.shape[0], n_words), dtype=np.uint64)
+        rows = np.arange(patterns.shape[0])
+        for j in range(patterns.shape[1]):
+            valid = patterns[:, j] >= 0
+            shifts = (WORD_BITS - 1 - offsets[valid, j] % WORD_BITS).astype(np.uint64)
+            errors[rows[valid], offsets[valid, j] // WORD_BITS] |= np.left_shift(np.uint64(1), shifts)
+
+        # Sort by syndrome, then error value, and keep the last pattern per syndrome
+        keys = [errors[:, i] for i in reversed(range(errors.shape[1]))]
+        keys += [syndromes[:, i] for i in reversed(range(syndromes.shape[1]))]
+        order = np.lexsort(keys)
+        syndromes, errors, weights = syndromes[order], errors[order], weights[order]
+
+        last = np.ones(len(order), dtype=bool)
+        last[:-1] = np.any(syndromes[1:] != syndromes[:-1], axis=1)
+
+        return syndromes[last], errors[last], weights[last]
+
+    def _position(self, syndrome):
+        """
+        Find the table row holding a syndrome integer.
+
+        Args:
+            syndrome (int): The syndrome integer
+
+        Returns:
+            int or None: Row index into the table arrays, or None if absent
+        """
+        if syndrome < 0 or syndrome >> self.n_rows:
+            return None
+
+        if self._keys is not None:
+            position = int(np.searchsorted(self._keys, np.uint64(syndrome)))
+            if position < len(self._keys) and int(self._keys[position]) == syndrome:
+                return position
+            return None
+
+        if self._index is None:
+            self._index = {words_to_int(row): i for i, row in enumerate(self.syndromes)}
+        return self._index.get(syndrome)
+
+    def __getitem__(self, syndrome):
+        position = self._position(int(syndrome))
+        if position is None:
+            raise KeyError(syndrome)
+        return words_to_int(self.errors[position])
+
+    def __contains__(self, syndrome):
+        return self._position(int(syndrome)) is not None
+
+    def __iter__(self):
+        return (words_to_int(row) for row in self.syndromes)
+
+    def __len__(self):
+        return self.syndromes.shape[0]
+
+    def items(self):
+        return zip(iter(self), (words_to_int(row) for row in self.errors))
+
+    def decode(self, syndromes):
+        """
+        Look up the error patterns for a batch of syndromes.
+
+        Only tables with at most 64 syndrome bits support batched lookup; larger
+        tables can be queried one syndrome at a time through the mapping interface.
+
+        Args:
+            syndromes (numpy.ndarray): Array of syndrome integers
+
+        Returns:
+            tuple: (errors, found) where ``errors`` holds the packed error pattern for
+                   each syndrome (zeros where not found) and ``found`` is a boolean mask
+        """
+        if self._keys is None:
+            raise ValueError("Batched decoding requires at most 64 syndrome bits")
+
+        syndromes = np.asarray(syndromes, dtype=np.uint64)
+        positions = np.searchsorted(self._keys, syndromes)
+        positions = np.minimum(positions, len(self._keys) - 1)
+        found = self._keys[positions] == syndromes
+
+        errors = np.where(found[..., None], self.errors[positions], np.uint64(0))
+        return errors, found
+
+    def to_dict(self):
+        """
+        Convert the table to a plain ``{syndrome_int: error_int}`` dictionary.
+
+        Returns:
+            dict: A dictionary mapping syndrome integers to error pattern integers
+        """
+        return dict(self.items())
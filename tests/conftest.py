@@ -0,0 +1,22 @@
+"""
+The modules in ``src`` import each other as siblings, so the tests put ``src`` on
+the import path the same way running a script from it does.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+
+@pytest.fixture
+def rng():
+    return np.random.default_rng(1234)
+
+
+def random_matrix(rng, n_rows, n_cols, density=0.4):
+    """Random 0/1 matrix with the given fraction of ones."""
+    return (rng.random((n_rows, n_cols)) < density).astype(np.uint8)
@@ -0,0 +1,55 @@
+import sys
+
+import pytest
+
+from benchmarks import compare, peak_rss_mb, print_report
+
+
+def run(stages, quality, name='dqi-4x6'):
+    """A run_suite output with one case."""
+    return {'results': [{
+        'name': name,
+        'stages': {stage: {'median': median, 'p95': median} for stage, median in stages.items()},
+        'quality': quality,
+        'peak_traced_mb': 1.0,
+        'peak_rss_mb': None
+    }]}
+
+
+def test_compare_reports_slower_stages():
+    baseline = run({'simulate': 0.10, 'transpile': 0.02}, {})
+    current = run({'simulate': 0.20, 'transpile': 0.024}, {})
+    comparison = compare(current, baseline, threshold=1.25)
+
+    assert [row['metric'] for row in comparison['rows']] == ['simulate', 'transpile']
+    assert [row['metric'] for row in comparison['regressions']] == ['simulate']
+    assert comparison['regressions'][0]['ratio'] == pytest.approx(2.0)
+
+
+def test_compare_skips_stages_below_noise_floor():
+    baseline = run({'post_process': 1e-5, 'simulate': 0.1}, {})
+    current = run({'post_process': 1e-3, 'simulate': 0.1}, {})
+    comparison = compare(current, baseline, noise_floor=1e-3)
+
+    assert [row['metric'] for row in comparison['rows']] == ['simulate']
+    assert comparison['regressions'] == []
+
+
+def test_compare_reports_quality_drops():
+    baseline = run({}, {'approximation_ratio': 0.90, 'optimal_probability': 0.50})
+    current = run({}, {'approximation_ratio': 0.88, 'optimal_probability': 0.40})
+    comparison = compare(current, baseline, quality_tolerance=0.05)
+
+    assert [row['metric'] for row in comparison['regressions']] == ['optimal_probability']
+    assert comparison['regressions'][0]['ratio'] == pytest.approx(0.8)
+
+    # Cases missing from the baseline are not compared
+    assert compare(run({'simulate': 1.0}, {}, name='qaoa-8'), baseline) == {'rows': [], 'regressions': []}
+
+
+def test_peak_rss_without_resource_module(monkeypatch, capsys):
+    monkeypatch.setitem(sys.modules, 'resource', None)
+    assert peak_rss_mb() is None
+
+    print_report(run({'simulate': 0.1}, {'approximation_ratio': 0.9}))
+    assert 'RSS n/a' in capsys.readouterr().out
@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+pytest.importorskip('qiskit')
+
+import circuit_cache
+from circuit_cache import CircuitCache, circuit_key
+from qiskit import QuantumCircuit, transpile
+
+
+H = np.array([[1, 1, 0, 1], [0, 1, 1, 1]])
+
+
+def bell_circuit():
+    circuit = QuantumCircuit(2, 2)
+    circuit.h(0)
+    circuit.cx(0, 1)
+    circuit.measure([0, 1], [0, 1])
+    return circuit
+
+
+class Compiler:
+    """Counts the builds, to tell cache hits from recompilations."""
+
+    def __init__(self):
+        self.builds = 0
+
+    def build(self):
+        self.builds += 1
+        return bell_circuit()
+
+    def transpile(self, circuit):
+        return transpile(circuit, basis_gates=['rz', 'sx', 'cx'], optimization_level=0)
+
+
+def test_qpy_round_trip(tmp_path):
+    key = circuit_key(H, np.ones(4), 1, backend_name='aer_simulator')
+    compiler = Compiler()
+    circuit, transpiled = CircuitCache(cache_dir=str(tmp_path)).get_or_compile(
+        key, compiler.build, compiler.transpile)
+
+    # A fresh cache, like another process, loads the circuits from the QPY file
+    cache = CircuitCache(cache_dir=str(tmp_path))
+    assert key in cache and len(cache) == 0
+    loaded, loaded_transpiled = cache.get_or_compile(key, compiler.build, compiler.transpile)
+
+    assert compiler.builds == 1
+    assert (cache.hits, cache.misses) == (1, 0)
+    assert loaded == circuit
+    assert loaded_transpiled == transpiled
+
+
+@pytest.mark.parametrize('name, version', [
+    ('COMPILER_VERSION', circuit_cache.COMPILER_VERSION + 1),
+    ('CACHE_FORMAT_VERSION', circuit_cache.CACHE_FORMAT_VERSION + 1),
+])
+def test_version_change_invalidates_disk_entries(tmp_path, monkeypatch, name, version):
+    compiler = Compiler()
+    key = circuit_key(H, np.ones(4), 1, backend_name='aer_simulator')
+    CircuitCache(cache_dir=str(tmp_path)).get_or_compile(key, compiler.build, compiler.transpile)
+
+    monkeypatch.setattr(circuit_cache, name, version)
+    new_key = circuit_key(H, np.ones(4), 1, backend_name='aer_simulator')
+    cache = CircuitCache(cache_dir=str(tmp_path))
+    cache.get_or_compile(new_key, compiler.build, compiler.transpile)
+
+    assert new_key != key
+    assert compiler.builds == 2
+    assert (cache.hits, cache.misses) == (0, 1)
+
+
+def test_qiskit_version_is_part_of_the_key(monkeypatch):
+    key = circuit_key(H, np.ones(4), 1)
+    monkeypatch.setattr(circuit_cache.qiskit, '__version__', '0.0.0')
+    assert circuit_key(H, np.ones(4), 1) != key
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from classical_max_xorsat import ClassicalMaxXORSAT
+from conftest import random_matrix
+
+
+def brute_force_satisfied(parity_check_matrix, phase_vector):
+    """Satisfied constraints of every assignment x, bit r of x being variable r."""
+    n_variables = parity_check_matrix.shape[0]
+    x = (np.arange(2 ** n_variables)[:, None] >> np.arange(n_variables)) & 1
+    return np.sum((x @ parity_check_matrix) % 2 == phase_vector, axis=1)
+
+
+def random_instance(rng, n_variables, n_constraints):
+    H = random_matrix(rng, n_variables, n_constraints, density=0.3)
+    # An empty constraint with v_j = 1 is never satisfied; keep one to cover it
+    H[:, 0] = 0
+    return H, rng.integers(0, 2, n_constraints)
+
+
+@pytest.mark.parametrize('shape', [(3, 5), (6, 10), (9, 14)])
+def test_exhaustive_search_matches_brute_force(rng, shape):
+    H, v = random_instance(rng, *shape)
+    expected = brute_force_satisfied(H, v)
+
+    # Small blocks exercise the Gray-code walk over the high variables
+    result = ClassicalMaxXORSAT(H, v).exhaustive_search(block_bits=2)
+    assert result['satisfied'] == expected.max()
+    assert result['n_optimal'] == np.sum(expected == expected.max())
+    assert result['optimal_assignments'] == np.flatnonzero(expected == expected.max()).tolist()
+    assert np.array_equal(result['histogram'], np.bincount(expected, minlength=shape[1] + 1))
+
+
+def test_satisfied_counts_matches_brute_force(rng):
+    H, v = random_instance(rng, 7, 12)
+    instance = ClassicalMaxXORSAT(H, v)
+    assert np.array_equal(instance.satisfied_counts(np.arange(2 ** 7)), brute_force_satisfied(H, v))
+
+
+@pytest.mark.parametrize('search', ['simulated_annealing', 'walksat'])
+def test_local_search_reaches_optimum(rng, search):
+    for n_variables, n_constraints in [(4, 6), (8, 12), (10, 16)]:
+        H, v = random_instance(rng, n_variables, n_constraints)
+        instance = ClassicalMaxXORSAT(H, v)
+        result = getattr(instance, search)(restarts=3, seed=5)
+
+        assert result['satisfied'] == brute_force_satisfied(H, v).max()
+        assert result['satisfied'] == instance.satisfied_counts([result['assignment']])[0]
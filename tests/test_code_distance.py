@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from code_distance import correctable_weight, minimum_distance, weight_distribution
+from conftest import random_matrix
+
+
+def codeword_weights(parity_check_matrix):
+    """Weights of all y with H·y = 0, by enumerating every y."""
+    n_bits = parity_check_matrix.shape[1]
+    y = (np.arange(2 ** n_bits)[:, None] >> np.arange(n_bits)) & 1
+    codewords = y[~np.any((y @ parity_check_matrix.T) % 2, axis=1)]
+    return codewords.sum(axis=1)
+
+
+# Few checks give a kernel larger than its dual, many checks the opposite
+SHAPES = [(3, 8), (4, 12), (6, 12), (9, 14), (12, 14)]
+
+
+@pytest.mark.parametrize('shape', SHAPES)
+def test_weight_distribution(rng, shape):
+    H = random_matrix(rng, *shape, density=0.3)
+    expected = np.bincount(codeword_weights(H), minlength=shape[1] + 1)
+    assert np.array_equal(weight_distribution(H), expected)
+
+
+@pytest.mark.parametrize('shape', SHAPES)
+def test_minimum_distance(rng, shape):
+    for _ in range(5):
+        H = random_matrix(rng, *shape, density=0.3)
+        weights = codeword_weights(H)
+        nonzero = weights[weights > 0]
+        expected = int(nonzero.min()) if nonzero.size else None
+
+        assert minimum_distance(H) == expected
+        if expected is not None:
+            assert correctable_weight(H) == (expected - 1) // 2
+            # Distances from the target on may be returned as the target or exactly
+            bounded = minimum_distance(H, target=3)
+            assert bounded == expected if expected < 3 else bounded in (3, expected)
+
+
+def test_trivial_kernel():
+    assert minimum_distance(np.eye(5, dtype=np.uint8)) is None
+    assert correctable_weight(np.eye(5, dtype=np.uint8)) == 5
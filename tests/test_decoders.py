@@ -0,0 +1,91 @@
+from itertools import combinations
+
+import numpy as np
+import pytest
+
+from decoders import (BeliefPropagationDecoder, InformationSetDecoder, LookupDecoder,
+                      benchmark_decoders)
+
+# Hamming [7,4]: column c is the binary form of c + 1
+HAMMING = np.array([[((c + 1) >> r) & 1 for c in range(7)] for r in range(3)], dtype=np.uint8)
+
+
+def distinct_column_code(rng, n_checks, n_bits):
+    """Random H with distinct nonzero columns, so every weight-1 error is correctable."""
+    values = rng.choice(np.arange(1, 2 ** n_checks), size=n_bits, replace=False)
+    return ((values[None, :] >> np.arange(n_checks)[:, None]) & 1).astype(np.uint8)
+
+
+def all_errors(n_bits, weight):
+    errors = np.zeros((0, n_bits), dtype=np.uint8)
+    for support in combinations(range(n_bits), weight):
+        error = np.zeros((1, n_bits), dtype=np.uint8)
+        error[0, list(support)] = 1
+        errors = np.vstack([errors, error])
+    return errors
+
+
+def codes(rng):
+    return [HAMMING, distinct_column_code(rng, 5, 20), distinct_column_code(rng, 6, 30)]
+
+
+def test_weight_one_errors_match_lookup(rng):
+    for H in codes(rng):
+        lookup = LookupDecoder(H, max_weight=1)
+        errors = np.eye(H.shape[1], dtype=np.uint8)
+        syndromes = lookup.syndromes(errors)
+        expected, _ = lookup.decode(syndromes)
+        assert np.array_equal(expected.to_dense(), errors)
+
+        for decoder in [BeliefPropagationDecoder(H), InformationSetDecoder(H, iterations=50, seed=0)]:
+            decoded, found = decoder.decode(syndromes)
+            assert found.all()
+            assert np.array_equal(decoded.to_dense(), errors), decoder.label
+
+
+def test_information_set_is_no_heavier_than_lookup(rng):
+    for H in codes(rng):
+        errors = np.vstack([all_errors(H.shape[1], 1), all_errors(H.shape[1], 2)])
+        lookup = LookupDecoder(H, max_weight=2)
+        expected, _ = lookup.decode(lookup.syndromes(errors))
+
+        decoder = InformationSetDecoder(H, iterations=200, seed=0)
+        decoded, found = decoder.decode(lookup.syndromes(errors))
+        assert found.all()
+        assert np.all(decoded.to_dense().sum(axis=1) <= expected.to_dense().sum(axis=1))
+
+
+def test_ordered_statistics_fixes_heavy_min_sum_decisions():
+    # Min-sum alone flips every column inside the syndrome's support, a consistent
+    # weight-4 error, for the error on the all-ones column
+    error = np.eye(7, dtype=np.uint8)[[6]]
+    syndromes = LookupDecoder(HAMMING, max_weight=1).syndromes(error)
+
+    decoded, found = BeliefPropagationDecoder(HAMMING, osd=False).decode(syndromes)
+    assert found.all() and decoded.to_dense().sum() == 4
+    decoded, found = BeliefPropagationDecoder(HAMMING).decode(syndromes)
+    assert found.all() and np.array_equal(decoded.to_dense(), error)
+
+    report = benchmark_decoders([BeliefPropagationDecoder(HAMMING)], max_weight=1, n_samples=100, seed=0)
+    assert next(iter(report.values()))['radius'] == 1
+
+
+@pytest.mark.parametrize('make_decoder', [
+    lambda H: LookupDecoder(H, max_weight=1),
+    lambda H: InformationSetDecoder(H, iterations=20, seed=0),
+    lambda H: BeliefPropagationDecoder(H),
+    lambda H: BeliefPropagationDecoder(H, osd=False),
+])
+def test_found_flags_unreachable_syndromes(rng, make_decoder):
+    # Row 3 is empty, so no error sets syndrome bit 3
+    H = distinct_column_code(rng, 4, 10)
+    H = np.vstack([H[:3], np.zeros((1, 10), dtype=np.uint8), H[3:]])
+    decoder = make_decoder(H)
+
+    reachable = decoder.syndromes(np.eye(10, dtype=np.uint8)[:3]).to_dense()
+    unreachable = reachable.copy()
+    unreachable[:, 3] = 1
+
+    decoded, found = decoder.decode(np.vstack([reachable, unreachable]))
+    assert found.tolist() == [True] * 3 + [False] * 3
+    assert np.array_equal(decoded.to_dense()[:3], np.eye(10, dtype=np.uint8)[:3])
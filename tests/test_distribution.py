@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from distribution import Distribution
+
+
+def random_counts(rng, n_bits, n_states):
+    states = rng.choice(2 ** n_bits, size=n_states, replace=False)
+    return {format(int(s), f'0{n_bits}b'): int(rng.integers(1, 100)) for s in states}
+
+
+@pytest.mark.parametrize('n_bits', [1, 5, 17, 64])
+def test_dict_round_trip(rng, n_bits):
+    if n_bits == 64:
+        counts = {''.join(rng.choice(['0', '1'], 64)): int(rng.integers(1, 100)) for _ in range(50)}
+    else:
+        counts = random_counts(rng, n_bits, min(50, 2 ** n_bits))
+    distribution = Distribution.from_dict(counts)
+
+    assert distribution.to_dict() == counts
+    assert dict(distribution) == counts
+    assert distribution.total() == sum(counts.values())
+    for bitstring, count in counts.items():
+        assert distribution[bitstring] == count
+        assert distribution[int(bitstring, 2)] == count
+
+
+def test_samples_and_merge(rng):
+    samples = rng.integers(0, 2, size=(5000, 9))
+    distribution = Distribution.from_samples(samples[:3000]) + Distribution.from_samples(samples[3000:])
+
+    expected = {}
+    for row in samples:
+        key = ''.join(map(str, row))
+        expected[key] = expected.get(key, 0) + 1
+    assert distribution.to_dict() == expected
+    assert distribution.is_counts
+
+
+def test_int_dict_and_probabilities(rng):
+    probs = rng.random(2 ** 6)
+    probs /= probs.sum()
+    distribution = Distribution.from_probabilities(probs)
+
+    assert distribution.n_bits == 6
+    assert np.allclose(distribution.probabilities()[np.argsort(distribution.states)], probs)
+    assert Distribution.from_int_dict(dict(enumerate(probs)), 6).to_dict() == distribution.to_dict()
+    assert len(Distribution.from_probabilities(probs, tolerance=np.median(probs))) == 32
+
+
+def test_probabilities_need_power_of_two_length():
+    with pytest.raises(ValueError):
+        Distribution.from_probabilities([0.2, 0.3, 0.5])
+
+
+def test_top_k_and_marginal(rng):
+    counts = random_counts(rng, 8, 100)
+    distribution = Distribution.from_dict(counts)
+
+    top = distribution.top_k(10)
+    expected = sorted(counts.items(), key=lambda item: (-item[1], int(item[0], 2)))[:10]
+    assert list(top.items()) == expected
+    assert distribution.most_likely() == expected[0]
+
+    marginal = distribution.marginal([0, 3])
+    reference = {}
+    for bitstring, count in counts.items():
+        key = bitstring[-4] + bitstring[-1]
+        reference[key] = reference.get(key, 0) + count
+    assert marginal.to_dict() == reference
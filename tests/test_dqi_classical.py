@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+pytest.importorskip('qiskit_aer')
+
+from circuit_cache import CircuitCache
+from conftest import random_matrix
+from dqi_classical import DQIEvaluator
+from dqi_max_xorsat_implementation import DQIMaxXORSAT
+
+
+def exact_probabilities(solver):
+    """Marginal distribution of the solution register from the statevector simulation."""
+    probs = np.zeros(2 ** solver.n_checks)
+    distribution = solver.run_exact(tolerance=0)
+    probs[distribution.states.astype(np.int64)] = distribution.weights
+    return probs
+
+
+@pytest.mark.parametrize('shape, max_error_weight, phase_vector', [
+    ((3, 5), 1, None),
+    ((3, 6), 2, None),
+    ((4, 6), 2, [1, 0, 1, 1, 0, 1]),
+])
+def test_matches_statevector(rng, shape, max_error_weight, phase_vector):
+    H = random_matrix(rng, *shape)
+    solver = DQIMaxXORSAT(H, max_error_weight=max_error_weight, phase_vector=phase_vector,
+                          circuit_cache=CircuitCache())
+    evaluator = DQIEvaluator.from_solver(solver)
+
+    assert np.allclose(evaluator.distribution(), exact_probabilities(solver), atol=1e-9)
+
+
+def test_default_instance():
+    solver = DQIMaxXORSAT(circuit_cache=CircuitCache())
+    evaluator = DQIEvaluator.from_solver(solver)
+
+    probs = exact_probabilities(solver)
+    assert np.allclose(evaluator.distribution(), probs, atol=1e-9)
+    satisfied = evaluator.satisfied_counts(np.arange(probs.size))
+    assert evaluator.expected_satisfied() == pytest.approx(probs @ satisfied)
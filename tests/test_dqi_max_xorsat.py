@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+pytest.importorskip('qiskit_aer')
+
+from distribution import Distribution
+from dqi_max_xorsat_implementation import DQIMaxXORSAT
+from qiskit.quantum_info import Statevector
+
+MATRICES = [
+    np.array([[1, 1, 0, 1], [0, 1, 1, 1]]),
+    np.array([[1, 0, 1, 1], [1, 1, 0, 1]]),
+    np.array([[1, 1, 0, 0, 1], [0, 1, 1, 0, 0], [1, 0, 0, 1, 1]]),
+]
+
+
+def test_run_batch_matches_run():
+    results = DQIMaxXORSAT.run_batch(MATRICES, shots=300, threads_per_experiment=4, seed=11)
+
+    assert len(results) == len(MATRICES)
+    for matrix, result in zip(MATRICES, results):
+        assert isinstance(result['counts'], Distribution)
+        assert result['counts'].n_bits == matrix.shape[0]
+        assert result['counts'].total() == 300
+        assert result['counts'] == DQIMaxXORSAT(matrix).run(shots=300, seed=result['seed'])
+
+
+def test_run_exact_postselect_matches_statevector():
+    solver = DQIMaxXORSAT(MATRICES[2], max_error_weight=1)
+    state = Statevector(solver.build_circuit(measure=False)).data
+    # Little-endian with the y register first: solution states index the rows
+    probs = (np.abs(state) ** 2).reshape(2 ** solver.n_checks, 2 ** solver.n_bits)
+    expected = probs[:, 0] / probs[:, 0].sum()
+
+    distribution = solver.run_exact(postselect=True, tolerance=0)
+    assert isinstance(distribution, Distribution)
+    assert distribution.probabilities().sum() == pytest.approx(1.0)
+    actual = np.zeros(2 ** solver.n_checks)
+    actual[distribution.states.astype(np.int64)] = distribution.probabilities()
+    assert np.allclose(actual, expected, atol=1e-9)
+
+
+def test_run_exact_postselect_without_success_raises():
+    # Every branch is at or below a tolerance of 1
+    with pytest.raises(ValueError, match="Cannot postselect"):
+        DQIMaxXORSAT(MATRICES[0]).run_exact(postselect=True, tolerance=1.0)
+
+
+def test_run_returns_solution_register_counts():
+    solver = DQIMaxXORSAT(MATRICES[2], max_error_weight=1)
+    counts = solver.run(shots=500, seed=3)
+
+    # Only the solution register is measured, so states never exceed its width
+    assert isinstance(counts, Distribution)
+    assert counts.is_counts and counts.total() == 500
+    assert counts.n_bits == solver.n_checks
+    assert all(len(key) == solver.n_checks for key in counts)
+    assert int(counts.states.max()) < 2 ** solver.n_checks
+
+    exact = solver.run_exact(tolerance=0)
+    assert set(counts.states.tolist()) <= set(exact.states.tolist())
@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+from conftest import random_matrix
+from gf2 import BitMatrix, pack_bits, popcount, unpack_bits, words_to_int
+
+
+def dense_rank(matrix):
+    """Rank over GF(2) by elimination on a dense integer matrix."""
+    matrix = matrix.copy() % 2
+    rank = 0
+    for col in range(matrix.shape[1]):
+        rows = np.flatnonzero(matrix[rank:, col]) + rank
+        if rows.size == 0:
+            continue
+        matrix[[rank, rows[0]]] = matrix[[rows[0], rank]]
+        others = np.flatnonzero(matrix[:, col])
+        matrix[others[others != rank]] ^= matrix[rank]
+        rank += 1
+        if rank == matrix.shape[0]:
+            break
+    return rank
+
+
+# Shapes around the 64-bit word boundary
+SHAPES = [(5, 9), (12, 20), (30, 63), (20, 64), (40, 65), (70, 130)]
+
+
+@pytest.mark.parametrize('shape', SHAPES)
+def test_pack_round_trip(rng, shape):
+    bits = random_matrix(rng, *shape, density=0.5)
+    words = pack_bits(bits)
+    assert np.array_equal(unpack_bits(words, shape[1]), bits)
+    assert words_to_int(words[0]) == int(''.join(map(str, bits[0])), 2)
+
+
+@pytest.mark.parametrize('shape', SHAPES + [(64, 64), (130, 70), (1, 1)])
+def test_transpose(rng, shape):
+    bits = random_matrix(rng, *shape, density=0.5)
+    transposed = BitMatrix.from_dense(bits).T
+    assert transposed.shape == shape[::-1]
+    assert transposed == BitMatrix.from_dense(bits.T)
+    assert transposed.T == BitMatrix.from_dense(bits)
+
+
+@pytest.mark.parametrize('shape', SHAPES)
+def test_rank(rng, shape):
+    H = random_matrix(rng, *shape, density=0.2)
+    H[-1] = H[0] ^ H[1]
+    assert BitMatrix.from_dense(H).rank() == dense_rank(H)
+
+
+@pytest.mark.parametrize('shape', SHAPES)
+def test_kernel_basis(rng, shape):
+    H = random_matrix(rng, *shape, density=0.3)
+    basis = BitMatrix.from_dense(H).kernel_basis().to_dense().astype(np.int64)
+
+    assert basis.shape == (shape[1] - dense_rank(H), shape[1])
+    assert not np.any((H.astype(np.int64) @ basis.T) % 2)
+    assert dense_rank(basis) == basis.shape[0]
+
+
+@pytest.mark.parametrize('shape', SHAPES)
+def test_matmul_and_matvec(rng, shape):
+    A = random_matrix(rng, *shape)
+    B = random_matrix(rng, shape[1], 17)
+    expected = (A.astype(np.int64) @ B) % 2
+
+    assert np.array_equal((BitMatrix.from_dense(A) @ BitMatrix.from_dense(B)).to_dense(), expected)
+    assert np.array_equal(BitMatrix.from_dense(A).batch_matvec(B.T).to_dense(), expected.T)
+    assert np.array_equal(BitMatrix.from_dense(A).matvec(B[:, 0]), expected[:, 0])
+
+
+def test_popcount_fallback(rng, monkeypatch):
+    words = rng.integers(0, 2 ** 63, size=(50, 3), dtype=np.uint64) | np.uint64(1 << 63)
+    expected = np.array([[bin(int(w)).count('1') for w in row] for row in words])
+
+    assert np.array_equal(popcount(words), expected)
+    monkeypatch.delattr(np, 'bitwise_count', raising=False)
+    assert np.array_equal(popcount(words), expected)
@@ -0,0 +1,56 @@
+import json
+import re
+
+import numpy as np
+import pytest
+
+from code_distance import minimum_distance
+from gf2 import BitMatrix
+from instance_generator import InstanceGenerator, load_instances
+
+
+def generator():
+    return InstanceGenerator(6, 10, row_weights=(1, 2), min_rank=5, min_distance=3)
+
+
+def assert_same_instances(first, second):
+    assert len(first) == len(second)
+    for a, b in zip(first, second):
+        assert np.array_equal(a['parity_check_matrix'], b['parity_check_matrix'])
+        assert {key: a[key] for key in a if key != 'parity_check_matrix'} == \
+               {key: b[key] for key in b if key != 'parity_check_matrix'}
+
+
+def test_seed_reproduces_instances_for_any_worker_count():
+    one = generator().generate(6, max_workers=1, seed=7, batch_size=32)
+    two = generator().generate(6, max_workers=2, seed=7, batch_size=32)
+    assert_same_instances(one, two)
+
+    for instance in one:
+        H = instance['parity_check_matrix']
+        assert set(H.sum(axis=0)) <= {1, 2}
+        assert len({tuple(column) for column in H.T}) == H.shape[1]
+        assert instance['rank'] == BitMatrix.from_dense(H).rank() >= 5
+        assert minimum_distance(H) >= 3
+
+
+def test_candidate_budget_is_bounded(tmp_path):
+    impossible = InstanceGenerator(6, 10, min_rank=7)
+    path = str(tmp_path / 'instances.bin')
+    with pytest.raises(RuntimeError, match=r"Accepted 0 of 3 instances") as error:
+        impossible.generate(3, path=path, max_workers=2, seed=0, batch_size=16, max_candidates=100)
+
+    candidates = int(re.search(r"in (\d+) candidates", str(error.value)).group(1))
+    assert candidates == 100
+    assert load_instances(path) == []
+
+
+def test_save_and_load_round_trip(tmp_path):
+    path = str(tmp_path / 'instances.bin')
+    instances = generator().generate(5, path=path, max_workers=1, seed=3, batch_size=32)
+
+    assert_same_instances(load_instances(path), instances)
+    with open(path + '.json') as f:
+        metadata = json.load(f)
+    assert metadata['count'] == 5
+    assert (metadata['n_variables'], metadata['n_constraints']) == (6, 10)
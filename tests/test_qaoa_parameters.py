@@ -0,0 +1,112 @@
+import numpy as np
+import pytest
+
+from qaoa_parameters import ParameterStore, qubo_features
+
+
+def ring_qubo(n_qubits, chords=0, scale=1.0):
+    """QUBO on a ring of couplings plus a few chords, with a known density."""
+    Q = np.diag(-np.ones(n_qubits))
+    for i in range(n_qubits):
+        Q[i, (i + 1) % n_qubits] = Q[(i + 1) % n_qubits, i] = 2.0
+    for i in range(chords):
+        Q[i, i + n_qubits // 2] = Q[i + n_qubits // 2, i] = 2.0
+    return scale * Q
+
+
+PARAMS = np.array([[0.4, 0.3], [0.6, 0.2]])
+
+
+def coupled_qubo(n_qubits, n_couplings):
+    """QUBO with the first n_couplings pairs coupled, so its density is known exactly."""
+    Q = np.diag(-np.ones(n_qubits))
+    rows, cols = np.triu_indices(n_qubits, k=1)
+    Q[rows[:n_couplings], cols[:n_couplings]] = 2.0
+    return Q + np.triu(Q, k=1).T
+
+
+def test_lookup_is_gated_by_distance():
+    store = ParameterStore(max_distance=0.25)
+    store.add(coupled_qubo(20, 38), PARAMS)
+
+    assert np.allclose(store.lookup(coupled_qubo(20, 38), 2), PARAMS)
+    assert store.lookup(coupled_qubo(20, 38), 1) is None
+
+    # Density 0.2 at relative size difference 0.25 is still a match, a larger one is not
+    assert qubo_features(coupled_qubo(15, 21))[1] == pytest.approx(0.2)
+    assert store.lookup(coupled_qubo(15, 21), 2) is not None
+    assert store.lookup(coupled_qubo(14, 18), 2) is None
+
+    # Density differences up to 0.25 match at the same size
+    assert store.lookup(coupled_qubo(20, 38 + 47), 2) is not None
+    assert store.lookup(coupled_qubo(20, 38 + 48), 2) is None
+
+    # Size difference 0.1 and density difference 0.18 are each in range, their sum is not
+    assert store.lookup(coupled_qubo(18, 58), 2) is None
+
+
+def test_lookup_rescales_gamma():
+    store = ParameterStore()
+    store.add(ring_qubo(8), PARAMS)
+
+    params = store.lookup(ring_qubo(8, scale=4.0), 2)
+    assert np.allclose(params[:, 0], PARAMS[:, 0] / 4)
+    assert np.allclose(params[:, 1], PARAMS[:, 1])
+
+
+def test_add_replaces_only_with_lower_cost():
+    store = ParameterStore()
+    Q = ring_qubo(8)
+    store.add(Q, PARAMS, cost=-5.0)
+    store.add(Q, PARAMS + 1, cost=-4.0)
+    assert len(store) == 1 and np.allclose(store.lookup(Q, 2), PARAMS)
+
+    store.add(Q, PARAMS + 2, cost=-6.0)
+    assert len(store) == 1 and np.allclose(store.lookup(Q, 2), PARAMS + 2)
+
+    # Another depth or another instance is a new entry
+    store.add(Q, PARAMS[:1], cost=-3.0)
+    store.add(ring_qubo(10), PARAMS, cost=-9.0)
+    assert len(store) == 3
+
+
+def test_save_and_load_round_trip(tmp_path):
+    path = str(tmp_path / 'store' / 'parameters.json')
+    store = ParameterStore(path)
+    store.add(ring_qubo(8), PARAMS, cost=-5.0)
+    store.add(ring_qubo(12, chords=3, scale=2.0), PARAMS[:1])
+    store.save()
+
+    loaded = ParameterStore(path)
+    assert loaded.entries == store.entries
+    assert np.allclose(loaded.lookup(ring_qubo(12, chords=3), 1), store.lookup(ring_qubo(12, chords=3), 1))
+
+
+def test_layerwise_starts_from_interpolated_angles(monkeypatch):
+    pytest.importorskip('pennylane')
+    from implementingQAOA_N_by_N import QAOASolver, interpolate_params
+
+    starts = []
+    optimize = QAOASolver.optimize
+
+    def recording_optimize(solver, params=None, **options):
+        starts.append((solver.depth, None if params is None else np.array(params)))
+        optimized, costs = optimize(solver, params, **options)
+        starts[-1] += (np.array(optimized),)
+        return optimized, costs
+
+    monkeypatch.setattr(QAOASolver, 'optimize', recording_optimize)
+    store = ParameterStore()
+    result = QAOASolver(ring_qubo(4), depth=3, steps=10).solve_layerwise(store=store)
+
+    assert [depth for depth, _, _ in starts] == [1, 2, 3]
+    assert starts[0][1] is None
+    for (_, _, previous), (_, start, _) in zip(starts, starts[1:]):
+        assert np.allclose(start, interpolate_params(previous))
+    assert not result['transferred']
+    assert sorted(entry['depth'] for entry in store.entries) == [1, 2, 3]
+
+    # A store with full-depth angles skips the schedule
+    starts.clear()
+    result = QAOASolver(ring_qubo(4), depth=3, steps=10).solve_layerwise(store=store)
+    assert result['transferred'] and [depth for depth, _, _ in starts] == [3]
@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+qml = pytest.importorskip('pennylane')
+
+from implementingQAOA_N_by_N import QAOASolver
+from qubo import qubo_to_ising
+from qaoa_simulator import QAOASimulator
+
+
+def random_qubo(rng, n):
+    upper = np.triu(rng.integers(-5, 6, size=(n, n)), 1)
+    return upper + upper.T + np.diag(rng.integers(-10, 11, size=n))
+
+
+@pytest.mark.parametrize('n_qubits, depth', [(3, 1), (4, 2), (5, 3)])
+def test_matches_default_qubit(rng, n_qubits, depth):
+    Q = random_qubo(rng, n_qubits)
+    params = rng.uniform(0, 1, (depth, 2)) * [np.pi, np.pi / 2]
+
+    numpy_solver = QAOASolver(Q, depth=depth, diff_method="numpy")
+    pennylane_solver = QAOASolver(Q, depth=depth, diff_method="adjoint")
+
+    assert np.allclose(numpy_solver.probabilities(params), pennylane_solver.probabilities(params), atol=1e-10)
+    assert numpy_solver.cost(params) == pytest.approx(pennylane_solver.cost(params), abs=1e-9)
+
+
+@pytest.mark.parametrize('n_qubits, depth', [(3, 1), (4, 3)])
+def test_gradient_matches_default_qubit(rng, n_qubits, depth):
+    Q = random_qubo(rng, n_qubits)
+    params = rng.uniform(0, 1, (depth, 2))
+
+    simulator = QAOASimulator(qubo_to_ising(Q), depth)
+    cost, grad = simulator.expectation_and_gradient(params)
+
+    cost_fn, _ = QAOASolver(Q, depth=depth, diff_method="adjoint")._build_qnodes()
+    expected = qml.grad(cost_fn)(qml.numpy.array(params, requires_grad=True))
+    assert cost == pytest.approx(float(cost_fn(params)), abs=1e-9)
+    assert np.allclose(grad, expected, atol=1e-8)
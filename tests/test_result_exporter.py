@@ -0,0 +1,46 @@
+import json
+
+import pytest
+
+from result_exporter import ResultExporter, write_json
+
+
+def fail(path):
+    raise OSError(f"Cannot write {path}")
+
+
+@pytest.mark.parametrize('processes', [None, 1])
+def test_close_drains_queue(tmp_path, processes):
+    exporter = ResultExporter(max_pending=2, processes=processes)
+    futures = [exporter.write(write_json, str(tmp_path / f"{i}.json"), {'i': i}) for i in range(10)]
+    exporter.close()
+
+    assert all(future.done() and future.exception() is None for future in futures)
+    for i in range(10):
+        assert json.loads((tmp_path / f"{i}.json").read_text()) == {'i': i}
+    with pytest.raises(RuntimeError):
+        exporter.write(write_json, str(tmp_path / 'late.json'), {})
+
+
+def test_failed_job_is_reported(tmp_path):
+    exporter = ResultExporter()
+    failed = exporter.write(fail, str(tmp_path / 'a.json'))
+    written = exporter.write(write_json, str(tmp_path / 'b.json'), {})
+
+    with pytest.raises(RuntimeError, match=r"1 export job\(s\) failed:\n- fail\(.*a\.json\)"):
+        exporter.flush()
+    assert isinstance(failed.exception(), OSError)
+    assert written.exception() is None
+
+    # Reported once, so closing afterwards succeeds
+    exporter.close()
+
+
+def test_close_warns_about_deferred_plots(tmp_path, capsys):
+    exporter = ResultExporter(plots='deferred')
+    assert exporter.plot(write_json, str(tmp_path / 'plot.json'), {}) is None
+    exporter.close()
+
+    assert "1 deferred plot(s) were never rendered" in capsys.readouterr().err
+    assert exporter.deferred == []
+    assert not (tmp_path / 'plot.json').exists()
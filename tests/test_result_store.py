@@ -0,0 +1,87 @@
+import json
+import os
+
+import numpy as np
+
+from result_store import ResultStore, instance_hash
+
+
+def append_runs(store, rng, n_runs, algorithm='dqi'):
+    """Append runs of random lengths; return them by run id."""
+    runs = {}
+    for i in range(n_runs):
+        length = int(rng.integers(1, 20))
+        states = rng.choice(2 ** 10, size=length, replace=False)
+        counts = rng.integers(1, 50, size=length)
+        run_id = store.append(f"instance-{i % 3}", algorithm, states, counts=counts, n_bits=10,
+                              params={'run': i})
+        runs[run_id] = (states, counts)
+    return runs
+
+
+def test_flush_and_read(tmp_path, rng):
+    store = ResultStore(str(tmp_path), shard_runs=4)
+    runs = append_runs(store, rng, 10)
+    store.flush()
+
+    read = store.runs()
+    assert len(read) == 10
+    for run in read:
+        states, counts = runs[run['run_id']]
+        assert np.array_equal(run['states'], states)
+        assert np.array_equal(run['counts'], counts)
+        assert np.allclose(run['probabilities'], counts / counts.sum())
+        assert run['shots'] == counts.sum()
+    assert len(store.index(instance='instance-0')) == 4
+    assert len(os.listdir(tmp_path)) == 3 + 1
+
+
+def test_consolidated_offsets(tmp_path, rng):
+    store = ResultStore(str(tmp_path), shard_runs=3)
+    runs = append_runs(store, rng, 8)
+    columns = store.columns()
+
+    # Runs appended after a consolidation trigger a new one
+    runs.update(append_runs(store, rng, 5, algorithm='qaoa'))
+    columns = store.columns()
+
+    assert columns['run_id'].size == 13
+    assert columns['offset'][0] == 0
+    assert np.array_equal(columns['offset'][1:], np.cumsum(columns['length'])[:-1])
+    assert columns['states'].size == columns['length'].sum()
+    for r, run_id in enumerate(columns['run_id']):
+        start, length = columns['offset'][r], columns['length'][r]
+        states, counts = runs[str(run_id)]
+        assert np.array_equal(columns['states'][start:start + length], states)
+        assert np.array_equal(columns['counts'][start:start + length], counts)
+        assert json.loads(str(columns['params'][r]))['run'] >= 0
+
+
+def test_context_manager_flushes(tmp_path, rng):
+    with ResultStore(str(tmp_path)) as store:
+        append_runs(store, rng, 2)
+    assert len(ResultStore(str(tmp_path)).runs()) == 2
+
+
+def test_instance_hash_ignores_dtype():
+    H = np.eye(3, 5, dtype=np.int64)
+    assert instance_hash(H) == instance_hash(H.astype(np.uint8))
+    assert instance_hash(H) != instance_hash(H, phase_vector=[1, 0, 1, 1, 1])
+
+
+def test_consolidation_replaces_legacy_campaign(tmp_path, rng):
+    legacy = tmp_path / 'campaign'
+    legacy.mkdir()
+    (legacy / 'run_id.npy').write_bytes(b'stale')
+
+    store = ResultStore(str(tmp_path), shard_runs=4)
+    append_runs(store, rng, 6)
+    assert store.consolidate() == 6
+    first = store._current_campaign()
+    append_runs(store, rng, 2)
+    assert store.columns()['run_id'].size == 8
+
+    # Published through a pointer file; the previous version stays for open readers
+    assert not legacy.exists()
+    assert not any(os.path.islink(tmp_path / name) for name in os.listdir(tmp_path))
+    assert os.path.isdir(first) and store._current_campaign() != first
@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+
+from conftest import random_matrix
+from syndrome_table import SyndromeTable
+
+
+def dictionary_scan(parity_check_matrix, max_weight):
+    """The original table: scan all 2**n patterns in order, later patterns overwrite."""
+    n_bits = parity_check_matrix.shape[1]
+    table = {}
+    for i in range(2 ** n_bits):
+        error = np.array([int(bit) for bit in bin(i)[2:].zfill(n_bits)])
+        if np.sum(error) <= max_weight:
+            syndrome = np.mod(np.dot(parity_check_matrix, error), 2)
+            table[int("".join(map(str, syndrome)), 2)] = i
+    return table
+
+
+@pytest.mark.parametrize('shape, max_weight', [((3, 5), 2), ((4, 8), 1), ((5, 10), 2), ((6, 12), 3)])
+def test_matches_dictionary_scan(rng, shape, max_weight):
+    H = random_matrix(rng, *shape)
+    assert SyndromeTable(H, max_weight).to_dict() == dictionary_scan(H, max_weight)
+
+
+def test_decode_matches_lookup(rng):
+    H = random_matrix(rng, 6, 12)
+    table = SyndromeTable(H, 2)
+    reference = dictionary_scan(H, 2)
+
+    syndromes = np.arange(2 ** 6, dtype=np.uint64)
+    errors, found = table.decode(syndromes)
+    for syndrome, error, hit in zip(syndromes.tolist(), errors[:, 0].tolist(), found.tolist()):
+        assert hit == (syndrome in reference)
+        if hit:
+            assert error == reference[syndrome]